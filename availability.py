@@ -0,0 +1,174 @@
+# availability.py
+import os
+import math
+import hashlib
+import threading
+from background import PeriodicTask
+from database import get_db_connection
+
+# 이메일/닉네임 사용 가능 여부 확인용 Bloom filter 설정
+AVAILABILITY_CAPACITY = int(os.getenv("AVAILABILITY_CAPACITY", "1000000"))            # 예상 사용자 수
+AVAILABILITY_FP_RATE = float(os.getenv("AVAILABILITY_FP_RATE", "0.01"))               # 오탐률 (오탐이면 DB 로 확인)
+AVAILABILITY_REFRESH_INTERVAL = float(os.getenv("AVAILABILITY_REFRESH_INTERVAL", "300"))  # 전체 재구성 주기(초)
+AVAILABILITY_SYNC_INTERVAL = float(os.getenv("AVAILABILITY_SYNC_INTERVAL", "1"))          # 새 가입자 반영 주기(초)
+AVAILABILITY_LOAD_BATCH = 5000
+AVAILABILITY_SYNC_OVERLAP = 1000  # 늦게 커밋된 가입이 빠지지 않도록 마지막 id 앞쪽도 다시 읽음 (다시 넣어도 무해)
+
+
+class BloomFilter:
+    """
+    "확실히 없음"만 보장하는 집합
+    - might_contain 이 False 면 절대 추가된 적 없음 -> DB 확인 없이 사용 가능
+    - True 면 있을 수도 있음 -> DB 로 정확히 확인
+    """
+
+    def __init__(self, capacity: int, fp_rate: float):
+        self.size = max(8, int(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))  # 비트 수
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _positions(self, value: str):
+        # 해시 하나를 둘로 나눠서 k 개 위치를 만듦 (double hashing)
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, value: str):
+        positions = self._positions(value)
+        with self._lock:
+            for pos in positions:
+                self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def might_contain(self, value: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(value))
+
+
+class AvailabilityIndex:
+    """
+    가입된 이메일/닉네임 Bloom filter (워커 프로세스 단위)
+    - 서버 시작 시 users 전체를 읽어서 채우고, AVAILABILITY_REFRESH_INTERVAL 마다 새로 만들어서 교체
+      (탈퇴/닉네임 변경으로 안 쓰게 된 값 정리 + 다른 워커의 닉네임 변경 반영)
+    - 다른 워커의 가입은 AVAILABILITY_SYNC_INTERVAL 마다 마지막으로 본 id 이후 행만 읽어서 반영 (PK 범위 조회)
+    - 이 워커의 가입/닉네임 변경은 add_* 로 바로 반영
+    - 처음 다 읽기 전에는 항상 DB 로 확인
+    따라서 "사용 가능" 응답이 틀릴 수 있는 경우는 다른 워커에서 막 가입한 값(최대 SYNC 간격)과
+    다른 워커에서 바꾼 닉네임(최대 REFRESH 간격)뿐이고, 가입/닉네임 변경 자체는 DB 유니크 제약으로 항상 막힘
+    """
+
+    def __init__(self):
+        self._emails = BloomFilter(AVAILABILITY_CAPACITY, AVAILABILITY_FP_RATE)
+        self._nicknames = BloomFilter(AVAILABILITY_CAPACITY, AVAILABILITY_FP_RATE)
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._added_during_load = None  # 재구성 중에 추가된 값 (교체 시 새 필터에도 넣음)
+        self._last_id = 0  # 필터에 반영한 가장 큰 users.id
+        self._stats = {"free_without_db": 0, "db_checks": 0, "synced_users": 0}
+        self._task = PeriodicTask("availability-refresh", AVAILABILITY_REFRESH_INTERVAL, self.load)
+        self._sync_task = PeriodicTask("availability-sync", AVAILABILITY_SYNC_INTERVAL, self.sync_new_users)
+
+    @staticmethod
+    def _normalize(value: str) -> str:
+        # DB 문자열 비교가 대소문자를 구분하지 않으므로 맞춤
+        return value.strip().casefold()
+
+    def load(self):
+        with self._lock:
+            self._added_during_load = []
+        emails = BloomFilter(AVAILABILITY_CAPACITY, AVAILABILITY_FP_RATE)
+        nicknames = BloomFilter(AVAILABILITY_CAPACITY, AVAILABILITY_FP_RATE)
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        finished = False
+        last_id = 0
+        try:
+            cursor.execute("SELECT id, email, nickname FROM users")
+            while True:
+                rows = cursor.fetchmany(AVAILABILITY_LOAD_BATCH)
+                if not rows:
+                    break
+                for user_id, email, nickname in rows:
+                    emails.add(self._normalize(email))
+                    nicknames.add(self._normalize(nickname))
+                    last_id = max(last_id, user_id)
+            finished = True
+        finally:
+            if finished:
+                cursor.close()
+                conn.close()
+            else:
+                conn.invalidate()  # 읽다 만 결과가 남은 커넥션은 폐기
+            # 실패하면 기존 필터를 그대로 사용
+            with self._lock:
+                added, self._added_during_load = self._added_during_load, None
+                if finished:
+                    # 읽는 동안 가입/변경된 값이 빠지지 않도록 새 필터에도 넣고 교체
+                    for kind, value in added:
+                        (emails if kind == "email" else nicknames).add(value)
+                    self._emails, self._nicknames = emails, nicknames
+                    self._last_id = max(self._last_id, last_id)
+                    self._loaded = True
+
+    def sync_new_users(self):
+        """마지막으로 반영한 id 이후에 가입한 사용자를 필터에 추가 (다른 워커의 가입 반영)"""
+        if not self._loaded:
+            return
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                "SELECT id, email, nickname FROM users WHERE id > %s",
+                (max(0, self._last_id - AVAILABILITY_SYNC_OVERLAP),),
+            )
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+            conn.close()
+        for user_id, email, nickname in rows:
+            self._add("email", self._normalize(email))
+            self._add("nickname", self._normalize(nickname))
+        with self._lock:
+            if rows:
+                self._last_id = max(self._last_id, max(row[0] for row in rows))
+            self._stats["synced_users"] += len(rows)
+
+    def start(self):
+        self._task.start()
+        self._sync_task.start()
+
+    def stop(self):
+        self._sync_task.stop()
+        self._task.stop()
+
+    def add_email(self, email: str):
+        self._add("email", self._normalize(email))
+
+    def add_nickname(self, nickname: str):
+        self._add("nickname", self._normalize(nickname))
+
+    def _add(self, kind: str, value: str):
+        with self._lock:
+            (self._emails if kind == "email" else self._nicknames).add(value)
+            if self._added_during_load is not None:
+                self._added_during_load.append((kind, value))
+
+    def email_definitely_free(self, email: str) -> bool:
+        return self._check(self._emails, email)
+
+    def nickname_definitely_free(self, nickname: str) -> bool:
+        return self._check(self._nicknames, nickname)
+
+    def _check(self, bloom: BloomFilter, value: str) -> bool:
+        free = self._loaded and not bloom.might_contain(self._normalize(value))
+        with self._lock:
+            self._stats["free_without_db" if free else "db_checks"] += 1
+        return free
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"loaded": self._loaded, "bits": self._emails.size, "hashes": self._emails.hashes, "last_id": self._last_id, **self._stats}
+
+
+availability_index = AvailabilityIndex()
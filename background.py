@@ -0,0 +1,54 @@
+# background.py
+import threading
+
+
+class PeriodicTask:
+    """
+    interval 초마다 func 를 실행하는 백그라운드 스레드
+    - wake() 로 다음 주기를 기다리지 않고 바로 실행시킬 수 있음
+    - stop() 은 스레드 종료를 기다리고, run_on_stop=True 면 마지막으로 한 번 더 실행
+    """
+
+    def __init__(self, name: str, interval: float, func, run_on_stop: bool = False):
+        self.name = name
+        self.interval = interval
+        self._func = func
+        self._run_on_stop = run_on_stop
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        self._wake.set()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+        if self._run_on_stop:
+            self._run_once()
+
+    def _loop(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stopping:
+                return
+            self._run_once()
+
+    def _run_once(self):
+        try:
+            self._func()
+        except Exception as e:
+            # 백그라운드 작업 실패가 스레드를 죽이지 않도록 (다음 주기에 재시도)
+            print(f"{self.name} Error: {e}")
@@ -0,0 +1,64 @@
+# benchmarks/bench_auth.py
+"""
+요청당 인증 비용 벤치마크: get_current_user 를 세션 캐시 히트(DB 세션 방식) vs
+서명 토큰 + 사용자 캐시 히트(토큰 모드)로 실행했을 때의 1회 평균 시간
+
+둘 다 캐시가 찬 상태(DB 왕복 없음)에서 측정하므로 순수 인증 계층 오버헤드만 비교됨
+토큰 모드는 캐시가 비어도 서명 확인까지는 I/O 가 없고 사용자 정보만 DB 에서 읽음
+
+사용법:
+    SESSION_TOKEN_MODE=1 SESSION_TOKEN_KEYS=k1:secret python -m benchmarks.bench_auth
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from starlette.requests import Request
+
+import dependencies
+import tokens
+
+
+def make_request(session_id: str) -> Request:
+    return Request({"type": "http", "headers": [(b"cookie", f"session_id={session_id}".encode())]})
+
+
+async def measure(session_id: str, iterations: int) -> float:
+    request = make_request(session_id)
+    await dependencies.get_current_user(request)  # 캐시 확인
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await dependencies.get_current_user(request)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100000)
+    args = parser.parse_args()
+
+    if not dependencies.SESSION_TOKEN_MODE:
+        raise SystemExit("SESSION_TOKEN_MODE=1 로 실행해주세요.")
+
+    user = {"id": 1, "userId": 1, "email": "user1@test.com", "nickname": "user1", "profileImage": None, "tokens_valid_after": 0}
+    dependencies.session_cache.set("legacy-session-id", user, ttl=3600)
+    dependencies.user_cache.set(1, user, ttl=3600)
+    token = tokens.issue_token(1)
+
+    started = time.perf_counter()
+    for _ in range(args.iterations):
+        tokens.verify_token(token)
+    verify_us = (time.perf_counter() - started) / args.iterations * 1e6
+
+    result = {
+        "iterations": args.iterations,
+        "session_cache_hit_us": round(asyncio.run(measure("legacy-session-id", args.iterations)), 2),
+        "token_user_cache_hit_us": round(asyncio.run(measure(token, args.iterations)), 2),
+        "verify_token_only_us": round(verify_us, 2),
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
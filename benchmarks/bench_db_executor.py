@@ -0,0 +1,105 @@
+# benchmarks/bench_db_executor.py
+"""
+DB 실행 계층 벤치마크: async 핸들러 안에서 동기 쿼리를 직접 호출(before) vs
+run_in_db_executor 스레드풀 경유(after) 의 동시 요청 처리량 비교
+
+사용법:
+    python -m benchmarks.bench_db_executor                 # time.sleep 으로 쿼리 지연 흉내
+    python -m benchmarks.bench_db_executor --mysql         # 실제 MySQL 에서 SELECT SLEEP(n)
+    python -m benchmarks.bench_db_executor --requests 400 --concurrency 50 --latency 0.005
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from database import get_db_connection, run_in_db_executor
+
+
+def blocking_query(latency: float, use_mysql: bool):
+    if not use_mysql:
+        time.sleep(latency)
+        return
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT SLEEP(%s)", (latency,))
+        cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def build_app(latency: float, use_mysql: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/before")
+    async def before():
+        # 기존 컨트롤러 방식: 이벤트 루프 위에서 동기 드라이버 호출
+        blocking_query(latency, use_mysql)
+        return {"ok": True}
+
+    offloaded = run_in_db_executor(blocking_query)
+
+    @app.get("/after")
+    async def after():
+        await offloaded(latency, use_mysql)
+        return {"ok": True}
+
+    return app
+
+
+async def run_load(app: FastAPI, path: str, total: int, concurrency: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            while not queue.empty():
+                queue.get_nowait()
+                started = time.perf_counter()
+                resp = await client.get(path)
+                resp.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p99_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.01, help="쿼리 1회 지연(초)")
+    parser.add_argument("--mysql", action="store_true", help="실제 MySQL 에 SELECT SLEEP 실행")
+    args = parser.parse_args()
+
+    app = build_app(args.latency, args.mysql)
+    result = {
+        "latency_s": args.latency,
+        "concurrency": args.concurrency,
+        "before": asyncio.run(run_load(app, "/before", args.requests, args.concurrency)),
+        "after": asyncio.run(run_load(app, "/after", args.requests, args.concurrency)),
+    }
+    result["speedup"] = round(result["after"]["rps"] / result["before"]["rps"], 2)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
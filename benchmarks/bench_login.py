@@ -0,0 +1,124 @@
+# benchmarks/bench_login.py
+"""
+로그인 처리량 벤치마크: scrypt 확인을 이벤트 루프에서 직접 실행(before) vs
+passwords.check_password 프로세스 풀 경유(after)
+
+로그인이 몰리는 동안 가벼운 GET /ping 도 같이 보내서 다른 요청이 얼마나 밀리는지 측정함
+(DB 대신 메모리의 해시 한 개를 사용하므로 해시 비용만 비교됨)
+
+사용법:
+    python -m benchmarks.bench_login
+    python -m benchmarks.bench_login --requests 400 --concurrency 32
+    PASSWORD_SCRYPT_N=32768 PASSWORD_HASH_WORKERS=8 python -m benchmarks.bench_login
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+from fastapi import FastAPI
+
+import passwords
+
+PASSWORD = "Password123!"
+
+
+def build_app(stored: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/before")
+    async def before():
+        # 해시를 도입하면서 async 핸들러 안에서 그대로 계산하는 경우
+        return {"ok": passwords._verify(PASSWORD, stored)}
+
+    @app.post("/after")
+    async def after():
+        matched, _ = await passwords.check_password(PASSWORD, stored)
+        return {"ok": matched}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+def _percentile(values: list, ratio: float) -> float:
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(len(values) * ratio))] * 1000, 2)
+
+
+async def run_load(app: FastAPI, path: str, total: int, concurrency: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    ping_latencies = []
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        done = asyncio.Event()
+
+        async def worker():
+            while not queue.empty():
+                queue.get_nowait()
+                started = time.perf_counter()
+                resp = await client.post(path)
+                resp.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        async def pinger():
+            while not done.is_set():
+                started = time.perf_counter()
+                await client.get("/ping")
+                ping_latencies.append(time.perf_counter() - started)
+                await asyncio.sleep(0.005)
+
+        ping_task = asyncio.create_task(pinger())
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await ping_task
+
+    return {
+        "logins": total,
+        "elapsed_s": round(elapsed, 3),
+        "logins_per_s": round(total / elapsed, 1),
+        "p50_ms": _percentile(latencies, 0.5),
+        "p99_ms": _percentile(latencies, 0.99),
+        "ping_p99_ms": _percentile(ping_latencies, 0.99) if ping_latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    stored = passwords._hash(PASSWORD, passwords.PASSWORD_SCRYPT_N, passwords.PASSWORD_SCRYPT_R, passwords.PASSWORD_SCRYPT_P)
+    app = build_app(stored)
+
+    async def warm_up():
+        # 프로세스 생성 비용이 측정에 섞이지 않도록 워커를 미리 띄움
+        await asyncio.gather(*(passwords.check_password(PASSWORD, stored) for _ in range(passwords.PASSWORD_HASH_WORKERS)))
+
+    try:
+        asyncio.run(warm_up())
+        result = {
+            "scrypt": {"n": passwords.PASSWORD_SCRYPT_N, "r": passwords.PASSWORD_SCRYPT_R, "p": passwords.PASSWORD_SCRYPT_P},
+            "workers": passwords.PASSWORD_HASH_WORKERS,
+            "concurrency": args.concurrency,
+            "before": asyncio.run(run_load(app, "/before", args.requests, args.concurrency)),
+            "after": asyncio.run(run_load(app, "/after", args.requests, args.concurrency)),
+        }
+    finally:
+        passwords.shutdown_password_pool()
+    result["speedup"] = round(result["after"]["logins_per_s"] / result["before"]["logins_per_s"], 2)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
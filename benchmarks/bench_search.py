@@ -0,0 +1,69 @@
+# benchmarks/bench_search.py
+"""
+게시글 검색 지연 시간 측정 (DB_CONFIG 의 DB, migrations/009 적용 필요)
+
+검색어마다 첫 페이지와 커서로 이어지는 다음 페이지들을 조회해서 p50/p99 를 출력
+- 드문 검색어(일치하는 글이 적음)와 흔한 검색어(거의 모든 글에 일치)를 같이 넣어서
+  결과 수에 따라 비용이 어떻게 달라지는지 확인
+
+사용법:
+    python manage.py seed --posts 1000000 --comments 0 --likes 0   # 데이터가 없으면
+    python -m benchmarks.bench_search
+    python -m benchmarks.bench_search --query "시드 게시글" --query "999999번째" --pages 3 --repeat 50
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from controllers.post import load_search_page
+from search import parse_terms
+
+DEFAULT_QUERIES = ["12345번째", "시드 게시글", "용량 테스트", "MySQL 튜닝"]
+
+
+def _percentile(values: list, ratio: float) -> float:
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(len(values) * ratio))] * 1000, 2)
+
+
+async def measure(query: str, pages: int, repeat: int, limit: int) -> dict:
+    terms = parse_terms(query)
+    latencies = {page: [] for page in range(pages)}
+    results = 0
+    for _ in range(repeat):
+        cursor = None
+        for page in range(pages):
+            started = time.perf_counter()
+            data = await load_search_page(terms, limit, cursor)
+            latencies[page].append(time.perf_counter() - started)
+            results = max(results, len(data["posts"]))
+            cursor = data["nextCursor"]
+            if not cursor:
+                break
+    return {
+        "terms": terms,
+        "results_per_page": results,
+        "pages": {
+            f"page_{page + 1}": {"p50_ms": _percentile(values, 0.5), "p99_ms": _percentile(values, 0.99)}
+            for page, values in latencies.items() if values
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--query", action="append", help="검색어 (여러 번 지정 가능)")
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    async def run():
+        return {query: await measure(query, args.pages, args.repeat, args.limit) for query in args.query or DEFAULT_QUERIES}
+
+    print(json.dumps(asyncio.run(run()), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
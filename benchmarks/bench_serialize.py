@@ -0,0 +1,125 @@
+# benchmarks/bench_serialize.py
+"""
+피드 응답 직렬화 마이크로 벤치마크 (게시글 100개 페이지 한 번을 만드는 시간)
+
+- jsonable_encoder: response_model 없이 dict 반환 (기존 방식, jsonable_encoder + 표준 json)
+- response_model:   response_model 선언 + dict 반환 (FastAPI 가 모델 검증 후 직렬화)
+- fast_response:    ORJSONResponse 로 바로 직렬화 (현재 방식, 검증/인코더 생략)
+
+각 방식을 실제 라우트로 만들어서 ASGI 호출 한 번 전체(라우팅 + 직렬화) 시간을 잼
+(DB/캐시는 빼고 메모리의 페이지를 그대로 반환)
+
+사용법:
+    python -m benchmarks.bench_serialize
+    python -m benchmarks.bench_serialize --posts 100 --requests 2000
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from models.post import PostListPage
+from models.response import ApiResponse
+from responses import fast_response
+
+PostListEnvelope = ApiResponse[PostListPage]
+
+
+def build_page(count: int) -> dict:
+    started = datetime(2026, 1, 1)
+    posts = [
+        {
+            "postId": 100000 - i,
+            "title": f"게시글 제목 {i}",
+            "content": "본문 미리보기 " * 8,
+            "writer": f"작성자{i % 50}",
+            "writerEmail": f"user{i % 50}@example.com",
+            "authorId": i % 50 + 1,
+            "fileUrl": f"/uploads/ab/{i:064x}.jpg" if i % 3 == 0 else None,
+            "thumbnailUrl": f"/uploads/ab/{i:064x}_feed.webp" if i % 3 == 0 else None,
+            "authorProfileImage": f"/uploads/cd/{i % 50:064x}.png",
+            "authorProfileThumb": f"/uploads/cd/{i % 50:064x}_avatar.webp",
+            "viewCount": i * 7,
+            "likeCount": i % 13,
+            "commentCount": i % 5,
+            "createdAt": (started - timedelta(minutes=i)).isoformat(),
+        }
+        for i in range(count)
+    ]
+    return {
+        "code": "GET_POSTS_SUCCESS",
+        "message": "게시물 목록 조회에 성공했습니다.",
+        "data": {"posts": posts, "totalCount": 123456, "nextCursor": "eyJjIjoiMjAyNi0wMS0wMSIsImkiOjk5OTAxfQ"},
+    }
+
+
+def build_app(page: dict) -> FastAPI:
+    # 앱 기본 응답 클래스(ORJSONResponse)의 영향을 빼기 위해 before 두 개는 JSONResponse 로 고정
+    app = FastAPI(default_response_class=JSONResponse)
+
+    @app.get("/jsonable_encoder")
+    async def plain():
+        return page
+
+    @app.get("/response_model", response_model=PostListEnvelope)
+    async def validated():
+        return page
+
+    @app.get("/fast_response", response_model=PostListEnvelope)
+    async def fast():
+        return fast_response(page, PostListEnvelope)
+
+    return app
+
+
+async def run_load(app: FastAPI, path: str, total: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        body = (await client.get(path)).content  # 워밍업
+        for _ in range(total):
+            started = time.perf_counter()
+            resp = await client.get(path)
+            latencies.append(time.perf_counter() - started)
+            resp.raise_for_status()
+    latencies.sort()
+    return {
+        "bytes": len(body),
+        "p50_us": round(latencies[len(latencies) // 2] * 1e6, 1),
+        "p99_us": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1e6, 1),
+        "rps": round(total / sum(latencies), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    page = build_page(args.posts)
+    app = build_app(page)
+
+    # 세 방식의 응답 본문이 같은 데이터인지 먼저 확인
+    async def bodies():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return [(await client.get(f"/{name}")).json() for name in ("jsonable_encoder", "response_model", "fast_response")]
+    first, *rest = asyncio.run(bodies())
+    assert all(body == first for body in rest), "응답 본문이 서로 다름"
+
+    result = {"posts": args.posts, "requests": args.requests}
+    for name in ("jsonable_encoder", "response_model", "fast_response"):
+        result[name] = asyncio.run(run_load(app, f"/{name}", args.requests))
+    result["speedup_vs_jsonable_encoder"] = round(result["fast_response"]["rps"] / result["jsonable_encoder"]["rps"], 2)
+    result["speedup_vs_response_model"] = round(result["fast_response"]["rps"] / result["response_model"]["rps"], 2)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
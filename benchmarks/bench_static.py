@@ -0,0 +1,115 @@
+# benchmarks/bench_static.py
+"""
+/uploads 정적 서빙 벤치마크: 기본 StaticFiles(before) vs UploadsStaticFiles(after)
+
+시나리오
+- full:        조건 없는 GET (본문 전체 전송)
+- revalidate:  브라우저 캐시 재검증 (If-None-Match) -> 304
+- range:       앞 64KB Range 요청 -> 206
+- cached:      immutable 이면 브라우저가 요청을 보내지 않으므로, 응답의 Cache-Control 을 보고
+               클라이언트 캐시를 흉내냄 (immutable 이면 첫 요청 이후 네트워크 요청 0)
+
+사용법:
+    python -m benchmarks.bench_static
+    python -m benchmarks.bench_static --requests 2000 --concurrency 32 --size-kb 512
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import httpx
+from fastapi import FastAPI
+from fastapi.staticfiles import StaticFiles
+
+from storage import UploadsStaticFiles
+
+
+def build_app(directory: str) -> FastAPI:
+    app = FastAPI()
+    app.mount("/before", StaticFiles(directory=directory), name="before")
+    app.mount("/after", UploadsStaticFiles(directory=directory), name="after")
+    return app
+
+
+async def run_load(app: FastAPI, url: str, scenario: str, total: int, concurrency: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    sent = {"requests": 0, "bytes": 0, "statuses": {}}
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        first = await client.get(url)
+        first.raise_for_status()
+        etag = first.headers.get("etag")
+        immutable = "immutable" in first.headers.get("cache-control", "")
+
+        headers = {}
+        if scenario == "revalidate":
+            headers["if-none-match"] = etag
+        elif scenario == "range":
+            headers["range"] = "bytes=0-65535"
+
+        async def worker():
+            while not queue.empty():
+                queue.get_nowait()
+                if scenario == "cached" and immutable:
+                    continue  # 클라이언트 캐시에서 바로 사용 (요청 없음)
+                started = time.perf_counter()
+                resp = await client.get(url, headers=headers)
+                latencies.append(time.perf_counter() - started)
+                sent["requests"] += 1
+                sent["bytes"] += len(resp.content)
+                sent["statuses"][resp.status_code] = sent["statuses"].get(resp.status_code, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "network_requests": sent["requests"],
+        "statuses": sent["statuses"],
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(sent["requests"] / elapsed, 1) if sent["requests"] else None,
+        "mb_per_s": round(sent["bytes"] / (1024 * 1024) / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2) if latencies else None,
+        "cache_control": first.headers.get("cache-control"),
+        "etag": etag,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--size-kb", type=int, default=256, help="이미지 파일 크기(KB)")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="bench-static-")
+    try:
+        payload = os.urandom(args.size_kb * 1024)
+        filename = f"{hashlib.sha256(payload).hexdigest()}.jpg"
+        with open(os.path.join(directory, filename), "wb") as f:
+            f.write(payload)
+
+        app = build_app(directory)
+        result = {"size_kb": args.size_kb, "concurrency": args.concurrency}
+        for scenario in ("full", "revalidate", "range", "cached"):
+            result[scenario] = {
+                "before": asyncio.run(run_load(app, f"/before/{filename}", scenario, args.requests, args.concurrency)),
+                "after": asyncio.run(run_load(app, f"/after/{filename}", scenario, args.requests, args.concurrency)),
+            }
+        print(json.dumps(result, indent=2))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
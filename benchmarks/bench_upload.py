@@ -0,0 +1,130 @@
+# benchmarks/bench_upload.py
+"""
+업로드 저장 경로 벤치마크: 이벤트 루프에서 shutil.copyfileobj 로 한 번에 복사(before) vs
+save_upload_stream 청크 스트리밍 + 파일 I/O 스레드풀(after) 의 동시 업로드 처리량 비교
+
+업로드가 진행되는 동안 가벼운 GET /ping 요청을 같이 보내서
+디스크 쓰기가 이벤트 루프를 얼마나 막는지(다른 요청 지연)도 측정함
+
+사용법:
+    python -m benchmarks.bench_upload
+    python -m benchmarks.bench_upload --uploads 64 --concurrency 16 --size-mb 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import time
+import uuid
+
+import httpx
+from fastapi import FastAPI, File, UploadFile
+
+from storage import UPLOAD_DIR, save_upload_stream
+
+JPEG_HEADER = b"\xff\xd8\xff\xe0"
+
+
+def build_app(saved: list) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/before")
+    async def before(file: UploadFile = File(...)):
+        # 기존 방식: 이벤트 루프 위에서 통째로 복사 후 크기 확인
+        path = os.path.join(UPLOAD_DIR, f"{uuid.uuid4()}.jpg")
+        with open(path, "wb") as buffer:
+            shutil.copyfileobj(file.file, buffer)
+        saved.append(path)
+        return {"size": os.path.getsize(path)}
+
+    @app.post("/after")
+    async def after(file: UploadFile = File(...)):
+        stored = await save_upload_stream(file, ".jpg")
+        saved.append(stored["tmp_path"])  # blob 이동(place_blob)은 DB 단계라 여기선 제외
+        return {"size": stored["size"]}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+def _percentile(values: list, ratio: float) -> float:
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(len(values) * ratio))] * 1000, 2)
+
+
+async def run_load(app: FastAPI, path: str, payload: bytes, total: int, concurrency: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    ping_latencies = []
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        done = asyncio.Event()
+
+        async def worker():
+            while not queue.empty():
+                queue.get_nowait()
+                started = time.perf_counter()
+                resp = await client.post(path, files={"file": ("bench.jpg", payload, "image/jpeg")})
+                resp.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        async def pinger():
+            while not done.is_set():
+                started = time.perf_counter()
+                resp = await client.get("/ping")
+                resp.raise_for_status()
+                ping_latencies.append(time.perf_counter() - started)
+                await asyncio.sleep(0.005)
+
+        ping_task = asyncio.create_task(pinger())
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await ping_task
+
+    return {
+        "uploads": total,
+        "elapsed_s": round(elapsed, 3),
+        "mb_per_s": round(total * len(payload) / (1024 * 1024) / elapsed, 1),
+        "p50_ms": _percentile(latencies, 0.5),
+        "p99_ms": _percentile(latencies, 0.99),
+        "ping_p99_ms": _percentile(ping_latencies, 0.99) if ping_latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uploads", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--size-mb", type=float, default=2, help="업로드 1건 크기(MB)")
+    args = parser.parse_args()
+
+    payload = JPEG_HEADER + os.urandom(int(args.size_mb * 1024 * 1024) - len(JPEG_HEADER))
+    saved = []
+    app = build_app(saved)
+    try:
+        result = {
+            "size_mb": args.size_mb,
+            "concurrency": args.concurrency,
+            "before": asyncio.run(run_load(app, "/before", payload, args.uploads, args.concurrency)),
+            "after": asyncio.run(run_load(app, "/after", payload, args.uploads, args.concurrency)),
+        }
+    finally:
+        # 벤치마크로 만든 파일 정리
+        for path in saved:
+            if os.path.exists(path):
+                os.remove(path)
+    result["speedup"] = round(result["after"]["mb_per_s"] / result["before"]["mb_per_s"], 2)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+# benchmarks/loadtest.py
+"""
+엔드포인트 부하 테스트: 로컬 DB 에 데이터를 채우고 실제 FastAPI 앱에 동시 요청을 보내서
+엔드포인트별 p50/p99 지연 시간과 RPS 를 JSON 으로 출력
+
+요청 비율 (가상 사용자마다 로그인 후 아래 비율로 반복)
+- feed:      GET  /v1/posts (첫 페이지, 가끔 nextCursor 로 다음 페이지)
+- detail:    GET  /v1/posts/{id}   (인기 게시글에 몰리도록 치우친 분포)
+- comments:  GET  /v1/posts/{id}/comments
+- like:      POST/DELETE /v1/posts/{id}/likes (좋아요 토글)
+- login:     POST /v1/auth/login
+- upload:    POST /v1/files/upload (작은 JPEG, 매번 다른 내용)
+
+주의: DB_CONFIG 의 DB 에 loadtest 사용자/게시글을 추가함 (--skip-seed 가 없으면 이전 loadtest 데이터를 지우고 다시 만듦)
+
+사용법:
+    python -m benchmarks.loadtest --users 200 --posts 5000 --comments 20000 --likes 20000
+    python -m benchmarks.loadtest --skip-seed --duration 60 --concurrency 64 --output result.json
+    python -m benchmarks.loadtest --skip-seed --base-url http://127.0.0.1:8000   # uvicorn 으로 띄운 서버 대상
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import time
+
+import httpx
+
+from database import get_db_connection
+from manage import repair_counters_for_posts
+from seeder import seed as seed_data
+from storage import release_files
+
+EMAIL_DOMAIN = "loadtest.local"  # 부하 테스트 사용자 구분용 (다시 채울 때 이 도메인 사용자와 그 데이터만 지움)
+PASSWORD = "Password123!"  # seeder.SEED_PASSWORD
+
+MIX = {
+    "feed": 40,
+    "detail": 25,
+    "comments": 15,
+    "like": 10,
+    "login": 5,
+    "upload": 5,
+}
+
+
+# ==========================================
+# 1. 데이터 준비
+# ==========================================
+def reset_seed_data():
+    """
+    이전 loadtest 사용자와 그 사용자가 만든 게시글/댓글/좋아요/세션/업로드 삭제
+    loadtest 사용자가 다른 사용자 글에 남긴 좋아요/댓글도 지우므로 그 글들의 like_count/comment_count 는 다시 계산
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    users = "user_id IN (SELECT id FROM users WHERE email LIKE %s)"
+    posts = f"post_id IN (SELECT id FROM posts WHERE {users})"
+    params = (f"%@{EMAIL_DOMAIN}",)
+    try:
+        # 업로드는 blob 참조 수를 줄인 뒤 지움 (파일은 gc-blobs 가 유예 기간 후 정리)
+        conn.start_transaction()
+        try:
+            release_files(cursor, users, params)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        cursor.execute(
+            f"""
+            SELECT post_id FROM post_likes WHERE {users}
+            UNION
+            SELECT post_id FROM comments WHERE {users}
+            """,
+            params * 2,
+        )
+        touched_posts = [row["post_id"] for row in cursor.fetchall()]
+        for query in (
+            f"DELETE FROM post_likes WHERE {users} OR {posts}",
+            f"DELETE FROM comments WHERE {users} OR {posts}",
+            f"DELETE FROM files WHERE {users}",
+            f"DELETE FROM sessions WHERE {users}",
+            f"DELETE FROM posts WHERE {users}",
+            "DELETE FROM users WHERE email LIKE %s",
+        ):
+            cursor.execute(query, params * query.count("%s"))
+        # loadtest 글은 위에서 지워졌으므로 남은(다른 사용자) 글만 갱신됨
+        repair_counters_for_posts(cursor, touched_posts)
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def load_targets() -> dict:
+    """
+    부하 대상 사용자 이메일/게시글 ID/이미 누른 좋아요 (기존 loadtest 데이터 재사용)
+    게시글은 loadtest 사용자가 쓴 글만 (더미/실제 데이터에 좋아요를 누르거나 취소하지 않도록)
+    """
+    domain = (f"%@{EMAIL_DOMAIN}",)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT email FROM users WHERE email LIKE %s ORDER BY id", domain)
+        emails = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            """
+            SELECT p.id FROM posts p
+            JOIN users u ON u.id = p.user_id
+            WHERE u.email LIKE %s AND p.deleted_at IS NULL
+            ORDER BY p.id DESC LIMIT 100000
+            """,
+            domain,
+        )
+        post_ids = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT u.email, l.post_id FROM post_likes l JOIN users u ON u.id = l.user_id WHERE u.email LIKE %s",
+            domain,
+        )
+        liked = {}
+        for email, post_id in cursor.fetchall():
+            liked.setdefault(email, set()).add(post_id)
+    finally:
+        cursor.close()
+        conn.close()
+    if not emails or not post_ids:
+        raise SystemExit("loadtest 데이터가 없습니다. --skip-seed 없이 먼저 실행하세요.")
+    return {"emails": emails, "post_ids": post_ids, "liked": liked}
+
+
+# ==========================================
+# 2. 부하 생성
+# ==========================================
+class Recorder:
+    def __init__(self):
+        self.latencies = {name: [] for name in MIX}
+        self.errors = {name: {} for name in MIX}
+
+    def add(self, name: str, started: float, response: httpx.Response, expected=(200, 201)):
+        self.latencies[name].append(time.perf_counter() - started)
+        if response.status_code not in expected:
+            self.errors[name][response.status_code] = self.errors[name].get(response.status_code, 0) + 1
+
+    def summary(self, elapsed: float) -> dict:
+        result = {}
+        for name, values in self.latencies.items():
+            if not values:
+                continue
+            values.sort()
+            result[name] = {
+                "requests": len(values),
+                "errors": self.errors[name],
+                "rps": round(len(values) / elapsed, 1),
+                "p50_ms": round(values[len(values) // 2] * 1000, 2),
+                "p99_ms": round(values[min(len(values) - 1, int(len(values) * 0.99))] * 1000, 2),
+                "max_ms": round(values[-1] * 1000, 2),
+            }
+        return result
+
+
+def pick_post(post_ids: list, rng: random.Random) -> int:
+    # 요청 절반은 최신 1% 게시글(인기 글)로, 나머지는 전체에서 고르게
+    if rng.random() < 0.5:
+        return post_ids[rng.randrange(max(1, len(post_ids) // 100))]
+    return rng.choice(post_ids)
+
+
+def fake_jpeg(rng: random.Random) -> bytes:
+    # 업로드 검사는 매직 바이트만 보므로 JPEG 헤더 + 무작위 바이트 (매번 다른 blob)
+    return b"\xff\xd8\xff\xe0" + rng.randbytes(16 * 1024)
+
+
+async def virtual_user(client: httpx.AsyncClient, email: str, targets: dict, recorder: Recorder,
+                       deadline: float, rng: random.Random):
+    post_ids = targets["post_ids"]
+    names = list(MIX)
+    weights = [MIX[name] for name in names]
+    # 이 사용자가 이미 누른 좋아요 (같은 이메일을 쓰는 가상 사용자끼리 공유)
+    liked = targets["liked"].setdefault(email, set())
+    next_cursor = None
+
+    async def login():
+        started = time.perf_counter()
+        resp = await client.post("/v1/auth/login", json={"email": email, "password": PASSWORD})
+        recorder.add("login", started, resp)
+
+    await login()
+    while time.perf_counter() < deadline:
+        action = rng.choices(names, weights)[0]
+        started = time.perf_counter()
+        if action == "feed":
+            params = {"limit": 10, "includeTotal": "false"}
+            if next_cursor and rng.random() < 0.3:
+                params["cursor"] = next_cursor
+            resp = await client.get("/v1/posts", params=params)
+            recorder.add(action, started, resp)
+            if resp.status_code == 200:
+                next_cursor = resp.json()["data"].get("nextCursor")
+        elif action == "detail":
+            resp = await client.get(f"/v1/posts/{pick_post(post_ids, rng)}")
+            recorder.add(action, started, resp)
+        elif action == "comments":
+            resp = await client.get(f"/v1/posts/{pick_post(post_ids, rng)}/comments", params={"limit": 20})
+            recorder.add(action, started, resp)
+        elif action == "like":
+            post_id = pick_post(post_ids, rng)
+            if post_id in liked:
+                resp = await client.delete(f"/v1/posts/{post_id}/likes")
+                liked.discard(post_id)
+            else:
+                resp = await client.post(f"/v1/posts/{post_id}/likes")
+                liked.add(post_id)
+            # 같은 이메일의 다른 가상 사용자와 동시에 누르면 409 가 날 수 있음 (그 외 상태 코드는 오류로 기록)
+            recorder.add(action, started, resp, expected=(200, 201, 409))
+        elif action == "login":
+            await login()
+        elif action == "upload":
+            files = {"file": ("loadtest.jpg", fake_jpeg(rng), "image/jpeg")}
+            resp = await client.post("/v1/files/upload", files=files, data={"type": "post"})
+            recorder.add(action, started, resp)
+
+
+async def run_load(app, base_url: str | None, targets: dict, concurrency: int, duration: float, seed_value: int) -> dict:
+    recorder = Recorder()
+    emails = targets["emails"]
+
+    async def run_users():
+        deadline = time.perf_counter() + duration
+        clients = []
+        try:
+            for i in range(concurrency):
+                # 가상 사용자마다 쿠키(세션)를 따로 가지도록 클라이언트를 나눔
+                if base_url:
+                    clients.append(httpx.AsyncClient(base_url=base_url, timeout=30))
+                else:
+                    clients.append(httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=30))
+            started = time.perf_counter()
+            await asyncio.gather(*(
+                virtual_user(client, emails[i % len(emails)], targets, recorder, deadline, random.Random(seed_value + i))
+                for i, client in enumerate(clients)
+            ))
+            return time.perf_counter() - started
+        finally:
+            for client in clients:
+                await client.aclose()
+
+    if base_url:
+        elapsed = await run_users()
+    else:
+        # 같은 프로세스에서 앱을 띄울 때도 lifespan(스레드풀/백그라운드 작업)을 실제 서버처럼 실행
+        async with app.router.lifespan_context(app):
+            elapsed = await run_users()
+
+    endpoints = recorder.summary(elapsed)
+    total = sum(item["requests"] for item in endpoints.values())
+    return {"elapsed_s": round(elapsed, 2), "total_requests": total, "total_rps": round(total / elapsed, 1), "endpoints": endpoints}
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--posts", type=int, default=5000)
+    parser.add_argument("--comments", type=int, default=20000)
+    parser.add_argument("--likes", type=int, default=20000)
+    parser.add_argument("--skip-seed", action="store_true", help="이미 있는 loadtest 데이터 사용")
+    parser.add_argument("--concurrency", type=int, default=32, help="가상 사용자 수")
+    parser.add_argument("--duration", type=float, default=30, help="측정 시간(초)")
+    parser.add_argument("--base-url", default=None, help="지정하면 실행 중인 서버로 요청 (기본: 같은 프로세스의 앱)")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드 (같은 값이면 같은 데이터/요청 순서)")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    seed_elapsed = None
+    if not args.skip_seed:
+        started = time.perf_counter()
+        reset_seed_data()
+        # 인기 글/헤비 유저로 치우친 분포 (seeder.py), 사용자 구분을 위해 loadtest 전용 이메일 도메인 사용
+        seed_data(args.users, args.posts, args.comments, args.likes, email_domain=EMAIL_DOMAIN, rng_seed=args.seed,
+                  progress=lambda message: None)
+        seed_elapsed = round(time.perf_counter() - started, 2)
+
+    targets = load_targets()
+    app = None
+    if not args.base_url:
+        from main import app
+
+    load = asyncio.run(run_load(app, args.base_url, targets, args.concurrency, args.duration, args.seed))
+
+    result = {
+        "revision": git_revision(),
+        "config": {
+            "users": len(targets["emails"]),
+            "posts": len(targets["post_ids"]),
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "target": args.base_url or "in-process",
+            "mix": MIX,
+            "seed": args.seed,
+            "cpu_count": os.cpu_count(),
+        },
+        "seed_elapsed_s": seed_elapsed,
+        **load,
+    }
+    text = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
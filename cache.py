@@ -0,0 +1,93 @@
+# cache.py
+import time
+import threading
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    스레드 안전한 인메모리 TTL + LRU 캐시 (워커 프로세스 단위)
+    - maxsize 를 넘으면 가장 오래 안 쓴 항목부터 제거
+    - 항목마다 만료 시간을 따로 줄 수 있음 (set(..., ttl=))
+    - 히트/미스 카운터를 stats() 로 제공
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self._misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def set(self, key, value, ttl: float | None = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def update(self, key, fn):
+        """
+        캐시에 살아있는 값이 있을 때만 fn(value) 결과로 교체 (만료 시간은 유지)
+        없으면 아무것도 하지 않음 -> 다음 조회 때 DB 에서 새로 읽음
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                return None
+            value = fn(entry[0])
+            self._data[key] = (value, entry[1])
+            return value
+
+    def pop(self, key):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return entry[0] if entry else None
+
+    def keys(self) -> list:
+        with self._lock:
+            return list(self._data.keys())
+
+    def pop_where(self, predicate) -> int:
+        """predicate(value) 가 참인 항목을 모두 제거 (역인덱스 없이 값 기준 무효화용)"""
+        with self._lock:
+            keys = [key for key, (value, _) in self._data.items() if predicate(value)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+            }
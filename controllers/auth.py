@@ -1,6 +1,12 @@
 from fastapi import Response
 import uuid  # 세션 ID 생성용
-from database import get_db_connection
+from availability import availability_index
+from database import get_db_connection, run_in_db_executor
+from dependencies import invalidate_session
+from passwords import hash_password, check_password
+from sessions import trim_user_sessions
+from tokens import SESSION_TOKEN_MODE, issue_token, is_token, revocations
+from storage import set_profile_image
 from utils import validate_email, validate_password, validate_nickname, validate_nickname_length, APIException
 from datetime import datetime, timedelta
 
@@ -16,20 +22,24 @@ async def check_email_availability(email: str | None):
     if not validate_email(email):
         raise APIException(code="INVALID_EMAIL_FORMAT", message="올바른 이메일 형식이 아닙니다.", status_code=400)
     
+    # 3. 이메일 중복 체크 (Bloom filter 에 없으면 DB 확인 없이 사용 가능)
+    if not availability_index.email_definitely_free(email) and await email_exists(email):
+        raise APIException(code="ALREADY_EXIST_EMAIL", message="이미 사용 중인 이메일입니다.", status_code=409)
+    
+    return {
+        "code": "EMAIL_AVAILABLE",
+        "message": "사용 가능한 이메일입니다.",
+        "data": None
+    }
+
+@run_in_db_executor
+def email_exists(email: str) -> bool:
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     try:
-        # 3. 이메일 중복 체크
         query = "SELECT id FROM users WHERE email = %s"
         cursor.execute(query, (email,))
-        if cursor.fetchone():
-            raise APIException(code="ALREADY_EXIST_EMAIL", message="이미 사용 중인 이메일입니다.", status_code=409)
-        
-        return {
-            "code": "EMAIL_AVAILABLE",
-            "message": "사용 가능한 이메일입니다.",
-            "data": None
-        }
+        return cursor.fetchone() is not None
     finally:
         cursor.close()
         conn.close()
@@ -50,20 +60,24 @@ async def check_nickname_availability(nickname: str | None):
     if not validate_nickname(nickname):
         raise APIException(code="INVALID_NICKNAME_FORMAT", message="닉네임에 공백이나 특수문자를 포함할 수 없습니다.", status_code=400)
     
+    # 4. 닉네임 중복 체크 (Bloom filter 에 없으면 DB 확인 없이 사용 가능)
+    if not availability_index.nickname_definitely_free(nickname) and await nickname_exists(nickname):
+        raise APIException(code="ALREADY_EXIST_NICKNAME", message="이미 사용 중인 닉네임입니다.", status_code=409)
+    
+    return {
+        "code": "NICKNAME_AVAILABLE",
+        "message": "사용 가능한 닉네임입니다.",
+        "data": None
+    }
+
+@run_in_db_executor
+def nickname_exists(nickname: str) -> bool:
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     try:
-        # 4. 닉네임 중복 체크
         query = "SELECT id FROM users WHERE nickname = %s"
         cursor.execute(query, (nickname,))
-        if cursor.fetchone():
-            raise APIException(code="ALREADY_EXIST_NICKNAME", message="이미 사용 중인 닉네임입니다.", status_code=409)
-        
-        return {
-            "code": "NICKNAME_AVAILABLE",
-            "message": "사용 가능한 닉네임입니다.",
-            "data": None
-        }
+        return cursor.fetchone() is not None
     finally:
         cursor.close()
         conn.close()
@@ -89,6 +103,12 @@ async def auth_signup(user_data: dict):
     if not validate_nickname(user_data["nickname"]):
         raise APIException(code="INVALID_NICKNAME_FORMAT", message="닉네임에 공백이나 특수문자를 포함할 수 없습니다.", status_code=400)
 
+    # 5. 비밀번호 해시 (DB 스레드를 잡기 전에 프로세스 풀에서 계산)
+    password_hash = await hash_password(user_data["password"])
+    return await create_user(user_data, password_hash)
+
+@run_in_db_executor
+def create_user(user_data: dict, password_hash: str):
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     
@@ -118,17 +138,26 @@ async def auth_signup(user_data: dict):
              raise APIException(code="ALREADY_EXIST_NICKNAME", message="이미 사용 중인 닉네임입니다.", status_code=409)
 
         # 6. 저장
-        # PASSWORD HASHING should be here in real app, but using plaintext as per "basics" request
-        insert_query = "INSERT INTO users (email, password, nickname) VALUES (%s, %s, %s)"
-        cursor.execute(insert_query, (user_data["email"], user_data["password"], user_data["nickname"]))
+        # 비밀번호는 scrypt 해시로 저장 (passwords.hash_password)
+        insert_query = "INSERT INTO users (email, password, nickname, profile_image_url) VALUES (%s, %s, %s, %s)"
+        cursor.execute(insert_query, (user_data["email"], password_hash, user_data["nickname"], user_data.get("profileImage")))
         user_id = cursor.lastrowid
         
         # 3. 프로필 이미지 연결 (파일 테이블의 user_id 업데이트)
         if user_data.get("profileImage"):
-            update_file_query = "UPDATE files SET user_id = %s, file_type = 'profile' WHERE file_url = %s"
+            # 같은 내용의 업로드는 URL 이 같으므로 주인 없는 가장 최근 행 하나만 연결
+            update_file_query = """
+                UPDATE files SET user_id = %s, file_type = 'profile'
+                WHERE file_url = %s AND user_id IS NULL AND deleted_at IS NULL
+                ORDER BY id DESC LIMIT 1
+            """
             cursor.execute(update_file_query, (user_id, user_data["profileImage"]))
+            # 이미 만들어진 아바타 썸네일이 있으면 같이 기록
+            set_profile_image(cursor, user_id, user_data["profileImage"])
 
         conn.commit()
+        availability_index.add_email(user_data["email"])
+        availability_index.add_nickname(user_data["nickname"])
         
         return {
             "code": "SIGNUP_SUCCESS", 
@@ -154,21 +183,58 @@ async def auth_login(response: Response, login_data: dict):
     if not login_data.get("email") or not login_data.get("password"):
         raise APIException(code="REQUIRED_FIELDS_MISSING", message="이메일과 비밀번호는 필수입니다.", status_code=400)
     
+    # 1. 사용자 조회 -> 2. 비밀번호 확인(프로세스 풀) -> 3. 세션 생성
+    # 해시 계산 동안 DB 커넥션/스레드를 잡고 있지 않도록 단계를 나눔
+    user = await find_login_user(login_data["email"])
+    matched, new_hash = await check_password(login_data["password"], user["password"] if user else None)
+    
+    if not user or not matched:
+        raise APIException(code="LOGIN_FAILED", message="이메일 또는 비밀번호가 일치하지 않습니다.", status_code=400) # 보안상 401 권장
+
+    # 탈퇴한 회원 로그인 금지
+    if user["is_deleted"]:
+        raise APIException(code="ACCOUNT_DELETED", message="탈퇴한 계정입니다. 다시 가입해주세요.", status_code=403)
+
+    session_id = await create_login_session(user, new_hash)
+    response.set_cookie(key="session_id", value=session_id, httponly=True)
+
+    return {
+        "code": "LOGIN_SUCCESS", 
+        "message": "로그인 성공", 
+        "data": {"email": user["email"]}
+    }
+
+@run_in_db_executor
+def find_login_user(email: str):
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
-    
     try:
-        # 사용자 조회
-        query = "SELECT * FROM users WHERE email = %s AND password = %s"
-        cursor.execute(query, (login_data["email"], login_data["password"]))
-        user = cursor.fetchone()
-        
-        if not user:
-            raise APIException(code="LOGIN_FAILED", message="이메일 또는 비밀번호가 일치하지 않습니다.", status_code=400) # 보안상 401 권장
+        query = "SELECT id, email, password, is_deleted FROM users WHERE email = %s"
+        cursor.execute(query, (email,))
+        return cursor.fetchone()
+    except Exception as e:
+        print(f"Login Error: {e}")
+        raise APIException(code="INTERNAL_ERROR", message="로그인 처리 중 오류 발생", status_code=500)
+    finally:
+        cursor.close()
+        conn.close()
 
-        # 탈퇴한 회원 로그인 금지
-        if user["is_deleted"]:
-            raise APIException(code="ACCOUNT_DELETED", message="탈퇴한 계정입니다. 다시 가입해주세요.", status_code=403)
+@run_in_db_executor
+def create_login_session(user: dict, new_hash: str | None):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        conn.start_transaction()
+        # 예전 평문/이전 비용 설정 해시면 로그인하면서 새 해시로 교체
+        # (확인한 뒤 그 사이 비밀번호가 바뀌었으면 덮어쓰지 않음)
+        if new_hash:
+            rehash_query = "UPDATE users SET password = %s WHERE id = %s AND password = %s"
+            cursor.execute(rehash_query, (new_hash, user["id"], user["password"]))
+
+        # 서명 토큰 모드면 세션 행 없이 토큰만 발급
+        if SESSION_TOKEN_MODE:
+            conn.commit()
+            return issue_token(user["id"])
 
         # 세션 생성 및 쿠키 굽기
         session_id = str(uuid.uuid4())
@@ -178,19 +244,15 @@ async def auth_login(response: Response, login_data: dict):
         
         session_query = "INSERT INTO sessions (user_id, session_id, expires_at) VALUES (%s, %s, %s)"
         cursor.execute(session_query, (user["id"], session_id, expires_at))
-        conn.commit()
         
-        response.set_cookie(key="session_id", value=session_id, httponly=True)
-
-        return {
-            "code": "LOGIN_SUCCESS", 
-            "message": "로그인 성공", 
-            "data": {"email": user["email"]}
-        }
+        # 사용자별 활성 세션 수 제한 (넘치면 오래된 세션부터 로그아웃)
+        trimmed = trim_user_sessions(cursor, user["id"])
+        conn.commit()
+        for trimmed_id in trimmed:
+            invalidate_session(trimmed_id)
+        return session_id
     except Exception as e:
         conn.rollback()
-        if isinstance(e, APIException):
-            raise e
         print(f"Login Error: {e}")
         raise APIException(code="INTERNAL_ERROR", message="로그인 처리 중 오류 발생", status_code=500)
     finally:
@@ -200,8 +262,13 @@ async def auth_login(response: Response, login_data: dict):
 # ==========================================
 # 3. 로그아웃
 # ==========================================
-async def auth_logout(response: Response, session_id: str):
-    if session_id:
+@run_in_db_executor
+def auth_logout(response: Response, session_id: str):
+    invalidate_session(session_id)
+    if is_token(session_id):
+        # 서명 토큰은 DB 에 없으므로 만료 전까지 폐기 목록에 올림
+        revocations.revoke_token(session_id)
+    elif session_id:
         conn = get_db_connection()
         cursor = conn.cursor()
         try:
@@ -1,10 +1,14 @@
 # controllers/comment.py
 
+import json
 from datetime import datetime
-from database import get_db_connection
-from utils import APIException
+from fastapi.responses import StreamingResponse
+from database import get_db_connection, run_in_db_executor
+from utils import APIException, encode_cursor, decode_cursor
+from post_cache import add_comment_count
 
-async def create_comment(post_id: int, comment_data: dict, user: dict):
+@run_in_db_executor
+def create_comment(post_id: int, comment_data: dict, user: dict):
     # 필수값 체크
     if not comment_data.get("content"):
         raise APIException(code="REQUIRED_FIELDS_MISSING", message="댓글 내용은 필수입니다.", status_code=400)
@@ -18,11 +22,15 @@ async def create_comment(post_id: int, comment_data: dict, user: dict):
         if not cursor.fetchone():
              raise APIException(code="POST_NOT_FOUND", message="존재하지 않거나 삭제된 게시글입니다.", status_code=404)
 
+        # 댓글 추가와 comment_count 증가를 한 트랜잭션으로 묶음
+        conn.start_transaction()
         query = "INSERT INTO comments (post_id, user_id, content) VALUES (%s, %s, %s)"
         cursor.execute(query, (post_id, user["userId"], comment_data["content"]))
         new_comment_id = cursor.lastrowid
         
+        cursor.execute("UPDATE posts SET comment_count = comment_count + 1 WHERE id = %s", (post_id,))
         conn.commit()
+        add_comment_count(post_id, 1)
         
         # 생성된 댓글 정보 반환 (작성자 정보 포함)
         created_at = datetime.now().isoformat()
@@ -50,46 +58,133 @@ async def create_comment(post_id: int, comment_data: dict, user: dict):
         cursor.close()
         conn.close()
 
-async def get_comments(post_id: int):
+COMMENT_PAGE_SIZE = 50       # cursor 만 주고 limit 을 안 줬을 때의 페이지 크기
+MAX_COMMENT_PAGE_SIZE = 100  # 한 페이지 최대 댓글 수
+STREAM_FETCH_SIZE = 500      # 스트리밍 시 한 번에 읽어올 행 수
+
+# 댓글 조회 + 작성자 정보
+COMMENT_LIST_QUERY = """
+    SELECT 
+        c.id as commentId,
+        c.post_id as postId,
+        c.content,
+        c.created_at as createdAt,
+        c.updated_at as updatedAt,
+        u.id as authorId,
+        u.nickname as writer,
+        u.email as writerEmail,
+        u.profile_image_url as authorProfileImage,
+        u.profile_thumb_url as authorProfileThumb
+    FROM comments c
+    JOIN users u ON c.user_id = u.id
+    WHERE c.post_id = %s AND c.deleted_at IS NULL
+    {page_filter}
+    ORDER BY c.created_at ASC, c.id ASC
+    {page_limit}
+"""
+
+def _format_comment(comment: dict) -> dict:
+    # 날짜 포맷
+    if isinstance(comment["createdAt"], datetime):
+        comment["createdAt"] = comment["createdAt"].isoformat()
+    if isinstance(comment["updatedAt"], datetime):
+        comment["updatedAt"] = comment["updatedAt"].isoformat()
+    return comment
+
+@run_in_db_executor
+def get_comments(post_id: int, limit: int | None = None, page_cursor: str | None = None):
+    # limit/cursor 가 둘 다 없으면 기존처럼 전체 댓글 (하위 호환)
+    # 있으면 (created_at, id) 기준 keyset 페이지네이션 (오래된 댓글부터)
+    # 어느 쪽이든 data 는 댓글 배열이고, 다음 페이지 커서는 data 밖의 nextCursor 로 줌
+    if limit is not None or page_cursor is not None:
+        limit = max(1, min(limit or COMMENT_PAGE_SIZE, MAX_COMMENT_PAGE_SIZE))
+    comments, next_cursor = _query_comments(post_id, limit, page_cursor)
+    return {
+        "code": "SUCCESS",
+        "message": "댓글 목록 조회 성공",
+        "data": comments,
+        "nextCursor": next_cursor
+    }
+
+def _query_comments(post_id: int, limit: int | None, page_cursor: str | None):
+    """
+    댓글 한 페이지와 다음 페이지 커서 (limit 이 None 이면 전체)
+    인덱스 (post_id, deleted_at, created_at, id) 로 이전 페이지 마지막 댓글 다음부터 바로 읽음
+    """
+    page_filter = ""
+    params = [post_id]
+    if page_cursor:
+        position = decode_cursor(page_cursor)
+        try:
+            last_created_at = datetime.fromisoformat(position["c"])
+            last_id = int(position["i"])
+        except (KeyError, TypeError, ValueError):
+            raise APIException(code="INVALID_CURSOR", message="유효하지 않은 페이지 커서입니다.", status_code=400)
+        page_filter = "AND (c.created_at > %s OR (c.created_at = %s AND c.id > %s))"
+        params += [last_created_at, last_created_at, last_id]
+    if limit is not None:
+        params.append(limit + 1)
+    
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     try:
-        # 댓글 조회 + 작성자 정보
-        query = """
-            SELECT 
-                c.id as commentId,
-                c.post_id as postId,
-                c.content,
-                c.created_at as createdAt,
-                c.updated_at as updatedAt,
-                u.id as authorId,
-                u.nickname as writer,
-                u.email as writerEmail,
-                (SELECT file_url FROM files WHERE user_id = u.id AND file_type = 'profile' AND deleted_at IS NULL ORDER BY created_at DESC LIMIT 1) as authorProfileImage
-            FROM comments c
-            JOIN users u ON c.user_id = u.id
-            WHERE c.post_id = %s AND c.deleted_at IS NULL
-            ORDER BY c.created_at ASC
-        """
-        cursor.execute(query, (post_id,))
+        # 다음 페이지 존재 여부 확인을 위해 limit + 1 개 조회
+        query = COMMENT_LIST_QUERY.format(page_filter=page_filter, page_limit="LIMIT %s" if limit is not None else "")
+        cursor.execute(query, tuple(params))
         comments = cursor.fetchall()
+        has_next = limit is not None and len(comments) > limit
+        if limit is not None:
+            comments = comments[:limit]
+        comments = [_format_comment(comment) for comment in comments]
         
-        # 날짜 포맷
-        for comment in comments:
-             if isinstance(comment["createdAt"], datetime):
-                comment["createdAt"] = comment["createdAt"].isoformat()
-             if isinstance(comment["updatedAt"], datetime):
-                comment["updatedAt"] = comment["updatedAt"].isoformat()
-        
-        return {"code": "SUCCESS", "message": "댓글 목록 조회 성공", "data": comments}
+        next_cursor = None
+        if has_next:
+            last = comments[-1]
+            next_cursor = encode_cursor({"c": last["createdAt"], "i": last["commentId"]})
+        return comments, next_cursor
+    finally:
+        cursor.close()
+        conn.close()
+
+load_comment_page = run_in_db_executor(_query_comments)
+
+@run_in_db_executor
+def check_post_exists(post_id: int):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("SELECT id FROM posts WHERE id = %s AND deleted_at IS NULL", (post_id,))
+        if not cursor.fetchone():
+            raise APIException(code="POST_NOT_FOUND", message="존재하지 않거나 삭제된 게시글입니다.", status_code=404)
     finally:
         cursor.close()
         conn.close()
 
+async def stream_comments(post_id: int) -> StreamingResponse:
+    """
+    댓글 전체를 NDJSON(한 줄에 댓글 하나)으로 스트리밍
+    STREAM_FETCH_SIZE 개씩 keyset 페이지로 읽고, 페이지마다 커넥션을 바로 풀에 돌려준 뒤 내보내므로
+    댓글이 몇 개든 메모리 사용량이 일정하고, 느리게 받는 클라이언트가 커넥션을 붙잡지 않음
+    """
+    # 스트림을 시작하면 상태 코드를 바꿀 수 없으므로 게시글 확인(404)은 먼저
+    await check_post_exists(post_id)
+
+    async def generate():
+        page_cursor = None
+        while True:
+            comments, page_cursor = await load_comment_page(post_id, STREAM_FETCH_SIZE, page_cursor)
+            if comments:
+                yield "".join(json.dumps(comment, ensure_ascii=False) + "\n" for comment in comments)
+            if not page_cursor:
+                break
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
 # ==========================================
 # 3. 댓글 수정
 # ==========================================
-async def update_comment(post_id: int, comment_id: int, update_data: dict, current_user: dict):
+@run_in_db_executor
+def update_comment(post_id: int, comment_id: int, update_data: dict, current_user: dict):
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     try:
@@ -144,7 +239,8 @@ async def update_comment(post_id: int, comment_id: int, update_data: dict, curre
 # ==========================================
 # 4. 댓글 삭제
 # ==========================================
-async def delete_comment(post_id: int, comment_id: int, current_user: dict):
+@run_in_db_executor
+def delete_comment(post_id: int, comment_id: int, current_user: dict):
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     try:
@@ -161,10 +257,17 @@ async def delete_comment(post_id: int, comment_id: int, current_user: dict):
         if target_comment["user_id"] != current_user["userId"]:
             raise APIException(code="NOT_THE_COMMENT_AUTHOR", message="본인이 작성한 댓글만 삭제할 수 있습니다.", status_code=403)
         
-        # 4. 삭제 (Soft Delete)
-        del_query = "UPDATE comments SET deleted_at = NOW() WHERE id = %s"
+        # 4. 삭제 (Soft Delete) + comment_count 감소
+        # 동시 삭제 요청이 두 번 감소시키지 않도록 deleted_at IS NULL 조건으로 실제 삭제된 경우만 반영
+        conn.start_transaction()
+        del_query = "UPDATE comments SET deleted_at = NOW() WHERE id = %s AND deleted_at IS NULL"
         cursor.execute(del_query, (comment_id,))
+        deleted = cursor.rowcount
+        if deleted:
+            cursor.execute("UPDATE posts SET comment_count = comment_count - 1 WHERE id = %s", (post_id,))
         conn.commit()
+        if deleted:
+            add_comment_count(post_id, -1)
         
         return {
             "code": "DELETE_COMMENT_SUCCESS",
@@ -1,18 +1,15 @@
 import os
-import uuid
-import shutil
 from fastapi import UploadFile
-from database import get_db_connection
+from database import get_db_connection, run_in_db_executor
+from dependencies import invalidate_user_sessions
+from storage import UPLOAD_DIR, save_upload_stream, blob_path, place_blob, discard_temp, acquire_blob, set_profile_image
+from thumbnails import schedule_thumbnails
+from post_cache import invalidate_post
 from utils import APIException
 from datetime import datetime
 
-UPLOAD_DIR = "uploads"
 BASE_URL = "http://localhost:8000" # 실제 배포 시에는 환경변수로 관리 필요
 
-# 업로드 디렉토리 확인 및 생성
-if not os.path.exists(UPLOAD_DIR):
-    os.makedirs(UPLOAD_DIR)
-
 async def upload_file(file: UploadFile, file_type: str, user: dict | None):
     # 1. 파일 검증 (확장자, 크기 등)
     allowed_extensions = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
@@ -21,35 +18,47 @@ async def upload_file(file: UploadFile, file_type: str, user: dict | None):
     if file_ext not in allowed_extensions:
         raise APIException(code="INVALID_FILE_TYPE", message="이미지 파일만 업로드 가능합니다.", status_code=400)
     
-    # 2. 고유 파일명 생성
-    unique_filename = f"{uuid.uuid4()}{file_ext}"
-    file_path = os.path.join(UPLOAD_DIR, unique_filename)
+    # 2. 임시 파일로 저장 (청크 단위 스트리밍, 크기 제한/형식 확인, SHA-256 계산)
+    stored = await save_upload_stream(file, file_ext)
     
-    # 3. 파일 저장
-    try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-    except Exception as e:
-        print(f"File Save Error: {e}")
-        raise APIException(code="FILE_SAVE_ERROR", message="파일 저장 중 오류가 발생했습니다.", status_code=500)
+    # 3. 내용 주소 경로 (같은 바이트면 같은 URL)
+    sha256 = stored["sha256"]
+    file_path = blob_path(sha256, stored["ext"])
+    file_url = f"{BASE_URL}/{UPLOAD_DIR}/{sha256[:2]}/{sha256}{stored['ext']}"
     
-    # 4. 파일 크기 확인
-    file_size = os.path.getsize(file_path)
-    file_url = f"{BASE_URL}/{UPLOAD_DIR}/{unique_filename}"
+    # 4. DB 저장 (blobs 참조 + files 테이블) 후 blob 위치로 이동
+    record = await save_file_record(file_type, user, file_url, file.filename, stored, file_path)
     
-    # 5. DB 저장 (files 테이블)
+    # 5. 썸네일은 응답을 기다리게 하지 않고 백그라운드 프로세스 풀에서 생성
+    schedule_thumbnails(sha256, file_path, record_thumbnails)
+    return record
+
+@run_in_db_executor
+def save_file_record(file_type: str, user: dict | None, file_url: str, file_name: str, stored: dict, file_path: str):
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     try:
         # post_id는 아직 모름(NULL), user_id는 로그인한 유저
         query = """
-            INSERT INTO files (file_type, user_id, file_url, file_name, file_size)
-            VALUES (%s, %s, %s, %s, %s)
+            INSERT INTO files (file_type, user_id, file_url, file_name, file_size, sha256)
+            VALUES (%s, %s, %s, %s, %s, %s)
         """
         user_id = user["userId"] if user else None
-        cursor.execute(query, (file_type, user_id, file_url, file.filename, file_size))
+        file_size = stored["size"]
+        conn.start_transaction()
+        acquire_blob(cursor, stored["sha256"], file_path, file_size)
+        cursor.execute(query, (file_type, user_id, file_url, file_name, file_size, stored["sha256"]))
         new_file_id = cursor.lastrowid
+        
+        # 로그인 사용자의 프로필 이미지 업로드면 현재 프로필 URL 도 같이 갱신
+        if file_type == "profile" and user_id:
+            set_profile_image(cursor, user_id, file_url)
+        
+        # blob 행 잠금을 잡은 상태에서 파일을 옮겨야 gc-blobs 와 엇갈리지 않음
+        place_blob(stored["tmp_path"], file_path)
         conn.commit()
+        if file_type == "profile" and user_id:
+            invalidate_user_sessions(user_id)
         
         created_at_query = "SELECT created_at FROM files WHERE id = %s"
         cursor.execute(created_at_query, (new_file_id,))
@@ -58,18 +67,58 @@ async def upload_file(file: UploadFile, file_type: str, user: dict | None):
         return {
             "fileId": new_file_id,
             "fileUrl": file_url,
-            "fileName": file.filename,
+            "fileName": file_name,
             "fileSize": file_size,
             "fileType": file_type,
             "createdAt": created_at
         }
     except Exception as e:
         conn.rollback()
-        # DB 저장 실패 시 저장된 파일도 삭제하는 것이 좋음
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        # blob 은 다른 files 행과 공유될 수 있으므로 지우지 않고 임시 파일만 정리
+        # (이미 옮긴 뒤 커밋이 실패했다면 참조 없는 파일로 남고, 같은 내용이 다시 올라오면 재사용됨)
+        discard_temp(stored["tmp_path"])
         print(f"DB Insert Error: {e}")
         raise APIException(code="INTERNAL_ERROR", message="파일 정보 저장 중 오류 발생", status_code=500)
     finally:
         cursor.close()
         conn.close()
+
+@run_in_db_executor
+def record_thumbnails(sha256: str, paths: dict):
+    """
+    생성된 썸네일 URL 을 같은 내용(sha256)의 files 행 전부와,
+    그 이미지를 현재 프로필로 쓰는 사용자에게 기록
+    """
+    urls = {name: f"{BASE_URL}/{path.replace(os.sep, '/')}" for name, path in paths.items()}
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        conn.start_transaction()
+        cursor.execute(
+            "UPDATE files SET thumb_avatar_url = %s, thumb_feed_url = %s WHERE sha256 = %s",
+            (urls["avatar"], urls["feed"], sha256),
+        )
+        cursor.execute(
+            """
+            UPDATE users u
+            JOIN files f ON f.user_id = u.id AND f.file_url = u.profile_image_url
+            SET u.profile_thumb_url = %s
+            WHERE f.sha256 = %s AND f.file_type = 'profile'
+            """,
+            (urls["avatar"], sha256),
+        )
+        # 썸네일 생성 전에 이미 게시글에 연결됐다면 캐시된 피드/상세를 갱신
+        cursor.execute(
+            "SELECT DISTINCT post_id FROM files WHERE sha256 = %s AND post_id IS NOT NULL AND deleted_at IS NULL",
+            (sha256,),
+        )
+        post_ids = [row["post_id"] for row in cursor.fetchall()]
+        conn.commit()
+        for post_id in post_ids:
+            invalidate_post(post_id)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
@@ -1,16 +1,109 @@
 # controllers/post.py
 
+import os
+import math
+import mysql.connector
 from datetime import datetime
-from database import get_db_connection
-from utils import APIException
+from cache import TTLCache
+from database import get_db_connection, run_in_db_executor
+from storage import release_files
+from search import parse_terms, boolean_query, highlight, snippet, SEARCH_MIN_TERM_LENGTH
+from utils import APIException, encode_cursor, decode_cursor
+from view_counter import view_counter, VIEW_FLUSH_INTERVAL
+from post_cache import (
+    post_detail_cache, set_post_detail, invalidate_post, invalidate_feed, set_like_count,
+    feed_cache_key, feed_version, get_feed_page, set_feed_page,
+    FEED_CACHE_PAGES, FEED_DEFAULT_PAGE_SIZE, POST_DETAIL_CACHE_TTL,
+)
 
-async def get_posts_list(offset: int, limit: int):
+MAX_PAGE_SIZE = 100  # 한 페이지 최대 게시글 수
+VIEW_COUNT_STALENESS_MS = int((VIEW_FLUSH_INTERVAL + POST_DETAIL_CACHE_TTL) * 1000)  # 상세 조회수의 최대 지연
+
+# 게시글 첨부 이미지 (원본 URL 과 썸네일을 같은 files 행에서 읽음)
+# 살아있는 첨부가 여러 개면 가장 최근(id 가 큰) 것, 인덱스 idx_files_post_latest 로 게시글당 한 번만 찾음
+POST_FILE_JOIN = """
+    LEFT JOIN files f ON f.id = (
+        SELECT id FROM files
+        WHERE post_id = p.id AND file_type = 'post' AND deleted_at IS NULL
+        ORDER BY id DESC LIMIT 1
+    )
+"""
+
+# 전체 게시글 수 캐시
+# COUNT(*) 는 InnoDB 에서 인덱스 전체를 훑으므로 페이지마다 실행하지 않고 짧게 캐시함
+# 이 워커의 create_post/delete_post 는 즉시 반영하고, 다른 워커의 변경은 TTL 안에 반영됨
+POST_TOTAL_CACHE_TTL = float(os.getenv("POST_TOTAL_CACHE_TTL", "30"))
+_post_total_cache = TTLCache(maxsize=1, ttl=POST_TOTAL_CACHE_TTL)
+
+@run_in_db_executor
+def load_post_total_count() -> int:
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        count_query = "SELECT COUNT(*) as total FROM posts WHERE deleted_at IS NULL"
+        cursor.execute(count_query)
+        total = cursor.fetchone()["total"]
+        _post_total_cache.set("total", total)
+        return total
+    finally:
+        cursor.close()
+        conn.close()
+
+async def get_posts_list(offset: int, limit: int, page_cursor: str | None = None, include_total: bool = True):
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    offset = max(0, offset)
+    
+    # 1. 앞쪽 페이지는 피드 캐시 확인 (없으면 DB 조회 후 캐시)
+    cache_key = feed_cache_key(offset, limit, page_cursor)
+    page = get_feed_page(cache_key) if cache_key else None
+    if page is None:
+        page = await load_posts_page(offset, limit, page_cursor, cache_key)
+    
+    # 2. 전체 게시글 수 (페이지네이션용, 무한 스크롤 등 필요 없는 클라이언트는 생략 가능)
+    total_count = None
+    if include_total:
+        total_count = _post_total_cache.get("total")
+        if total_count is None:
+            total_count = await load_post_total_count()
+
+    return {
+        "code": "SUCCESS",
+        "message": "게시물 목록 조회 성공",
+        "data": {
+            "posts": page["posts"],
+            "totalCount": total_count,
+            "nextCursor": page["nextCursor"]
+        }
+    }
+
+@run_in_db_executor
+def load_posts_page(offset: int, limit: int, page_cursor: str | None = None, cache_key=None):
+    version = feed_version()
+    
+    # 커서 모드: (created_at, id) 기준 keyset 페이지네이션
+    # 이전 페이지 마지막 글보다 "뒤"에 있는 글만 인덱스로 바로 찾으므로 몇 번째 페이지든 비용이 같음
+    # 커서가 없으면 기존 offset 방식 (하위 호환)
+    if page_cursor:
+        position = decode_cursor(page_cursor)
+        try:
+            last_created_at = datetime.fromisoformat(position["c"])
+            last_id = int(position["i"])
+        except (KeyError, TypeError, ValueError):
+            raise APIException(code="INVALID_CURSOR", message="유효하지 않은 페이지 커서입니다.", status_code=400)
+        page_filter = "AND (p.created_at < %s OR (p.created_at = %s AND p.id < %s))"
+        page_limit = "LIMIT %s"
+        page_params = (last_created_at, last_created_at, last_id, limit + 1)
+    else:
+        page_filter = ""
+        page_limit = "LIMIT %s OFFSET %s"
+        page_params = (limit + 1, offset)
+    
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     try:
         # 게시글 목록 조회 + 작성자 닉네임 + 좋아요 수 + 댓글 수
         # users 테이블과 조인하여 작성자 닉네임/이메일 가져오기
-        # post_likes, comments 테이블에서 count 계산 (서브쿼리)
+        # 좋아요 수, 댓글 수는 posts 의 비정규화 컬럼(like_count, comment_count) 사용
         # deleted_at이 NULL인 게시글만 조회
         
         query = """
@@ -24,45 +117,58 @@ async def get_posts_list(offset: int, limit: int):
                 u.nickname as writer,
                 u.email as writerEmail,
                 u.email as writerEmail,
-                (SELECT file_url FROM files WHERE post_id = p.id AND file_type = 'post' AND deleted_at IS NULL LIMIT 1) as fileUrl,
-                (SELECT file_url FROM files WHERE user_id = u.id AND file_type = 'profile' AND deleted_at IS NULL ORDER BY created_at DESC LIMIT 1) as authorProfileImage,
-                (SELECT COUNT(*) FROM post_likes WHERE post_id = p.id) as likeCount,
-                (SELECT COUNT(*) FROM comments WHERE post_id = p.id AND deleted_at IS NULL) as commentCount
+                f.file_url as fileUrl,
+                f.thumb_feed_url as thumbnailUrl,
+                u.profile_image_url as authorProfileImage,
+                u.profile_thumb_url as authorProfileThumb,
+                p.like_count as likeCount,
+                p.comment_count as commentCount
             FROM posts p
             JOIN users u ON p.user_id = u.id
+            {post_file_join}
             WHERE p.deleted_at IS NULL
-            ORDER BY p.created_at DESC
-            LIMIT %s OFFSET %s
+            {page_filter}
+            ORDER BY p.created_at DESC, p.id DESC
+            {page_limit}
         """
-        cursor.execute(query, (limit, offset))
+        # 다음 페이지 존재 여부 확인을 위해 limit + 1 개 조회
+        cursor.execute(query.format(page_filter=page_filter, page_limit=page_limit, post_file_join=POST_FILE_JOIN), page_params)
         posts = cursor.fetchall()
-        
-        # 전체 게시글 수 (페이지네이션용)
-        count_query = "SELECT COUNT(*) as total FROM posts WHERE deleted_at IS NULL"
-        cursor.execute(count_query)
-        total_count = cursor.fetchone()["total"]
+        has_next = len(posts) > limit
+        posts = posts[:limit]
         
         # Datetime 객체를 문자열로 변환
         for post in posts:
             if isinstance(post["createdAt"], datetime):
                 post["createdAt"] = post["createdAt"].isoformat()
+        
+        # 다음 페이지 커서 (offset 모드에서도 발급해서 커서 모드로 넘어갈 수 있게 함)
+        next_cursor = None
+        if has_next:
+            last = posts[-1]
+            next_cursor = encode_cursor({"c": last["createdAt"], "i": last["postId"]})
 
-        return {
-            "code": "SUCCESS",
-            "message": "게시물 목록 조회 성공",
-            "data": {
-                "posts": posts,
-                "totalCount": total_count
-            }
-        }
+        page = {"posts": posts, "nextCursor": next_cursor}
+        if cache_key:
+            set_feed_page(cache_key, version, page)
+        return page
     finally:
         cursor.close()
         conn.close()
 
+async def warm_feed_cache():
+    """서버 시작 시 피드 앞쪽 페이지를 미리 캐시 (기본 페이지 크기 기준)"""
+    for page_no in range(FEED_CACHE_PAGES):
+        offset = page_no * FEED_DEFAULT_PAGE_SIZE
+        cache_key = feed_cache_key(offset, FEED_DEFAULT_PAGE_SIZE, None)
+        await load_posts_page(offset, FEED_DEFAULT_PAGE_SIZE, None, cache_key)
+    await load_post_total_count()
+
 # ==========================================
 # 4. 게시글 수정
 # ==========================================
-async def update_post(post_id: int, update_data: dict, current_user: dict):
+@run_in_db_executor
+def update_post(post_id: int, update_data: dict, current_user: dict):
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     try:
@@ -93,13 +199,18 @@ async def update_post(post_id: int, update_data: dict, current_user: dict):
         
         # 이미지 URL 업데이트 (files 테이블)
         if "fileUrl" in update_data:
-            # 기존 이미지 삭제 처리 (혹은 덮어쓰기 정책)
-            del_file_query = "UPDATE files SET deleted_at = NOW() WHERE post_id = %s AND file_type = 'post'"
-            cursor.execute(del_file_query, (post_id,))
+            # 기존 이미지 삭제 처리 (blob 참조 감소와 같은 트랜잭션)
+            conn.start_transaction()
+            release_files(cursor, "post_id = %s AND file_type = 'post'", (post_id,))
             
             if update_data["fileUrl"]:
                 # 기존 업로드된 파일의 post_id 연결
-                update_file_query = "UPDATE files SET post_id = %s, file_type = 'post' WHERE file_url = %s"
+                # 같은 내용의 업로드는 URL 이 같으므로 아직 연결 안 된 가장 최근 행 하나만 연결
+                update_file_query = """
+                    UPDATE files SET post_id = %s, file_type = 'post'
+                    WHERE file_url = %s AND post_id IS NULL AND deleted_at IS NULL
+                    ORDER BY id DESC LIMIT 1
+                """
                 cursor.execute(update_file_query, (post_id, update_data["fileUrl"]))
         
         if fields:
@@ -107,6 +218,7 @@ async def update_post(post_id: int, update_data: dict, current_user: dict):
             values.append(post_id)
             cursor.execute(query, tuple(values))
             conn.commit()
+            invalidate_post(post_id)
             
             updated_at = datetime.now().isoformat()
             
@@ -119,7 +231,9 @@ async def update_post(post_id: int, update_data: dict, current_user: dict):
                 }
             }
         else:
-            # 변경사항 없음
+            # 변경사항 없음 (이미지만 바뀌었을 수 있으므로 상세 캐시는 제거)
+             conn.commit()
+             invalidate_post(post_id)
              return {
                 "code": "UPDATE_POST_SUCCESS",
                 "message": "변경 사항이 없습니다.",
@@ -136,7 +250,8 @@ async def update_post(post_id: int, update_data: dict, current_user: dict):
         cursor.close()
         conn.close()
 
-async def create_post(post_data: dict, user: dict):
+@run_in_db_executor
+def create_post(post_data: dict, user: dict):
     # 필수값 체크
     if not post_data.get("title") or not post_data.get("content"):
         raise APIException(code="REQUIRED_FIELDS_MISSING", message="제목과 내용은 필수입니다.", status_code=400)
@@ -150,11 +265,17 @@ async def create_post(post_data: dict, user: dict):
         
         # 파일 연결 (fileUrl이 있는 경우)
         if post_data.get("fileUrl"):
-             # INSERT가 아니라 UPDATE로 기존 파일에 post_id 매핑
-             file_query = "UPDATE files SET post_id = %s, file_type = 'post' WHERE file_url = %s"
+             # INSERT가 아니라 UPDATE로 기존 파일에 post_id 매핑 (같은 URL 중 아직 연결 안 된 최근 행 하나)
+             file_query = """
+                 UPDATE files SET post_id = %s, file_type = 'post'
+                 WHERE file_url = %s AND post_id IS NULL AND deleted_at IS NULL
+                 ORDER BY id DESC LIMIT 1
+             """
              cursor.execute(file_query, (new_post_id, post_data["fileUrl"]))
         
         conn.commit()
+        _post_total_cache.update("total", lambda total: total + 1)
+        invalidate_feed()
         
         return {"code": "POST_CREATED", "message": "게시물이 등록되었습니다.", "data": {"postId": new_post_id}}
     except Exception as e:
@@ -169,11 +290,34 @@ async def create_post(post_data: dict, user: dict):
 # 3. 게시글 상세 조회
 # ==========================================
 async def get_post_detail(post_id: int):
+    # 1. 상세 캐시 확인 (없으면 DB 에서 조합 후 캐시)
+    detail = post_detail_cache.get(post_id)
+    if detail is None:
+        detail = await load_post_detail(post_id)
+    
+    # 2. 조회수 증가
+    # 매 조회마다 UPDATE 하지 않고 메모리 버퍼에 모았다가 주기적으로 한꺼번에 반영 (view_counter.py)
+    # 응답에는 캐시된 조회수 + 아직 반영 안 된 증가분을 더해서 보여줌
+    data = dict(detail)
+    data["viewCount"] += view_counter.incr(post_id)
+    # 다른 서버(워커)의 조회수가 이 응답에 보이기까지 걸릴 수 있는 최대 시간
+    # (그 워커의 반영 주기 + 반영 직전에 캐시된 상세가 만료될 때까지)
+    data["viewCountStalenessMs"] = VIEW_COUNT_STALENESS_MS
+    
+    # 3. 성공 응답
+    return {
+        "code": "GET_POST_DETAIL_SUCCESS",
+        "message": "게시글 정보를 성공적으로 불러왔습니다.",
+        "data": data
+    }
+
+@run_in_db_executor
+def load_post_detail(post_id: int):
+    flush_generation = view_counter.flush_generation()
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     try:
-        # 1. 게시글 찾기 + 작성자 정보 + 조회수 증가
-        # 트랜잭션 시작 (조회수 증가 때문)
+        # 1. 게시글 찾기 + 작성자 정보
         
         # 먼저 게시글 존재 확인
         query = """
@@ -182,64 +326,51 @@ async def get_post_detail(post_id: int):
                 p.title, 
                 p.content, 
                 p.view_count as viewCount, 
+                p.like_count as likeCount,
+                p.comment_count as commentCount,
                 p.created_at as createdAt,
                 u.id as authorId, 
                 u.id as authorId, 
                 u.nickname as writer,
-                (SELECT file_url FROM files WHERE user_id = u.id AND file_type = 'profile' AND deleted_at IS NULL ORDER BY created_at DESC LIMIT 1) as authorProfileImage,
-                (SELECT file_url FROM files WHERE post_id = p.id AND file_type = 'post' AND deleted_at IS NULL LIMIT 1) as fileUrl
+                u.profile_image_url as authorProfileImage,
+                u.profile_thumb_url as authorProfileThumb,
+                f.file_url as fileUrl,
+                f.thumb_feed_url as thumbnailUrl
             FROM posts p
             JOIN users u ON p.user_id = u.id
+            {post_file_join}
             WHERE p.id = %s AND p.deleted_at IS NULL
         """
-        cursor.execute(query, (post_id,))
+        cursor.execute(query.format(post_file_join=POST_FILE_JOIN), (post_id,))
         target_post = cursor.fetchone()
         
         # 2. [404] 게시글 없음
         if not target_post:
             raise APIException(code="POST_NOT_FOUND", message="존재하지 않거나 삭제된 게시글입니다.", status_code=404)
         
-        # 3. 조회수 증가
-        update_view_query = "UPDATE posts SET view_count = view_count + 1 WHERE id = %s"
-        cursor.execute(update_view_query, (post_id,))
-        conn.commit()
-        
-        # 조회수 메모리 상 증가 (반환값용)
-        target_post["viewCount"] += 1
-        
-        # 4. 좋아요 수, 댓글 수 계산
-        like_count_query = "SELECT COUNT(*) as count FROM post_likes WHERE post_id = %s"
-        cursor.execute(like_count_query, (post_id,))
-        like_count = cursor.fetchone()["count"]
-        
-        comment_count_query = "SELECT COUNT(*) as count FROM comments WHERE post_id = %s AND deleted_at IS NULL"
-        cursor.execute(comment_count_query, (post_id,))
-        comment_count = cursor.fetchone()["count"]
-        
         # 날짜 포맷
         if isinstance(target_post["createdAt"], datetime):
             target_post["createdAt"] = target_post["createdAt"].isoformat()
 
-        # 5. 성공 응답
-        return {
-            "code": "GET_POST_DETAIL_SUCCESS",
-            "message": "게시글 정보를 성공적으로 불러왔습니다.",
-            "data": {
-                "postId": target_post["postId"],
-                "title": target_post["title"],
-                "content": target_post["content"],
-                "fileUrl": target_post["fileUrl"],
-                "writer": target_post["writer"],
-                "authorProfileImage": target_post["authorProfileImage"],
-                "authorId": target_post["authorId"],
-                "viewCount": target_post["viewCount"],
-                "likeCount": like_count,
-                "commentCount": comment_count,
-                "createdAt": target_post["createdAt"]
-            }
+        detail = {
+            "postId": target_post["postId"],
+            "title": target_post["title"],
+            "content": target_post["content"],
+            "fileUrl": target_post["fileUrl"],
+            "thumbnailUrl": target_post["thumbnailUrl"],
+            "writer": target_post["writer"],
+            "authorProfileImage": target_post["authorProfileImage"],
+            "authorProfileThumb": target_post["authorProfileThumb"],
+            "authorId": target_post["authorId"],
+            "viewCount": target_post["viewCount"],
+            "likeCount": target_post["likeCount"],
+            "commentCount": target_post["commentCount"],
+            "createdAt": target_post["createdAt"]
         }
+        set_post_detail(post_id, detail, flush_generation)
+        return detail
     except Exception as e:
-        conn.rollback() # 조회수 증가 롤백
+        conn.rollback()
         if isinstance(e, APIException):
             raise e
         print(f"Get Post Detail Error: {e}")
@@ -251,7 +382,8 @@ async def get_post_detail(post_id: int):
 # ==========================================
 # 5. 게시글 삭제
 # ==========================================
-async def delete_post(post_id: int, current_user: dict):
+@run_in_db_executor
+def delete_post(post_id: int, current_user: dict):
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     try:
@@ -269,10 +401,18 @@ async def delete_post(post_id: int, current_user: dict):
             raise APIException(code="NOT_THE_AUTHOR", message="본인이 작성한 글만 삭제할 수 있습니다.", status_code=403)
         
         # 4. 삭제 (Soft Delete)
-        del_query = "UPDATE posts SET deleted_at = NOW() WHERE id = %s"
+        # 첨부 파일도 같은 트랜잭션에서 soft delete 하고 blob 참조를 줄임 (gc-blobs 가 정리할 수 있도록)
+        conn.start_transaction()
+        del_query = "UPDATE posts SET deleted_at = NOW() WHERE id = %s AND deleted_at IS NULL"
         cursor.execute(del_query, (post_id,))
+        deleted = cursor.rowcount
+        if deleted:
+            release_files(cursor, "post_id = %s", (post_id,))
         
         conn.commit()
+        invalidate_post(post_id)
+        if deleted:
+            _post_total_cache.update("total", lambda total: total - 1)
     
         return {
             "code": "DELETE_POST_SUCCESS",
@@ -292,7 +432,8 @@ async def delete_post(post_id: int, current_user: dict):
 # ==========================================
 # 6. 좋아요 추가
 # ==========================================
-async def like_post(post_id: int, current_user: dict):
+@run_in_db_executor
+def like_post(post_id: int, current_user: dict):
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     try:
@@ -303,19 +444,22 @@ async def like_post(post_id: int, current_user: dict):
              raise APIException(code="POST_NOT_FOUND", message="해당 게시글을 찾을 수 없습니다.", status_code=404)
 
         # 3. [409] 이미 좋아요 눌렀는지 확인 & 4. 추가
-        # INSERT IGNORE 또는 try-except로 처리
+        # 좋아요 행 추가와 like_count 증가를 한 트랜잭션으로 묶음
+        conn.start_transaction()
         try:
             ins_query = "INSERT INTO post_likes (post_id, user_id) VALUES (%s, %s)"
             cursor.execute(ins_query, (post_id, current_user["userId"]))
-            conn.commit()
         except mysql.connector.errors.IntegrityError:
             # Duplicate entry 에러
             raise APIException(code="ALREADY_LIKED", message="이미 좋아요를 누른 게시글입니다.", status_code=409)
         
-        # 5. 좋아요 수 계산
-        count_query = "SELECT COUNT(*) as count FROM post_likes WHERE post_id = %s"
-        cursor.execute(count_query, (post_id,))
-        like_count = cursor.fetchone()["count"]
+        cursor.execute("UPDATE posts SET like_count = like_count + 1 WHERE id = %s", (post_id,))
+        
+        # 5. 좋아요 수 (방금 갱신한 카운터)
+        cursor.execute("SELECT like_count FROM posts WHERE id = %s", (post_id,))
+        like_count = cursor.fetchone()["like_count"]
+        conn.commit()
+        set_like_count(post_id, like_count)
         
         return {
             "code": "LIKE_SUCCESS",
@@ -335,7 +479,8 @@ async def like_post(post_id: int, current_user: dict):
 # ==========================================
 # 7. 좋아요 취소
 # ==========================================
-async def unlike_post(post_id: int, current_user: dict):
+@run_in_db_executor
+def unlike_post(post_id: int, current_user: dict):
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     try:
@@ -345,15 +490,18 @@ async def unlike_post(post_id: int, current_user: dict):
         if not cursor.fetchone():
              raise APIException(code="POST_NOT_FOUND", message="해당 게시글을 찾을 수 없습니다.", status_code=404)
         
-        # 3. 좋아요 찾아서 삭제
+        # 3. 좋아요 찾아서 삭제 (실제로 지워졌을 때만 like_count 감소)
+        conn.start_transaction()
         del_query = "DELETE FROM post_likes WHERE post_id = %s AND user_id = %s"
         cursor.execute(del_query, (post_id, current_user["userId"]))
-        conn.commit()
+        if cursor.rowcount:
+            cursor.execute("UPDATE posts SET like_count = like_count - 1 WHERE id = %s", (post_id,))
         
-        # 4. 좋아요 수 계산
-        count_query = "SELECT COUNT(*) as count FROM post_likes WHERE post_id = %s"
-        cursor.execute(count_query, (post_id,))
-        like_count = cursor.fetchone()["count"]
+        # 4. 좋아요 수 (카운터)
+        cursor.execute("SELECT like_count FROM posts WHERE id = %s", (post_id,))
+        like_count = cursor.fetchone()["like_count"]
+        conn.commit()
+        set_like_count(post_id, like_count)
         
         return {
             "code": "UNLIKE_SUCCESS",
@@ -368,4 +516,114 @@ async def unlike_post(post_id: int, current_user: dict):
         raise APIException(code="INTERNAL_ERROR", message="좋아요 취소 중 오류 발생", status_code=500)
     finally:
         cursor.close()
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+# ==========================================
+# 8. 게시글 검색
+# ==========================================
+async def search_posts(query: str, limit: int, page_cursor: str | None = None):
+    terms = parse_terms(query)
+    if not terms:
+        raise APIException(
+            code="INVALID_SEARCH_QUERY",
+            message=f"검색어는 {SEARCH_MIN_TERM_LENGTH}글자 이상 입력해주세요.",
+            status_code=400,
+        )
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    page = await load_search_page(terms, limit, page_cursor)
+    return {
+        "code": "SUCCESS",
+        "message": "게시물 검색 성공",
+        "data": page
+    }
+
+@run_in_db_executor
+def load_search_page(terms: list, limit: int, page_cursor: str | None = None):
+    # 커서: 이전 페이지 마지막 글의 (관련도 점수, id) -> 그보다 "뒤"인 글만
+    # 페이지 이동은 best-effort: 관련도는 실수이고, InnoDB 는 글이 추가/삭제될 때마다 단어 빈도(IDF)가
+    # 바뀌어 같은 글의 점수도 달라지므로, 페이지를 넘기는 사이 글이 바뀌면 결과가 빠지거나 중복될 수 있음
+    # (피드처럼 정확한 이어보기가 필요한 목록이 아니라 상위 몇 페이지를 훑는 용도)
+    page_filter = ""
+    page_params = ()
+    if page_cursor:
+        position = decode_cursor(page_cursor)
+        try:
+            last_score = float(position["s"])
+            last_id = int(position["i"])
+            if not math.isfinite(last_score):  # "nan"/"inf" 도 float 로는 읽히지만 SQL 에 넣을 수 없음
+                raise ValueError(last_score)
+        except (KeyError, TypeError, ValueError, OverflowError):
+            raise APIException(code="INVALID_CURSOR", message="유효하지 않은 페이지 커서입니다.", status_code=400)
+        page_filter = "HAVING score < %s OR (score = %s AND id < %s)"
+        page_params = (last_score, last_score, last_id)
+
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        # FULLTEXT(ngram) 인덱스로 일치하는 글의 (id, 점수)만 먼저 골라서 정렬/자르고 (posts 만 읽음)
+        # 잘라낸 limit + 1 개에 대해서만 본문/작성자를 조인함
+        # (일치하는 글 전체에 users 조인과 본문 읽기를 하지 않으므로 결과가 많아도 비용이 작음)
+        match = boolean_query(terms)
+        query = """
+            SELECT
+                p.id as postId,
+                p.title,
+                p.content,
+                p.view_count as viewCount,
+                p.like_count as likeCount,
+                p.comment_count as commentCount,
+                p.created_at as createdAt,
+                u.id as authorId,
+                u.nickname as writer,
+                u.profile_image_url as authorProfileImage,
+                u.profile_thumb_url as authorProfileThumb,
+                s.score
+            FROM (
+                SELECT id, MATCH(title, content) AGAINST (%s IN BOOLEAN MODE) as score
+                FROM posts
+                WHERE MATCH(title, content) AGAINST (%s IN BOOLEAN MODE) AND deleted_at IS NULL
+                {page_filter}
+                ORDER BY score DESC, id DESC
+                LIMIT %s
+            ) s
+            JOIN posts p ON p.id = s.id
+            JOIN users u ON u.id = p.user_id
+            ORDER BY s.score DESC, s.id DESC
+        """
+        cursor.execute(query.format(page_filter=page_filter), (match, match, *page_params, limit + 1))
+        rows = cursor.fetchall()
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+
+        posts = []
+        for row in rows:
+            created_at = row["createdAt"]
+            posts.append({
+                "postId": row["postId"],
+                "title": row["title"],
+                "titleHighlight": highlight(row["title"], terms),
+                "snippet": snippet(row["content"], terms),
+                "writer": row["writer"],
+                "authorId": row["authorId"],
+                "authorProfileImage": row["authorProfileImage"],
+                "authorProfileThumb": row["authorProfileThumb"],
+                "viewCount": row["viewCount"],
+                "likeCount": row["likeCount"],
+                "commentCount": row["commentCount"],
+                "createdAt": created_at.isoformat() if isinstance(created_at, datetime) else created_at,
+                "score": float(row["score"]),
+            })
+
+        next_cursor = None
+        if has_next:
+            last = posts[-1]
+            next_cursor = encode_cursor({"s": last["score"], "i": last["postId"]})
+        return {"posts": posts, "nextCursor": next_cursor}
+    except Exception as e:
+        if isinstance(e, APIException):
+            raise e
+        print(f"Search Posts Error: {e}")
+        raise APIException(code="INTERNAL_ERROR", message="게시글 검색 중 오류 발생", status_code=500)
+    finally:
+        cursor.close()
+        conn.close()
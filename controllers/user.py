@@ -1,6 +1,11 @@
 # controllers/user.py
 
-from database import get_db_connection
+from availability import availability_index
+from database import get_db_connection, run_in_db_executor
+from dependencies import invalidate_user_sessions
+from passwords import hash_password, check_password
+from storage import release_files, blob_digest_from_url, set_profile_image
+from tokens import revoke_user_tokens
 from utils import APIException, validate_nickname, validate_nickname_length, validate_password
 
 async def get_my_info(user: dict):
@@ -23,7 +28,8 @@ async def get_my_info(user: dict):
         }
     }
 
-async def get_user_by_id(user_id: int):
+@run_in_db_executor
+def get_user_by_id(user_id: int):
     """
     특정 사용자 정보 조회 (ID 기반)
     """
@@ -46,17 +52,6 @@ async def get_user_by_id(user_id: int):
         if matched_user["is_deleted"]:
             raise APIException(code="FORBIDDEN", message="접근이 거부되었습니다.", status_code=403)
 
-        # 프로필 이미지 가져오기
-        img_query = """
-            SELECT file_url FROM files 
-            WHERE user_id = %s AND file_type = 'profile' AND deleted_at IS NULL
-            ORDER BY created_at DESC LIMIT 1
-        """
-        cursor.execute(img_query, (user_id,))
-        img = cursor.fetchone()
-        
-        profileimage = img["file_url"] if img else None
-
         # 6. 성공 응답
         return {
             "code": "GET_USER_SUCCESS",
@@ -65,7 +60,7 @@ async def get_user_by_id(user_id: int):
                 "userId": matched_user["id"],
                 "email": matched_user["email"],
                 "nickname": matched_user["nickname"],
-                "profileImage": profileimage
+                "profileImage": matched_user["profile_image_url"]
             }
         }
     finally:
@@ -75,7 +70,8 @@ async def get_user_by_id(user_id: int):
 # ==========================================
 # 3. 회원정보 수정
 # ==========================================
-async def update_user(user_id: int, update_data: dict, current_user: dict):
+@run_in_db_executor
+def update_user(user_id: int, update_data: dict, current_user: dict):
     # 1. 권한 체크: 본인만 수정 가능
     if current_user["userId"] != user_id:
         raise APIException(code="PERMISSION_DENIED", message="본인의 정보만 수정할 수 있습니다.", status_code=403)
@@ -106,18 +102,30 @@ async def update_user(user_id: int, update_data: dict, current_user: dict):
         # 4. 프로필 이미지 수정 (새 파일 insert)
         # file_url만 업데이트한다고 가정 (기존 파일 삭제 처리 등은 복잡하므로 단순 insert, 최신꺼 select)
         if "profileImage" in update_data and update_data["profileImage"]:
-            # 기존 프로필 이미지들 soft delete 처리
-            del_img_query = "UPDATE files SET deleted_at = NOW() WHERE user_id = %s AND file_type = 'profile'"
-            cursor.execute(del_img_query, (user_id,))
+            # 기존 프로필 이미지들 soft delete 처리 (blob 참조 감소와 같은 트랜잭션)
+            conn.start_transaction()
+            release_files(cursor, "user_id = %s AND file_type = 'profile'", (user_id,))
             
-            # 새 이미지 insert
+            # 새 이미지 insert (blob URL 이면 참조 +1)
+            sha256 = blob_digest_from_url(update_data["profileImage"])
+            if sha256:
+                cursor.execute("UPDATE blobs SET ref_count = ref_count + 1, released_at = NULL WHERE sha256 = %s", (sha256,))
+                if not cursor.rowcount:
+                    sha256 = None  # 이미 정리된 blob 이면 참조로 잡지 않음
             ins_img_query = """
-                INSERT INTO files (file_type, user_id, file_url, file_name, file_size)
-                VALUES ('profile', %s, %s, 'profile.jpg', 0)
+                INSERT INTO files (file_type, user_id, file_url, file_name, file_size, sha256)
+                VALUES ('profile', %s, %s, 'profile.jpg', 0, %s)
             """
-            cursor.execute(ins_img_query, (user_id, update_data["profileImage"]))
+            cursor.execute(ins_img_query, (user_id, update_data["profileImage"], sha256))
+            
+            # 현재 프로필 URL 비정규화 컬럼 갱신
+            set_profile_image(cursor, user_id, update_data["profileImage"])
 
         conn.commit()
+        if new_nickname:
+            availability_index.add_nickname(new_nickname)
+        # 세션 캐시에 남은 예전 닉네임/프로필 제거
+        invalidate_user_sessions(user_id)
     
         return {
             "code": "UPDATE_USER_SUCCESS",
@@ -148,40 +156,58 @@ async def change_password(user_id: int, password_data: dict, current_user: dict)
     if not current_pw or not new_pw:
         raise APIException(code="MISSING_PASSWORD_FIELDS", message="현재 비밀번호와 새 비밀번호를 모두 입력해주세요.", status_code=400)
     
+    # 3. DB에서 현재 비번 조회
+    stored = await load_password(user_id)
+    if stored is None:
+        raise APIException(code="USER_NOT_FOUND", message="사용자를 찾을 수 없습니다.", status_code=404)
+
+    # 4. 현재 비밀번호 확인 (해시 계산은 프로세스 풀에서)
+    matched, _ = await check_password(current_pw, stored)
+    if not matched:
+        raise APIException(code="INVALID_CURRENT_PASSWORD", message="현재 사용 중인 비밀번호가 일치하지 않습니다.", status_code=401)
+    
+    # 5. 새 비밀번호 강도 검사
+    if not validate_password(new_pw):
+        raise APIException(code="WEAK_PASSWORD", message="비밀번호는 영문, 숫자, 특수문자를 포함하여 8~20자여야 합니다.", status_code=400)
+    
+    # 6. 비밀번호 변경
+    await update_password(user_id, await hash_password(new_pw))
+    
+    return {
+        "code": "CHANGE_PASSWORD_SUCCESS",
+        "message": "비밀번호가 성공적으로 변경되었습니다.",
+        "data": None
+    }
+
+@run_in_db_executor
+def load_password(user_id: int) -> str | None:
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
-    
     try:
-        # DB에서 현재 비번 조회
         query = "SELECT password FROM users WHERE id = %s"
         cursor.execute(query, (user_id,))
         user = cursor.fetchone()
-        
-        if not user:
-            raise APIException(code="USER_NOT_FOUND", message="사용자를 찾을 수 없습니다.", status_code=404)
+        return user["password"] if user else None
+    except Exception as e:
+        print(f"Change Password Error: {e}")
+        raise APIException(code="INTERNAL_ERROR", message="비밀번호 변경 중 오류 발생", status_code=500)
+    finally:
+        cursor.close()
+        conn.close()
 
-        # 4. 현재 비밀번호 확인
-        if user["password"] != current_pw:
-            raise APIException(code="INVALID_CURRENT_PASSWORD", message="현재 사용 중인 비밀번호가 일치하지 않습니다.", status_code=401)
-        
-        # 5. 새 비밀번호 강도 검사
-        if not validate_password(new_pw):
-            raise APIException(code="WEAK_PASSWORD", message="비밀번호는 영문, 숫자, 특수문자를 포함하여 8~20자여야 합니다.", status_code=400)
-        
-        # 6. 비밀번호 변경
+@run_in_db_executor
+def update_password(user_id: int, password_hash: str):
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        conn.start_transaction()
         update_pw_query = "UPDATE users SET password = %s WHERE id = %s"
-        cursor.execute(update_pw_query, (new_pw, user_id))
+        cursor.execute(update_pw_query, (password_hash, user_id))
+        revoke_user_tokens(cursor, user_id)  # 이전에 발급된 서명 토큰도 무효화
         conn.commit()
-        
-        return {
-            "code": "CHANGE_PASSWORD_SUCCESS",
-            "message": "비밀번호가 성공적으로 변경되었습니다.",
-            "data": None
-        }
+        invalidate_user_sessions(user_id)
     except Exception as e:
         conn.rollback()
-        if isinstance(e, APIException):
-            raise e
         print(f"Change Password Error: {e}")
         raise APIException(code="INTERNAL_ERROR", message="비밀번호 변경 중 오류 발생", status_code=500)
     finally:
@@ -191,16 +217,18 @@ async def change_password(user_id: int, password_data: dict, current_user: dict)
 # ==========================================
 # 5. 회원 탈퇴 (Soft Delete)
 # ==========================================
-async def delete_user(current_user: dict):
+@run_in_db_executor
+def delete_user(current_user: dict):
     user_id = current_user["userId"]
     
     conn = get_db_connection()
-    cursor = conn.cursor()
+    cursor = conn.cursor(dictionary=True)
     
     try:
         # 2. Soft Delete 처리 (is_deleted = 1, deleted_at = NOW)
         # 닉네임 유니크를 어떡하지? 탈퇴해도 닉네임 유니크 유지가 필요하면 그대로 둠.
         # 여기선 is_deleted=True로 업데이트
+        conn.start_transaction()
         
         update_query = "UPDATE users SET is_deleted = TRUE, deleted_at = NOW() WHERE id = %s"
         cursor.execute(update_query, (user_id,))
@@ -209,7 +237,12 @@ async def delete_user(current_user: dict):
         del_session_query = "DELETE FROM sessions WHERE user_id = %s"
         cursor.execute(del_session_query, (user_id,))
         
+        # 4. 프로필 이미지 soft delete + blob 참조 감소 (gc-blobs 가 정리할 수 있도록)
+        release_files(cursor, "user_id = %s AND file_type = 'profile'", (user_id,))
+        revoke_user_tokens(cursor, user_id)
+        
         conn.commit()
+        invalidate_user_sessions(user_id)
         
         return {
             "code": "DELETE_USER_SUCCESS",
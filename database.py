@@ -1,6 +1,17 @@
 # database.py
+import os
+import re
+import time
+import asyncio
+import functools
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from functools import lru_cache
 import mysql.connector
 from typing import Generator
+from utils import APIException
 
 # 1. MySQL 연결 설정
 DB_CONFIG = {
@@ -13,9 +24,378 @@ DB_CONFIG = {
     "autocommit": True  # 자동 커밋 활성화
 }
 
+# 2. 커넥션 풀 설정 (환경변수로 조정 가능)
+POOL_CONFIG = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),            # 유지할 커넥션 수
+    "max_overflow": int(os.getenv("DB_POOL_MAX_OVERFLOW", "10")), # 피크 시 추가로 허용할 커넥션 수
+    "timeout": float(os.getenv("DB_POOL_TIMEOUT", "5")),          # 커넥션 대기 최대 시간(초)
+    "recycle": float(os.getenv("DB_POOL_RECYCLE", "1800")),       # 커넥션 최대 수명(초), wait_timeout보다 짧게
+    "pre_ping": float(os.getenv("DB_POOL_PRE_PING", "30")),       # 이 시간(초) 이상 놀던 커넥션은 ping으로 확인
+}
+
+# 3. 쿼리 계측 설정
+QUERY_STATS_ENABLED = os.getenv("DB_QUERY_STATS", "1") == "1"                  # 쿼리별 시간/횟수 집계
+SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))                    # 이보다 오래 걸린 쿼리는 로그 (파라미터는 가림)
+QUERY_REPEAT_WARN = int(os.getenv("DB_QUERY_REPEAT_WARN", "10"))               # 한 요청에서 같은 쿼리가 이만큼 반복되면 로그 (N+1 의심)
+QUERY_DEBUG_HEADER = os.getenv("DB_QUERY_DEBUG_HEADER", "0") == "1"            # 응답에 X-Query-Count / X-Query-Time-Ms 헤더 추가
+QUERY_FINGERPRINT_LIMIT = int(os.getenv("DB_QUERY_FINGERPRINT_LIMIT", "500"))  # 집계할 쿼리 종류 최대 수 (넘치면 "other")
+
+
+# ==========================================
+# 쿼리 계측 (지문 단위 집계 + 요청 단위 카운트)
+# ==========================================
+_STRING_LITERAL = re.compile(r"""'(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.)*\"""")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))*\s*\)")
+_CASE_LIST = re.compile(r"(?:WHEN (?:\?|%s) THEN (?:\?|%s)\s*)+", re.IGNORECASE)
+_VALUES_LIST = re.compile(r"(\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def fingerprint_sql(sql: str) -> str:
+    """
+    값만 다른 쿼리를 같은 것으로 묶기 위한 정규화
+    문자열/숫자 리터럴 -> ?, IN (%s, %s, ...) / 여러 행 VALUES -> (...), 반복되는 CASE WHEN -> WHEN ..., 공백 정리
+    """
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(...)", sql)
+    sql = _VALUES_LIST.sub(r"\1", sql)
+    sql = _CASE_LIST.sub("WHEN ... ", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def _redact_params(params) -> str:
+    """느린 쿼리 로그용: 값 대신 타입/길이만 남김 (이메일, 비밀번호 해시, 세션 ID 등이 로그에 남지 않도록)"""
+    if params is None:
+        return "()"
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{key}: {_redact_value(value)}" for key, value in params.items()) + "}"
+    return "(" + ", ".join(_redact_value(value) for value in params) + ")"
+
+
+def _redact_value(value) -> str:
+    if value is None or isinstance(value, (bool, int, float)):
+        return type(value).__name__
+    if isinstance(value, (str, bytes)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+class QueryLog:
+    """
+    프로세스 전체 쿼리 지문별 누적 (횟수, 총 시간, 최대 시간)
+    DB 스레드 여러 개가 동시에 기록하므로 짧은 잠금 사용
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._entries = {}  # fingerprint -> [count, total, max]
+
+    def record(self, fingerprint: str, elapsed: float, executed: bool = True):
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                if len(self._entries) >= self.limit:
+                    fingerprint = "other"
+                    entry = self._entries.get(fingerprint)
+                if entry is None:
+                    entry = self._entries[fingerprint] = [0, 0.0, 0.0]
+            entry[0] += executed
+            entry[1] += elapsed
+            if elapsed > entry[2]:
+                entry[2] = elapsed
+
+    def stats(self) -> list:
+        """[(라벨, 값)] 형식 (metrics 수집용), 총 시간이 큰 순서"""
+        with self._lock:
+            items = sorted(self._entries.items(), key=lambda item: item[1][1], reverse=True)
+        return [
+            ({"fingerprint": fingerprint}, {"count": count, "seconds_total": round(total, 6), "max_seconds": round(longest, 6)})
+            for fingerprint, (count, total, longest) in items
+        ]
+
+
+query_log = QueryLog(QUERY_FINGERPRINT_LIMIT)
+
+
+class RequestQueries:
+    """요청 하나에서 실행한 쿼리 수/시간 (QueryStatsMiddleware 가 contextvar 로 심어둠)"""
+
+    __slots__ = ("count", "elapsed", "fingerprints")
+
+    def __init__(self):
+        self.count = 0
+        self.elapsed = 0.0
+        self.fingerprints = {}
+
+
+# run_in_db_executor 가 컨텍스트를 복사해서 넘기므로 DB 스레드에서도 같은 객체를 갱신함
+_request_queries: contextvars.ContextVar = contextvars.ContextVar("request_queries", default=None)
+
+
+class InstrumentedCursor:
+    """
+    mysql.connector 커서 래퍼: execute 시간을 재서 지문별로 집계하고 요청 단위 카운트를 올림
+    - fetch 시간(unbuffered 커서에서 행을 받는 시간)은 마지막 쿼리 지문의 시간에 더함
+    - 나머지 속성(rowcount, lastrowid, close 등)은 원래 커서 그대로
+    """
+
+    __slots__ = ("_raw", "_fingerprint")
+
+    def __init__(self, raw):
+        self._raw = raw
+        self._fingerprint = None
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def execute(self, operation, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._raw.execute(operation, *args, **kwargs)
+        finally:
+            self._record(operation, args[0] if args else kwargs.get("params"), time.perf_counter() - started)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._raw.executemany(operation, seq_params, *args, **kwargs)
+        finally:
+            self._record(operation, None, time.perf_counter() - started)
+
+    def fetchone(self):
+        return self._timed_fetch(self._raw.fetchone)
+
+    def fetchmany(self, *args, **kwargs):
+        return self._timed_fetch(self._raw.fetchmany, *args, **kwargs)
+
+    def fetchall(self):
+        return self._timed_fetch(self._raw.fetchall)
+
+    def _timed_fetch(self, fetch, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fetch(*args, **kwargs)
+        finally:
+            if self._fingerprint is not None:
+                elapsed = time.perf_counter() - started
+                query_log.record(self._fingerprint, elapsed, executed=False)
+                current = _request_queries.get()
+                if current is not None:
+                    current.elapsed += elapsed
+
+    def _record(self, operation, params, elapsed: float):
+        sql = operation.decode("utf-8", "replace") if isinstance(operation, (bytes, bytearray)) else str(operation)
+        fingerprint = self._fingerprint = fingerprint_sql(sql)
+        query_log.record(fingerprint, elapsed)
+
+        current = _request_queries.get()
+        if current is not None:
+            current.count += 1
+            current.elapsed += elapsed
+            current.fingerprints[fingerprint] = current.fingerprints.get(fingerprint, 0) + 1
+
+        if elapsed * 1000 >= SLOW_QUERY_MS:
+            print(f"Slow Query ({elapsed * 1000:.1f}ms): {fingerprint} params={_redact_params(params)}")
+
+
+class PooledConnection:
+    """
+    풀에서 빌려준 커넥션 래퍼
+    기존 코드처럼 conn.close()를 호출하면 실제로 끊지 않고 풀에 반납함
+    """
+
+    def __init__(self, pool: "ConnectionPool", raw, created_at: float):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def cursor(self, *args, **kwargs):
+        raw = self._raw.cursor(*args, **kwargs)
+        return InstrumentedCursor(raw) if QUERY_STATS_ENABLED else raw
+
+    def close(self):
+        if self._released:
+            return
+        self._released = True
+        self._pool._release(self._raw, self._created_at)
+
+    def invalidate(self):
+        """커넥션 상태를 믿을 수 없을 때 (읽다 만 결과 등) 풀에 돌려보내지 않고 닫음"""
+        if self._released:
+            return
+        try:
+            self._raw.close()
+        except Exception:
+            pass
+        self.close()  # 끊긴 커넥션은 _release 에서 폐기됨
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConnectionPool:
+    """
+    스레드 안전한 MySQL 커넥션 풀
+    - pool_size 만큼 유휴 커넥션을 유지하고, 부족하면 max_overflow 까지 임시 커넥션 생성
+    - 한도에 도달하면 timeout 초 동안 반납을 기다림 (초과 시 503)
+    - recycle 초가 지난 커넥션은 폐기, pre_ping 초 이상 놀던 커넥션은 ping 후 사용
+    """
+
+    def __init__(self, db_config: dict, pool_size: int = 10, max_overflow: int = 10,
+                 timeout: float = 5, recycle: float = 1800, pre_ping: float = 30):
+        self._db_config = db_config
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (raw_conn, created_at, last_used_at)
+        self._total = 0       # 현재 열려있는 커넥션 수 (유휴 + 사용중)
+        self._checked_out = 0
+        self._stats = {
+            "checkouts": 0,
+            "created": 0,
+            "recycled": 0,
+            "ping_failures": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "wait_time_total": 0.0,
+        }
+
+    def _connect(self):
+        return mysql.connector.connect(**self._db_config)
+
+    def _discard(self, raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    def _count(self, key: str):
+        with self._cond:
+            self._stats[key] += 1
+
+    def _is_usable(self, raw, created_at: float, last_used_at: float, now: float) -> bool:
+        if self.recycle and now - created_at > self.recycle:
+            self._count("recycled")
+            return False
+        if self.pre_ping is not None and now - last_used_at > self.pre_ping:
+            try:
+                raw.ping(reconnect=False)
+            except Exception:
+                self._count("ping_failures")
+                return False
+        return True
+
+    def connect(self) -> PooledConnection:
+        """커넥션 대여 (반납은 conn.close())"""
+        deadline = time.monotonic() + self.timeout
+        waited_from = None
+
+        with self._cond:
+            while not self._idle and self._total >= self.pool_size + self.max_overflow:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise APIException(code="DB_POOL_EXHAUSTED", message="요청이 많아 잠시 후 다시 시도해주세요.", status_code=503)
+                if waited_from is None:
+                    waited_from = time.monotonic()
+                    self._stats["waits"] += 1
+                self._cond.wait(remaining)
+
+            if waited_from is not None:
+                self._stats["wait_time_total"] += time.monotonic() - waited_from
+
+            entry = self._idle.pop() if self._idle else None  # LIFO: 최근에 쓴(따뜻한) 커넥션 우선
+            self._total += 0 if entry else 1
+            self._checked_out += 1
+            self._stats["checkouts"] += 1
+
+        # 네트워크 I/O(ping, connect)는 락 밖에서 수행
+        if entry:
+            raw, created_at, last_used_at = entry
+            if self._is_usable(raw, created_at, last_used_at, time.monotonic()):
+                return PooledConnection(self, raw, created_at)
+            self._discard(raw)
+
+        try:
+            raw = self._connect()
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._checked_out -= 1
+                self._cond.notify()
+            raise
+        self._count("created")
+        return PooledConnection(self, raw, time.monotonic())
+
+    def _release(self, raw, created_at: float):
+        keep = True
+        try:
+            if not raw.is_connected():
+                keep = False
+            elif raw.in_transaction:
+                # 커밋/롤백 없이 반납된 트랜잭션은 되돌려서 다음 사용자에게 넘기지 않음
+                raw.rollback()
+        except Exception:
+            keep = False
+
+        with self._cond:
+            self._checked_out -= 1
+            if keep and len(self._idle) < self.pool_size:
+                self._idle.append((raw, created_at, time.monotonic()))
+            else:
+                # 오버플로 커넥션 또는 깨진 커넥션은 닫음
+                self._total -= 1
+                keep = False
+            self._cond.notify()
+
+        if not keep:
+            self._discard(raw)
+
+    def dispose(self):
+        """유휴 커넥션 모두 닫기 (서버 종료 시)"""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._total -= len(idle)
+        for raw, _, _ in idle:
+            self._discard(raw)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "pool_size": self.pool_size,
+                "max_overflow": self.max_overflow,
+                "open": self._total,
+                "idle": len(self._idle),
+                "checked_out": self._checked_out,
+                "overflow": max(0, self._total - self.pool_size),
+                **self._stats,
+            }
+
+
+pool = ConnectionPool(DB_CONFIG, **POOL_CONFIG)
+
 def get_db_connection():
-    """DB 연결 객체 반환"""
-    return mysql.connector.connect(**DB_CONFIG)
+    """DB 연결 객체 반환 (커넥션 풀에서 대여, close() 시 반납)"""
+    return pool.connect()
 
 def get_db_cursor(dictionary=True):
     """
@@ -25,6 +405,65 @@ def get_db_cursor(dictionary=True):
     conn = get_db_connection()
     return conn, conn.cursor(dictionary=dictionary)
 
+# ==========================================
+# DB 전용 스레드풀 (이벤트 루프 블로킹 방지)
+# ==========================================
+# mysql.connector는 동기 드라이버라 async 핸들러에서 바로 호출하면 쿼리 동안 워커 전체가 멈춤
+# 스레드 수는 풀 한도와 맞춰서, 스레드가 커넥션 반납을 기다리며 놀지 않도록 함
+DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", str(pool.pool_size + pool.max_overflow)))
+
+_db_executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_WORKERS, thread_name_prefix="db")
+
+def run_in_db_executor(func):
+    """
+    동기 DB 함수를 DB 전용 스레드풀에서 실행하는 async 함수로 바꿔주는 데코레이터
+    호출하는 쪽(라우터)은 기존처럼 await 하면 됨
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        ctx = contextvars.copy_context()  # 요청 단위 contextvar를 스레드로 전달
+        return await loop.run_in_executor(_db_executor, functools.partial(ctx.run, func, *args, **kwargs))
+    return wrapper
+
+class QueryStatsMiddleware:
+    """
+    요청마다 RequestQueries 를 contextvar 에 심어두고, 끝나면 반복 쿼리(N+1 의심)를 로그
+    DB_QUERY_DEBUG_HEADER=1 이면 응답 헤더로 쿼리 수/시간을 알려줌
+    (헤더는 응답 시작 시점 기준이라 스트리밍 응답 본문을 만드는 동안의 쿼리는 빠짐)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not QUERY_STATS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        current = RequestQueries()
+        token = _request_queries.set(current)
+
+        async def send_wrapper(message):
+            if QUERY_DEBUG_HEADER and message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-query-count", str(current.count).encode("latin-1")),
+                    (b"x-query-time-ms", f"{current.elapsed * 1000:.2f}".encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_queries.reset(token)
+            for fingerprint, count in current.fingerprints.items():
+                if count >= QUERY_REPEAT_WARN:
+                    print(f"Repeated Query Warning ({scope['method']} {scope['path']}): {count}x {fingerprint}")
+
+def shutdown_db_executor():
+    """진행 중인 DB 작업을 마무리하고 스레드풀 종료 (서버 종료 시)"""
+    _db_executor.shutdown(wait=True)
+
 # ==========================================
 # 기존 Fake 데이터 (주석 처리 또는 백업)
 # ==========================================
@@ -33,4 +472,4 @@ def get_db_cursor(dictionary=True):
 # fake_posts = []
 # fake_comments = []
 # fake_sessions = {}
-# fake_likes = []
\ No newline at end of file
+# fake_likes = []
@@ -1,7 +1,51 @@
+import os
+import threading
+from datetime import datetime
 from fastapi import Request
-from database import get_db_connection
+from cache import TTLCache
+from database import get_db_connection, run_in_db_executor
+from tokens import SESSION_TOKEN_MODE, is_token, verify_token, token_issued_before
 from utils import APIException
 
+# 세션 캐시 (session_id -> 사용자 정보)
+# 캐시 히트 시 세션 확인에 DB 왕복이 전혀 없음
+# 로그아웃/탈퇴/회원정보 수정/비밀번호 변경 시 invalidate_* 로 즉시 제거
+# 단, 제거는 처리한 워커 프로세스의 캐시에서만 일어나므로 다른 워커는 로그아웃/탈퇴한 세션을
+# 최대 SESSION_CACHE_TTL 초 동안 계속 유효하게 볼 수 있음 (즉시 막아야 하면 TTL 을 줄일 것)
+SESSION_CACHE_TTL = float(os.getenv("SESSION_CACHE_TTL", "60"))
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "10000"))
+session_cache = TTLCache(maxsize=SESSION_CACHE_SIZE, ttl=SESSION_CACHE_TTL)
+
+# 토큰 모드용 사용자 캐시 (user_id -> 사용자 정보)
+# 토큰 검증은 I/O 가 없으므로 사용자 정보만 캐시에서 꺼내면 요청마다 DB 왕복이 없음
+user_cache = TTLCache(maxsize=SESSION_CACHE_SIZE, ttl=SESSION_CACHE_TTL)
+
+# 무효화가 일어날 때마다 증가, 조회 도중 무효화된 (낡은) 결과를 캐시에 다시 넣지 않기 위함
+# 무효화(DB 스레드)와 조회 결과 저장(다른 DB 스레드)이 엇갈리지 않도록 epoch 증가+제거와
+# epoch 비교+저장을 같은 잠금 안에서 처리함
+_invalidation_epoch = 0
+_invalidation_lock = threading.Lock()
+
+def invalidate_session(session_id: str | None):
+    global _invalidation_epoch
+    if session_id:
+        with _invalidation_lock:
+            _invalidation_epoch += 1
+            session_cache.pop(session_id)
+
+def invalidate_user_sessions(user_id: int):
+    global _invalidation_epoch
+    with _invalidation_lock:
+        _invalidation_epoch += 1
+        session_cache.pop_where(lambda user: user["id"] == user_id)
+        user_cache.pop(user_id)
+
+def _cache_if_current(cache: TTLCache, key, value, epoch: int, ttl: float | None = None):
+    """조회를 시작한 뒤 무효화가 없었을 때만 캐시에 저장"""
+    with _invalidation_lock:
+        if epoch == _invalidation_epoch:
+            cache.set(key, value, ttl=ttl)
+
 # 로그인한 사용자 찾기 (없으면 에러 401)
 async def get_current_user(request: Request):
     # 1. 쿠키에서 세션 ID 가져오기
@@ -14,7 +58,38 @@ async def get_current_user(request: Request):
             status_code=401
         )
 
-    # 2. DB 연결
+    # 2-1. 서명 토큰이면 서명/만료/폐기 목록만 확인 (I/O 없음) 후 사용자 캐시 조회
+    # 비밀번호 변경/탈퇴 이전에 발급된 토큰은 users.tokens_valid_after 로 거름
+    # (다른 워커에서 바뀐 값은 사용자 캐시가 만료되는 SESSION_CACHE_TTL 안에 반영)
+    if SESSION_TOKEN_MODE and is_token(session_id):
+        verified = verify_token(session_id)
+        user = None
+        if verified is not None:
+            user_id, issued_at = verified
+            user = user_cache.get(user_id)
+            if user is None:
+                user = await load_user_by_id(user_id)
+        if user is None or token_issued_before(issued_at, user):
+            raise APIException(
+                code="LOGIN_REQUIRED",
+                message="로그인 세션이 만료되었거나 유효하지 않습니다.",
+                status_code=401
+            )
+        return dict(user)
+
+    # 2-2. 세션 캐시 확인 (없으면 DB 조회)
+    user = session_cache.get(session_id)
+    if user is None:
+        user = await load_session_user(session_id)
+
+    # 컨트롤러에서 수정해도 캐시 원본은 그대로 두도록 복사본 반환
+    return dict(user)
+
+@run_in_db_executor
+def load_session_user(session_id: str):
+    epoch = _invalidation_epoch
+    
+    # DB 연결
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
 
@@ -22,7 +97,7 @@ async def get_current_user(request: Request):
         # 3. 세션 테이블과 유저 테이블 조인 조회
         # 만료 시간 체크도 포함 (expires_at > NOW())
         query = """
-            SELECT u.* 
+            SELECT u.*, s.expires_at as session_expires_at
             FROM sessions s
             JOIN users u ON s.user_id = u.id
             WHERE s.session_id = %s 
@@ -42,18 +117,14 @@ async def get_current_user(request: Request):
         # Pydantic 모델과 호환되도록 필드명 매핑 (user_id -> userId)
         user["userId"] = user["id"]
         
-        # 프로필 이미지 조회 (files 테이블)
-        img_query = """
-            SELECT file_url 
-            FROM files 
-            WHERE user_id = %s AND file_type = 'profile' AND deleted_at IS NULL
-            ORDER BY created_at DESC 
-            LIMIT 1
-        """
-        cursor.execute(img_query, (user["id"],))
-        img = cursor.fetchone()
+        # 프로필 이미지 (users.profile_image_url 비정규화 컬럼)
+        user["profileImage"] = user["profile_image_url"]
         
-        user["profileImage"] = img["file_url"] if img else None
+        # 캐시에 비밀번호는 남기지 않음, 세션 만료 시각을 넘겨서 캐시하지 않음
+        user.pop("password", None)
+        expires_at = user.pop("session_expires_at")
+        remaining = (expires_at - datetime.now()).total_seconds()
+        _cache_if_current(session_cache, session_id, user, epoch, ttl=min(SESSION_CACHE_TTL, remaining))
         
         return user
 
@@ -61,9 +132,34 @@ async def get_current_user(request: Request):
         cursor.close()
         conn.close()
 
+@run_in_db_executor
+def load_user_by_id(user_id: int):
+    epoch = _invalidation_epoch
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("SELECT * FROM users WHERE id = %s AND is_deleted = FALSE", (user_id,))
+        user = cursor.fetchone()
+        if not user:
+            raise APIException(
+                code="LOGIN_REQUIRED",
+                message="로그인 세션이 만료되었거나 유효하지 않습니다.",
+                status_code=401
+            )
+
+        # load_session_user 와 같은 형태로 맞춤
+        user["userId"] = user["id"]
+        user["profileImage"] = user["profile_image_url"]
+        user.pop("password", None)
+        _cache_if_current(user_cache, user_id, user, epoch)
+        return user
+    finally:
+        cursor.close()
+        conn.close()
+
 # 로그인 여부와 관계없이 사용자를 반환 (없으면 None)
 async def get_current_user_optional(request: Request):
     try:
         return await get_current_user(request)
     except APIException:
-        return None
\ No newline at end of file
+        return None
@@ -70,7 +70,14 @@ FROM posts p, users u
 WHERE p.title = 'MySQL 쿼리 튜닝 팁 공유' AND u.email IN ('david@example.com', 'eve@example.com');
 
 -- ============================================
--- 5. 결과 확인
+-- 5. 좋아요/댓글 수 카운터 재계산 (migrations/001_post_counters.sql)
+-- ============================================
+UPDATE posts p
+SET p.like_count = (SELECT COUNT(*) FROM post_likes pl WHERE pl.post_id = p.id),
+    p.comment_count = (SELECT COUNT(*) FROM comments c WHERE c.post_id = p.id AND c.deleted_at IS NULL);
+
+-- ============================================
+-- 6. 결과 확인
 -- ============================================
 SELECT 'Dummy data inserted successfully!' as result;
 SELECT * FROM users;
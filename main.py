@@ -1,12 +1,63 @@
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from routers.index import router as api_router 
 from utils import APIException
-from fastapi.staticfiles import StaticFiles
+from contextlib import asynccontextmanager
+from database import pool, query_log, run_in_db_executor, shutdown_db_executor, QueryStatsMiddleware
+from availability import availability_index
+from storage import UploadSizeLimitMiddleware, UploadsStaticFiles, shutdown_io_executor
+from thumbnails import start_thumbnail_pool, shutdown_thumbnail_pool
+from passwords import shutdown_password_pool
+from view_counter import view_counter
+from sessions import session_sweeper
+from metrics import MetricsMiddleware, metrics, metrics_endpoint, METRICS_PATH
+from dependencies import session_cache, user_cache
+from post_cache import post_detail_cache, feed_cache
+from tokens import SESSION_TOKEN_MODE, revocations
+from controllers.post import warm_feed_cache
+import asyncio
 import os
 
-app = FastAPI(title="Community API - Task 2-1")
+async def _warm_caches():
+    try:
+        await warm_feed_cache()
+    except Exception as e:
+        print(f"Feed Cache Warm-up Error: {e}")
+    try:
+        await run_in_db_executor(availability_index.load)()
+    except Exception as e:
+        print(f"Availability Index Load Error: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    view_counter.start()
+    session_sweeper.start()
+    availability_index.start()
+    if SESSION_TOKEN_MODE:
+        revocations.start()
+    start_thumbnail_pool()
+    # 피드 캐시 예열/가입 정보 인덱스 로드는 기동을 막지 않도록 백그라운드로 실행
+    warm_task = asyncio.create_task(_warm_caches())
+    yield
+    warm_task.cancel()
+    # 서버 종료 시 남은 조회수 반영 -> 썸네일/비밀번호 프로세스풀 -> 파일/DB 스레드풀 -> 커넥션 풀 순서로 정리
+    view_counter.stop()
+    session_sweeper.stop()
+    availability_index.stop()
+    revocations.stop()
+    shutdown_thumbnail_pool()
+    shutdown_password_pool()
+    shutdown_io_executor()
+    shutdown_db_executor()
+    pool.dispose()
+
+app = FastAPI(title="Community API - Task 2-1", lifespan=lifespan, default_response_class=ORJSONResponse)
+
+# 업로드 본문 크기 제한 (multipart 를 다 받기 전에 413 으로 끊음)
+# 나중에 추가한 미들웨어가 바깥쪽이므로 CORS 보다 먼저 추가해야 413 응답에도 CORS 헤더가 붙음
+# (없으면 브라우저에서는 "파일이 너무 큼" 대신 CORS 오류로 보임)
+app.add_middleware(UploadSizeLimitMiddleware)
 
 # 0. 미들웨어 설정 (CORS)
 app.add_middleware(
@@ -17,10 +68,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청별 쿼리 수 집계 (N+1 로그, DB_QUERY_DEBUG_HEADER=1 이면 X-Query-Count 헤더)
+app.add_middleware(QueryStatsMiddleware)
+
+# 요청 지표 (가장 바깥에서 413/500 포함 모든 응답을 기록)
+app.add_middleware(MetricsMiddleware)
+
+metrics.register_collector("db_pool", pool.stats)
+for cache_name, cache in (("session", session_cache), ("user", user_cache), ("post_detail", post_detail_cache), ("feed", feed_cache)):
+    metrics.register_collector("cache", cache.stats, {"cache": cache_name})
+metrics.register_collector("view_counter", view_counter.stats)
+metrics.register_collector("availability", availability_index.stats)
+metrics.register_collector("token_revocations", revocations.stats)
+metrics.register_collector("db_query", query_log.stats)
+
 # 1. 명세에 정의된 에러 처리 (APIException)
 @app.exception_handler(APIException)
 async def api_exception_handler(request: Request, exc: APIException):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "code": exc.code,
@@ -32,7 +97,7 @@ async def api_exception_handler(request: Request, exc: APIException):
 # 2. 예상치 못한 서버 에러 처리 (500)
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "code": "internal_server_error",
@@ -49,7 +114,11 @@ app.include_router(api_router)
 if not os.path.exists("uploads"):
     os.makedirs("uploads")
 
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# 내용이 바뀌지 않는 파일이므로 immutable 캐시 + 강한 ETag + Range 지원
+app.mount("/uploads", UploadsStaticFiles(directory="uploads"), name="uploads")
+
+# Prometheus 수집용 (문서에는 노출하지 않음)
+app.add_api_route(METRICS_PATH, metrics_endpoint, methods=["GET"], include_in_schema=False)
 
 @app.get("/")
 async def root():
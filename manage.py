@@ -0,0 +1,238 @@
+# manage.py
+"""
+운영용 관리 명령어 모음
+
+사용법:
+    python manage.py repair-counters [--batch-size 1000]
+    python manage.py backfill-profile-images [--batch-size 1000]
+    python manage.py gc-blobs [--grace-hours 24] [--batch-size 500] [--dry-run]
+    python manage.py seed [--users 100 --posts 10000 --comments 20000 --likes 5000] [--method load-data] [--truncate]
+"""
+import os
+import json
+import argparse
+from database import get_db_connection
+from thumbnails import thumbnail_paths
+from seeder import seed as seed_data, truncate_tables, SEED_EMAIL_DOMAIN
+
+# ==========================================
+# 1. 게시글 좋아요/댓글 수 재계산
+# ==========================================
+def repair_post_counters(batch_size: int = 1000) -> int:
+    """
+    posts.like_count / comment_count 를 원본 테이블 기준으로 다시 계산
+    id 범위로 나눠서 갱신하므로 한 번에 큰 락을 잡지 않음
+    반환값: 값이 바뀐 게시글 수
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("SELECT COALESCE(MIN(id), 0) as min_id, COALESCE(MAX(id), 0) as max_id FROM posts")
+        bounds = cursor.fetchone()
+
+        query = """
+            UPDATE posts p
+            LEFT JOIN (
+                SELECT post_id, COUNT(*) as cnt FROM post_likes
+                WHERE post_id BETWEEN %s AND %s
+                GROUP BY post_id
+            ) l ON l.post_id = p.id
+            LEFT JOIN (
+                SELECT post_id, COUNT(*) as cnt FROM comments
+                WHERE post_id BETWEEN %s AND %s AND deleted_at IS NULL
+                GROUP BY post_id
+            ) c ON c.post_id = p.id
+            SET p.like_count = COALESCE(l.cnt, 0),
+                p.comment_count = COALESCE(c.cnt, 0)
+            WHERE p.id BETWEEN %s AND %s
+        """
+        changed = 0
+        start = bounds["min_id"]
+        while start and start <= bounds["max_id"]:
+            end = start + batch_size - 1
+            cursor.execute(query, (start, end, start, end, start, end))
+            changed += cursor.rowcount
+            start = end + 1
+        return changed
+    finally:
+        cursor.close()
+        conn.close()
+
+def repair_counters_for_posts(cursor, post_ids: list, batch_size: int = 1000) -> int:
+    """지정한 게시글들만 like_count / comment_count 재계산 (테스트 데이터 정리 후 등), 반환값: 갱신한 게시글 수"""
+    post_ids = sorted(set(post_ids))
+    changed = 0
+    for i in range(0, len(post_ids), batch_size):
+        chunk = post_ids[i:i + batch_size]
+        placeholders = ", ".join(["%s"] * len(chunk))
+        cursor.execute(
+            f"""
+            UPDATE posts p
+            SET p.like_count = (SELECT COUNT(*) FROM post_likes WHERE post_id = p.id),
+                p.comment_count = (SELECT COUNT(*) FROM comments WHERE post_id = p.id AND deleted_at IS NULL)
+            WHERE p.id IN ({placeholders})
+            """,
+            chunk,
+        )
+        changed += cursor.rowcount
+    return changed
+
+# ==========================================
+# 2. 사용자 현재 프로필 이미지 URL 백필
+# ==========================================
+def backfill_profile_images(batch_size: int = 1000) -> int:
+    """
+    users.profile_image_url 을 files 테이블의 최신 프로필 이미지로 다시 채움
+    반환값: 값이 바뀐 사용자 수
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("SELECT COALESCE(MIN(id), 0) as min_id, COALESCE(MAX(id), 0) as max_id FROM users")
+        bounds = cursor.fetchone()
+
+        query = """
+            UPDATE users u
+            SET u.profile_image_url = (
+                SELECT f.file_url FROM files f
+                WHERE f.user_id = u.id AND f.file_type = 'profile' AND f.deleted_at IS NULL
+                ORDER BY f.created_at DESC LIMIT 1
+            )
+            WHERE u.id BETWEEN %s AND %s
+        """
+        changed = 0
+        start = bounds["min_id"]
+        while start and start <= bounds["max_id"]:
+            end = start + batch_size - 1
+            cursor.execute(query, (start, end))
+            changed += cursor.rowcount
+            start = end + 1
+        return changed
+    finally:
+        cursor.close()
+        conn.close()
+
+# ==========================================
+# 3. 참조 없는 업로드 blob 정리
+# ==========================================
+def gc_blobs(grace_hours: float = 24, batch_size: int = 500, dry_run: bool = False) -> dict:
+    """
+    ref_count 가 0 이 된 지 grace_hours 가 지난 blob 의 파일(썸네일 등 파생 이미지 포함)과 행을 삭제
+    유예 기간 동안은 캐시된 페이지/브라우저가 들고 있는 URL 이 계속 열리고, 같은 내용이 다시 올라오면 그대로 재사용됨
+    blob 하나씩 행을 잠근 상태에서 파일을 지우고 커밋하므로, 동시에 같은 내용을 업로드하는 요청
+    (acquire_blob 이 같은 행을 잠금)과 엇갈려 살아있는 파일을 지우는 일이 없음
+    반환값: {"deleted", "freed_bytes", "repaired"}
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    result = {"deleted": 0, "freed_bytes": 0, "repaired": 0}
+    try:
+        candidate_query = """
+            SELECT sha256 FROM blobs
+            WHERE sha256 > %s AND ref_count <= 0 AND released_at < NOW() - INTERVAL %s SECOND
+            ORDER BY sha256 LIMIT %s
+        """
+        last_sha256 = ""
+        while True:
+            cursor.execute(candidate_query, (last_sha256, int(grace_hours * 3600), batch_size))
+            candidates = [row["sha256"] for row in cursor.fetchall()]
+            if not candidates:
+                break
+            last_sha256 = candidates[-1]
+
+            for sha256 in candidates:
+                conn.start_transaction()
+                try:
+                    cursor.execute(
+                        "SELECT file_path, file_size FROM blobs WHERE sha256 = %s AND ref_count <= 0 AND released_at IS NOT NULL FOR UPDATE",
+                        (sha256,),
+                    )
+                    blob = cursor.fetchone()
+                    if not blob:
+                        conn.rollback()  # 그 사이 다시 참조됨
+                        continue
+
+                    # 카운트가 어긋나 살아있는 files 행이 남아있으면 지우지 않고 카운트만 바로잡음
+                    cursor.execute("SELECT COUNT(*) as cnt FROM files WHERE sha256 = %s AND deleted_at IS NULL", (sha256,))
+                    live = cursor.fetchone()["cnt"]
+                    if live:
+                        cursor.execute("UPDATE blobs SET ref_count = %s, released_at = NULL WHERE sha256 = %s", (live, sha256))
+                        conn.commit()
+                        result["repaired"] += 1
+                        continue
+
+                    derived = [path for path in thumbnail_paths(sha256) if os.path.exists(path)]
+                    freed_bytes = blob["file_size"] + sum(os.path.getsize(path) for path in derived)
+                    if dry_run:
+                        conn.rollback()
+                    else:
+                        for path in [blob["file_path"], *derived]:
+                            if os.path.exists(path):
+                                os.remove(path)
+                        cursor.execute("DELETE FROM blobs WHERE sha256 = %s", (sha256,))
+                        conn.commit()
+                    result["deleted"] += 1
+                    result["freed_bytes"] += freed_bytes
+                except Exception:
+                    conn.rollback()
+                    raise
+        return result
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="커뮤니티 서버 관리 명령어")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    repair = subparsers.add_parser("repair-counters", help="게시글 좋아요/댓글 수 재계산")
+    repair.add_argument("--batch-size", type=int, default=1000)
+
+    backfill = subparsers.add_parser("backfill-profile-images", help="사용자 현재 프로필 이미지 URL 백필")
+    backfill.add_argument("--batch-size", type=int, default=1000)
+
+    gc = subparsers.add_parser("gc-blobs", help="참조 없는 업로드 blob 정리")
+    gc.add_argument("--grace-hours", type=float, default=24, help="참조가 0 이 된 뒤 보관할 시간")
+    gc.add_argument("--batch-size", type=int, default=500)
+    gc.add_argument("--dry-run", action="store_true", help="지우지 않고 대상만 집계")
+
+    seed_cmd = subparsers.add_parser("seed", help="테스트 데이터 대량 생성 (기본값은 bulk_insert.sql 과 같은 규모)")
+    seed_cmd.add_argument("--users", type=int, default=100)
+    seed_cmd.add_argument("--posts", type=int, default=10000)
+    seed_cmd.add_argument("--comments", type=int, default=20000)
+    seed_cmd.add_argument("--likes", type=int, default=5000)
+    seed_cmd.add_argument("--files", type=float, default=0.2, help="이미지가 붙은 게시글 비율")
+    seed_cmd.add_argument("--sessions", type=int, default=0, help="유효 세션 수")
+    seed_cmd.add_argument("--days", type=int, default=365, help="게시글 작성 기간(일)")
+    seed_cmd.add_argument("--method", choices=("insert", "load-data"), default="insert",
+                          help="load-data 는 서버 local_infile=ON 필요")
+    seed_cmd.add_argument("--email-domain", default=SEED_EMAIL_DOMAIN, help="사용자 이메일 도메인 (user{id}@도메인)")
+    seed_cmd.add_argument("--seed", type=int, default=42, help="난수 시드")
+    seed_cmd.add_argument("--truncate", action="store_true", help="생성 전에 users/posts/comments/post_likes/files/sessions 비우기")
+
+    args = parser.parse_args()
+
+    if args.command == "repair-counters":
+        changed = repair_post_counters(args.batch_size)
+        print(f"카운터 재계산 완료: {changed}개 게시글 수정")
+    elif args.command == "backfill-profile-images":
+        changed = backfill_profile_images(args.batch_size)
+        print(f"프로필 이미지 백필 완료: {changed}명 수정")
+    elif args.command == "gc-blobs":
+        result = gc_blobs(args.grace_hours, args.batch_size, args.dry_run)
+        label = "정리 대상" if args.dry_run else "정리 완료"
+        print(f"blob {label}: {result['deleted']}개 ({result['freed_bytes']} bytes), 카운트 보정 {result['repaired']}개")
+    elif args.command == "seed":
+        if args.truncate:
+            truncate_tables()
+        result = seed_data(
+            args.users, args.posts, args.comments, args.likes,
+            files=args.files, sessions=args.sessions, days=args.days, method=args.method,
+            email_domain=args.email_domain, rng_seed=args.seed,
+        )
+        print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+# metrics.py
+import os
+import time
+from bisect import bisect_left
+from starlette.responses import Response
+
+# 요청 지표 수집 설정
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+METRICS_PATH = os.getenv("METRICS_PATH", "/metrics")
+
+# 응답 시간 히스토그램 구간(초), 마지막 +Inf 는 자동으로 붙음
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUANTILES = (0.5, 0.95, 0.99)
+
+UNMATCHED_ROUTE = "unmatched"  # 라우트가 없는 경로(404 등)는 한 줄로 모아서 라벨 수가 늘지 않게 함
+PENDING_ROUTE = "pending"      # 아직 라우팅 전(본문 수신 중 등)인 요청
+
+
+class RouteStats:
+    """라우트 하나(method + 경로 템플릿)의 누적 지표"""
+
+    __slots__ = ("buckets", "count", "total", "statuses")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.statuses = {}
+
+    def observe(self, status: int, elapsed: float):
+        self.buckets[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+        self.count += 1
+        self.total += elapsed
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def quantile(self, q: float) -> float:
+        """히스토그램 구간 안에서 선형 보간한 추정치 (+Inf 구간이면 마지막 경계값)"""
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for i, upper in enumerate(LATENCY_BUCKETS):
+            in_bucket = self.buckets[i]
+            if in_bucket and seen + in_bucket >= rank:
+                return lower + (upper - lower) * (rank - seen) / in_bucket
+            seen += in_bucket
+            lower = upper
+        return LATENCY_BUCKETS[-1]
+
+
+class Metrics:
+    """
+    워커 프로세스 단위 요청 지표
+    - 기록(미들웨어)과 읽기(/metrics) 모두 이벤트 루프 스레드에서만 일어나므로 잠금 없이 dict/list 를 그대로 갱신
+    - 처리 중인 요청은 scope 자체를 들고 있다가, 읽을 때 라우터가 채워둔 scope["route"] 로 라우트별 개수를 셈
+      (요청마다 라우트를 미리 찾는 비용 없이 라우트별 in-flight 를 보여줌)
+    - DB 풀/캐시 등 다른 모듈 상태는 register_collector 로 등록한 함수를 읽을 때만 호출
+    - 워커가 여러 개면 워커마다 따로 집계되므로 수집 쪽에서 합쳐서 봐야 함
+    """
+
+    def __init__(self):
+        self.routes = {}     # (method, route) -> RouteStats
+        self.in_flight = {}  # id(scope) -> scope
+        self.collectors = []  # (name, func, labels)
+        self.started_at = time.time()
+
+    def register_collector(self, name: str, func, labels: dict | None = None):
+        """func() 가 돌려주는 dict(또는 (라벨, dict) 목록)의 숫자 값을 app_{name}_{key} 지표로 내보냄"""
+        self.collectors.append((name, func, labels or {}))
+
+    def observe(self, method: str, route: str, status: int, elapsed: float):
+        stats = self.routes.get((method, route))
+        if stats is None:
+            stats = self.routes[(method, route)] = RouteStats()
+        stats.observe(status, elapsed)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식"""
+        lines = []
+
+        def family(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        routes = sorted(self.routes.items())
+
+        family("http_requests_total", "counter", "처리한 요청 수")
+        for (method, route), stats in routes:
+            for status, count in sorted(stats.statuses.items()):
+                lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+
+        family("http_request_duration_seconds", "histogram", "요청 처리 시간(응답 전송 완료까지)")
+        for (method, route), stats in routes:
+            cumulative = 0
+            for upper, count in zip(LATENCY_BUCKETS, stats.buckets):
+                cumulative += count
+                lines.append(f"http_request_duration_seconds_bucket{_labels(method=method, route=route, le=upper)} {cumulative}")
+            lines.append(f"http_request_duration_seconds_bucket{_labels(method=method, route=route, le='+Inf')} {stats.count}")
+            lines.append(f"http_request_duration_seconds_sum{_labels(method=method, route=route)} {stats.total:.6f}")
+            lines.append(f"http_request_duration_seconds_count{_labels(method=method, route=route)} {stats.count}")
+
+        family("http_request_duration_quantile_seconds", "gauge", "히스토그램으로 추정한 처리 시간 분위수 (워커 기동 이후 누적)")
+        for (method, route), stats in routes:
+            if stats.count:
+                for q in QUANTILES:
+                    lines.append(f"http_request_duration_quantile_seconds{_labels(method=method, route=route, quantile=q)} {stats.quantile(q):.6f}")
+
+        in_flight = {}
+        for scope in list(self.in_flight.values()):
+            key = (scope["method"], _route_of(scope, pending=True))
+            in_flight[key] = in_flight.get(key, 0) + 1
+        family("http_requests_in_flight", "gauge", "처리 중인 요청 수")
+        lines.append(f"http_requests_in_flight {len(self.in_flight)}")
+        for (method, route), count in sorted(in_flight.items()):
+            lines.append(f"http_requests_in_flight{_labels(method=method, route=route)} {count}")
+
+        family("process_start_time_seconds", "gauge", "워커 프로세스 시작 시각")
+        lines.append(f"process_start_time_seconds {self.started_at:.3f}")
+
+        lines.extend(self._render_collectors())
+        return "\n".join(lines) + "\n"
+
+    def _render_collectors(self) -> list:
+        # 같은 이름의 지표는 한 묶음으로 출력해야 하므로 먼저 모음 (캐시 여러 개가 app_cache_* 를 공유)
+        families = {}
+        for name, func, labels in self.collectors:
+            try:
+                values = func()
+            except Exception as e:
+                print(f"Metrics Collector Error ({name}): {e}")
+                continue
+            # dict 하나 또는 (추가 라벨, dict) 목록 (쿼리 지문처럼 항목마다 라벨이 다른 경우)
+            groups = [({}, values)] if isinstance(values, dict) else values
+            for extra, group in groups:
+                for key, value in group.items():
+                    if isinstance(value, bool):
+                        value = int(value)
+                    if isinstance(value, (int, float)):
+                        families.setdefault(f"app_{name}_{key}", []).append(({**labels, **extra}, value))
+
+        lines = []
+        for metric, samples in sorted(families.items()):
+            lines.append(f"# TYPE {metric} untyped")
+            for labels, value in samples:
+                lines.append(f"{metric}{_labels(**labels) if labels else ''} {value}")
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _route_of(scope, pending: bool = False) -> str:
+    """라우트 경로 템플릿 (/v1/posts/{post_id}), 마운트된 앱은 /uploads/*"""
+    route = scope.get("route")
+    if route is not None:
+        return getattr(route, "path", UNMATCHED_ROUTE)
+    mount_path = scope.get("root_path", "")[len(scope.get("metrics.root_path", "")):]
+    if mount_path:
+        return f"{mount_path}/*"
+    return PENDING_ROUTE if pending else UNMATCHED_ROUTE
+
+
+metrics = Metrics()
+
+
+class MetricsMiddleware:
+    """요청마다 라우트/상태 코드/처리 시간을 metrics 에 기록하는 ASGI 미들웨어"""
+
+    def __init__(self, app, registry: Metrics = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        registry = self.registry
+        started = time.perf_counter()
+        scope["metrics.root_path"] = scope.get("root_path", "")
+        status = 500  # 응답 시작 전에 예외로 끝나면 500 으로 기록
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        registry.in_flight[id(scope)] = scope
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            del registry.in_flight[id(scope)]
+            registry.observe(scope["method"], _route_of(scope), status, time.perf_counter() - started)
+
+
+async def metrics_endpoint():
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
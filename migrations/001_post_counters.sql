@@ -0,0 +1,15 @@
+USE community_db;
+
+-- ============================================
+-- 게시글 좋아요/댓글 수 비정규화 컬럼
+-- 목록/상세 조회 시 post_likes, comments 를 매번 COUNT(*) 하지 않도록
+-- like_post/unlike_post/create_comment/delete_comment 가 같은 트랜잭션에서 갱신함
+-- ============================================
+ALTER TABLE posts
+    ADD COLUMN like_count INT NOT NULL DEFAULT 0,
+    ADD COLUMN comment_count INT NOT NULL DEFAULT 0;
+
+-- 기존 데이터 백필 (데이터가 많으면 `python manage.py repair-counters` 로 나눠서 실행)
+UPDATE posts p
+SET p.like_count = (SELECT COUNT(*) FROM post_likes pl WHERE pl.post_id = p.id),
+    p.comment_count = (SELECT COUNT(*) FROM comments c WHERE c.post_id = p.id AND c.deleted_at IS NULL);
@@ -0,0 +1,8 @@
+USE community_db;
+
+-- ============================================
+-- 게시글 목록(피드) 정렬/커서 페이지네이션용 복합 인덱스
+-- WHERE deleted_at IS NULL ORDER BY created_at DESC, id DESC 를 정렬 없이 인덱스 순서로 읽고,
+-- 커서 조건 (created_at, id) < (?, ?) 를 범위 탐색으로 바로 찾음
+-- ============================================
+CREATE INDEX idx_posts_feed ON posts (deleted_at, created_at, id);
@@ -0,0 +1,18 @@
+USE community_db;
+
+-- ============================================
+-- 현재 프로필 이미지 URL 비정규화 컬럼
+-- 작성자 정보를 보여주는 모든 곳(세션 확인, 사용자 조회, 게시글 목록/상세, 댓글)에서
+-- files 테이블 상관 서브쿼리 대신 users 조인 컬럼으로 바로 읽음
+-- auth_signup, update_user, upload_file(type=profile) 이 갱신함
+-- ============================================
+ALTER TABLE users
+    ADD COLUMN profile_image_url VARCHAR(512) NULL;
+
+-- 기존 데이터 백필 (데이터가 많으면 `python manage.py backfill-profile-images` 로 나눠서 실행)
+UPDATE users u
+SET u.profile_image_url = (
+    SELECT f.file_url FROM files f
+    WHERE f.user_id = u.id AND f.file_type = 'profile' AND f.deleted_at IS NULL
+    ORDER BY f.created_at DESC LIMIT 1
+);
@@ -0,0 +1,7 @@
+USE community_db;
+
+-- ============================================
+-- 게시글별 댓글 목록 keyset 페이지네이션/스트리밍용 복합 인덱스
+-- WHERE post_id = ? AND deleted_at IS NULL ORDER BY created_at, id 를 정렬 없이 인덱스 순서로 읽음
+-- ============================================
+CREATE INDEX idx_comments_post_list ON comments (post_id, deleted_at, created_at, id);
@@ -0,0 +1,23 @@
+USE community_db;
+
+-- ============================================
+-- 업로드 파일 내용 주소(SHA-256) 저장 + 참조 카운트
+-- 같은 바이트는 uploads/{sha256 앞 2자리}/{sha256}.{확장자} 하나로만 저장하고,
+-- files 행은 업로드마다 따로 만들되 sha256 으로 blob 을 가리킴
+-- ref_count = 이 blob 을 가리키는 삭제되지 않은 files 행 수
+-- ref_count 가 0 이 된 시각(released_at)부터 유예 기간이 지나면 `python manage.py gc-blobs` 가 파일과 행을 지움
+-- ============================================
+CREATE TABLE blobs (
+    sha256 CHAR(64) NOT NULL PRIMARY KEY,
+    file_path VARCHAR(512) NOT NULL,
+    file_size BIGINT NOT NULL,
+    ref_count INT NOT NULL DEFAULT 0,
+    released_at DATETIME NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_blobs_gc (ref_count, released_at)
+);
+
+-- 기존 uuid 파일명 업로드는 sha256 이 NULL 로 남고 GC 대상이 아님
+ALTER TABLE files
+    ADD COLUMN sha256 CHAR(64) NULL,
+    ADD INDEX idx_files_sha256 (sha256);
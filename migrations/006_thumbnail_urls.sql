@@ -0,0 +1,14 @@
+USE community_db;
+
+-- ============================================
+-- 업로드 이미지 파생본(썸네일) URL
+-- 업로드 직후 백그라운드 프로세스 풀에서 만들어지므로 생성 전/Pillow 미설치 시에는 NULL
+-- (응답의 thumbnailUrl / authorProfileThumb 가 NULL 이면 클라이언트는 원본 URL 사용)
+-- ============================================
+ALTER TABLE files
+    ADD COLUMN thumb_avatar_url VARCHAR(512) NULL,
+    ADD COLUMN thumb_feed_url VARCHAR(512) NULL;
+
+-- 현재 프로필 이미지의 아바타 썸네일 (profile_image_url 과 함께 비정규화)
+ALTER TABLE users
+    ADD COLUMN profile_thumb_url VARCHAR(512) NULL;
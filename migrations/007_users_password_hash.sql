@@ -0,0 +1,9 @@
+USE community_db;
+
+-- ============================================
+-- 비밀번호 해시 저장용으로 password 컬럼 확장
+-- scrypt$n$r$p$salt$hash 형식 (약 90자)
+-- 기존 평문 행(dummy_data.sql, bulk_insert.sql)은 그대로 두고, 로그인 성공 시 해시로 교체됨
+-- ============================================
+ALTER TABLE users
+    MODIFY COLUMN password VARCHAR(255) NOT NULL;
@@ -0,0 +1,13 @@
+USE community_db;
+
+-- ============================================
+-- sessions 테이블 인덱스
+-- idx_sessions_lookup:  get_current_user 의 WHERE session_id = ? AND expires_at > NOW()
+-- idx_sessions_expires: 만료 세션 정리 (DELETE ... WHERE expires_at <= NOW() ORDER BY expires_at LIMIT n)
+-- idx_sessions_user:    로그인 시 사용자별 활성 세션 수 제한
+-- ============================================
+CREATE INDEX idx_sessions_lookup ON sessions (session_id, expires_at);
+CREATE INDEX idx_sessions_expires ON sessions (expires_at);
+CREATE INDEX idx_sessions_user ON sessions (user_id, expires_at);
+
+-- 쌓여 있던 만료 세션은 서버의 session-sweeper 가 나눠서 정리함
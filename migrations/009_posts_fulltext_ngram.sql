@@ -0,0 +1,10 @@
+USE community_db;
+
+-- ============================================
+-- 게시글 검색용 FULLTEXT 인덱스 (ngram 파서)
+-- 기본 파서는 공백 기준이라 "데이터베이스성능" 처럼 붙여 쓴 한국어를 나누지 못하므로
+-- 2글자 단위(ngram_token_size = 2, 서버 기본값)로 잘라서 색인하고, 검색어도 같은 방식으로 잘라서 찾음
+-- GET /v1/posts/search 가 MATCH(title, content) AGAINST (... IN BOOLEAN MODE) 로 사용
+-- 게시글 작성/수정/삭제 시 InnoDB 가 인덱스를 같이 갱신하므로 따로 동기화할 것이 없음
+-- ============================================
+ALTER TABLE posts ADD FULLTEXT INDEX ft_posts_title_content (title, content) WITH PARSER ngram;
@@ -0,0 +1,8 @@
+USE community_db;
+
+-- ============================================
+-- 게시글 첨부 이미지 조회용 복합 인덱스
+-- 피드/상세에서 WHERE post_id = ? AND file_type = 'post' AND deleted_at IS NULL ORDER BY id DESC LIMIT 1 을
+-- 정렬 없이 인덱스 끝에서 한 건만 읽음 (원본 URL/썸네일을 같은 행에서 가져옴)
+-- ============================================
+CREATE INDEX idx_files_post_latest ON files (post_id, file_type, deleted_at, id);
@@ -0,0 +1,17 @@
+USE community_db;
+
+-- ============================================
+-- 서명 세션 토큰 폐기 기록 (워커 메모리만으로는 다른 워커/재시작 후에 폐기가 사라짐)
+-- tokens_valid_after: 비밀번호 변경/탈퇴 시각(ms), 이 시각 이전(같은 ms 포함)에 발급된 토큰은 무효
+-- revoked_tokens:     로그아웃한 토큰 nonce, 각 워커가 주기적으로 읽어서 메모리에 반영하고 만료되면 삭제
+-- ============================================
+ALTER TABLE users
+    ADD COLUMN tokens_valid_after BIGINT NOT NULL DEFAULT 0;
+
+CREATE TABLE revoked_tokens (
+    nonce VARCHAR(32) NOT NULL PRIMARY KEY,
+    expires_at DATETIME NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_revoked_tokens_created (created_at),
+    INDEX idx_revoked_tokens_expires (expires_at)
+);
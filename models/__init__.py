@@ -2,6 +2,7 @@
 # Model 패키지 초기화
 
 from models.user import UserCreate, UserResponse, UserLogin
-from models.post import PostCreate, PostResponse, PostUpdate
-from models.comment import CommentCreate, CommentResponse, CommentUpdate
+from models.post import PostCreate, PostResponse, PostUpdate, PostListResponse, PostListPage, PostSearchResult, PostSearchPage, LikeResponse
+from models.comment import CommentCreate, CommentResponse, CommentUpdate, CommentListResponse
 from models.file import FileUploadResponse
+from models.response import ApiResponse
@@ -1,6 +1,7 @@
 # models/comment.py
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
+from models.response import ApiResponse
 
 # ==========================================
 # 요청 모델 (Request)
@@ -24,6 +25,13 @@ class CommentResponse(BaseModel):
     postId: int
     content: str
     writer: str
+    writerEmail: Optional[str] = None
     authorId: Optional[int] = None
+    authorProfileImage: Optional[str] = None
+    authorProfileThumb: Optional[str] = None
     createdAt: str
     updatedAt: Optional[str] = None
+
+class CommentListResponse(ApiResponse[List[CommentResponse]]):
+    """댓글 목록 응답 (data 는 댓글 배열, 다음 페이지 커서는 limit/cursor 로 조회했을 때만)"""
+    nextCursor: Optional[str] = None
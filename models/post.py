@@ -1,6 +1,6 @@
 # models/post.py
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 # ==========================================
@@ -30,27 +30,65 @@ class AuthorResponse(BaseModel):
     profileImageUrl: Optional[str] = None
 
 class PostResponse(BaseModel):
-    """게시글 정보 응답"""
+    """게시글 상세 응답"""
     postId: int
     title: str
     content: Optional[str] = None
     fileUrl: Optional[str] = None
+    thumbnailUrl: Optional[str] = None
     writer: str
+    authorProfileImage: Optional[str] = None
+    authorProfileThumb: Optional[str] = None
     authorId: Optional[int] = None
     viewCount: int = 0
     likeCount: int = 0
     commentCount: int = 0
     createdAt: str
+    viewCountStalenessMs: Optional[int] = None
 
 class PostListResponse(BaseModel):
-    """게시글 목록 응답"""
+    """게시글 목록 항목"""
     postId: int
     title: str
+    content: Optional[str] = None
+    writer: str
+    writerEmail: Optional[str] = None
+    authorId: Optional[int] = None
+    fileUrl: Optional[str] = None
+    thumbnailUrl: Optional[str] = None
+    authorProfileImage: Optional[str] = None
+    authorProfileThumb: Optional[str] = None
+    viewCount: int = 0
+    likeCount: int = 0
+    commentCount: int = 0
+    createdAt: str
+
+class PostListPage(BaseModel):
+    """게시글 목록 페이지"""
+    posts: List[PostListResponse]
+    totalCount: Optional[int] = None
+    nextCursor: Optional[str] = None
+
+class PostSearchResult(BaseModel):
+    """게시글 검색 결과 항목 (titleHighlight/snippet 은 HTML 이스케이프 + <mark> 하이라이트)"""
+    postId: int
+    title: str
+    titleHighlight: str
+    snippet: str
     writer: str
+    authorId: Optional[int] = None
+    authorProfileImage: Optional[str] = None
+    authorProfileThumb: Optional[str] = None
     viewCount: int = 0
     likeCount: int = 0
     commentCount: int = 0
     createdAt: str
+    score: float
+
+class PostSearchPage(BaseModel):
+    """게시글 검색 페이지 (관련도 순)"""
+    posts: List[PostSearchResult]
+    nextCursor: Optional[str] = None
 
 class LikeResponse(BaseModel):
     """좋아요 응답"""
@@ -0,0 +1,15 @@
+# models/response.py
+from pydantic import BaseModel
+from typing import Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+# ==========================================
+# 공통 응답 모델 (Response)
+# ==========================================
+
+class ApiResponse(BaseModel, Generic[T]):
+    """모든 API 응답의 공통 형식 {code, message, data}"""
+    code: str
+    message: str
+    data: Optional[T] = None
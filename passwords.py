@@ -0,0 +1,123 @@
+# passwords.py
+import os
+import hmac
+import base64
+import asyncio
+import hashlib
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from utils import APIException
+
+# scrypt 비용 설정 (바꾸면 다음 로그인 때 새 설정으로 다시 해시됨)
+PASSWORD_SCRYPT_N = int(os.getenv("PASSWORD_SCRYPT_N", str(2 ** 14)))  # CPU/메모리 비용 (2의 거듭제곱)
+PASSWORD_SCRYPT_R = int(os.getenv("PASSWORD_SCRYPT_R", "8"))
+PASSWORD_SCRYPT_P = int(os.getenv("PASSWORD_SCRYPT_P", "1"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))  # 해시 전용 프로세스 수
+PASSWORD_MAX_PENDING = int(os.getenv("PASSWORD_MAX_PENDING", "256"))  # 대기 가능한 해시 작업 수 (넘치면 503)
+
+_PREFIX = "scrypt"
+_SALT_BYTES = 16
+_KEY_BYTES = 32
+
+_pool = None
+_pool_lock = threading.Lock()
+_pending = 0
+_dummy_hash = None
+
+# ==========================================
+# 워커 프로세스에서 실행되는 함수
+# ==========================================
+def _b64encode(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii").rstrip("=")
+
+def _b64decode(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r + 1024 * 1024, dklen=_KEY_BYTES)
+
+def _hash(password: str, n: int, r: int, p: int) -> str:
+    """scrypt$n$r$p$salt$hash 형식"""
+    salt = os.urandom(_SALT_BYTES)
+    key = _scrypt(password, salt, n, r, p)
+    return f"{_PREFIX}${n}${r}${p}${_b64encode(salt)}${_b64encode(key)}"
+
+def _verify(password: str, stored: str) -> bool:
+    try:
+        _, n, r, p, salt, key = stored.split("$")
+        expected = _b64decode(key)
+        actual = _scrypt(password, _b64decode(salt), int(n), int(r), int(p))
+    except (ValueError, TypeError):
+        return False
+    return hmac.compare_digest(actual, expected)
+
+# ==========================================
+# 이벤트 루프에서 쓰는 API
+# ==========================================
+def is_hashed(stored: str) -> bool:
+    return stored.startswith(_PREFIX + "$")
+
+def needs_rehash(stored: str) -> bool:
+    """예전 평문이거나 비용 설정이 현재와 다르면 True"""
+    if not is_hashed(stored):
+        return True
+    return stored.split("$")[1:4] != [str(PASSWORD_SCRYPT_N), str(PASSWORD_SCRYPT_R), str(PASSWORD_SCRYPT_P)]
+
+def _get_pool() -> ProcessPoolExecutor:
+    # 처음 쓸 때 생성 (lifespan 없이 만든 TestClient/스크립트에서도 동작하도록)
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # DB/파일 스레드가 떠 있는 프로세스를 fork 하지 않도록 spawn 사용
+            _pool = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+async def _run(func, *args):
+    """
+    해시 계산을 프로세스 풀에서 실행
+    로그인이 몰려도 CPU 를 쓰는 건 워커 프로세스뿐이라 이벤트 루프/DB 스레드는 다른 요청을 계속 처리하고,
+    대기 작업이 PASSWORD_MAX_PENDING 을 넘으면 줄을 더 세우지 않고 503 으로 거절함
+    """
+    global _pending
+    if _pending >= PASSWORD_MAX_PENDING:
+        raise APIException(code="SERVER_BUSY", message="요청이 많아 잠시 후 다시 시도해주세요.", status_code=503)
+    _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_pool(), func, *args)
+    finally:
+        _pending -= 1
+
+async def hash_password(password: str) -> str:
+    return await _run(_hash, password, PASSWORD_SCRYPT_N, PASSWORD_SCRYPT_R, PASSWORD_SCRYPT_P)
+
+async def check_password(password: str, stored: str | None) -> tuple[bool, str | None]:
+    """
+    비밀번호 확인, 반환값: (일치 여부, 새 해시 또는 None)
+    - 예전 평문 행이거나 비용 설정이 바뀐 해시면 일치할 때 새 해시를 만들어서 돌려줌 (호출한 쪽이 저장)
+    - stored 가 None(없는 계정)이어도 같은 비용의 해시를 계산해서 응답 시간으로 계정 존재 여부가 드러나지 않게 함
+    """
+    global _dummy_hash
+    if stored is None:
+        if _dummy_hash is None:
+            _dummy_hash = await hash_password("dummy-password")
+        await _run(_verify, password, _dummy_hash)
+        return False, None
+
+    if is_hashed(stored):
+        matched = await _run(_verify, password, stored)
+    else:
+        matched = hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+
+    if matched and needs_rehash(stored):
+        return True, await hash_password(password)
+    return matched, None
+
+def shutdown_password_pool():
+    """서버 종료 시 호출"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
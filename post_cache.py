@@ -0,0 +1,101 @@
+# post_cache.py
+import os
+import threading
+from cache import TTLCache
+from view_counter import view_counter
+
+# 게시글 상세 캐시 (post_id -> 상세 응답 data)
+# 본문은 거의 바뀌지 않으므로 조합된 결과를 그대로 캐시하고,
+# 수정/삭제 시 제거, 좋아요/댓글은 숫자만 보정해서 캐시를 계속 유효하게 유지함
+# 조회수는 캐시에 넣을 때의 DB 값 + DB 에 반영된 증가분(리스너)으로 따로 맞추고,
+# 응답 시점에 아직 반영 안 된 증가분을 더함
+# 수정/삭제 무효화는 처리한 워커에서만 일어나므로, 다른 워커는 TTL 동안 이전 내용(삭제된 글 포함)을
+# 보여줄 수 있음 -> 피드 캐시와 같은 수준(초 단위)으로 짧게 유지
+POST_DETAIL_CACHE_SIZE = int(os.getenv("POST_DETAIL_CACHE_SIZE", "5000"))
+POST_DETAIL_CACHE_TTL = float(os.getenv("POST_DETAIL_CACHE_TTL", "10"))
+post_detail_cache = TTLCache(maxsize=POST_DETAIL_CACHE_SIZE, ttl=POST_DETAIL_CACHE_TTL)
+
+# 상세 캐시 저장과 반영된 조회수 보정(리스너)이 엇갈리지 않도록 같은 잠금 안에서 처리
+_detail_lock = threading.Lock()
+
+# 피드 캐시 ((offset, limit) -> 목록 페이지)
+# 트래픽 대부분이 몰리는 앞쪽 FEED_CACHE_PAGES 페이지만 캐시함
+# 게시글 작성/수정/삭제 시 버전을 올려서 이전 버전으로 만든 페이지를 모두 무효화하고,
+# 좋아요/댓글은 해당 게시글의 숫자만 보정함 (조회수는 FEED_CACHE_MAX_STALENESS 안에서 갱신)
+FEED_CACHE_PAGES = int(os.getenv("FEED_CACHE_PAGES", "3"))
+FEED_CACHE_MAX_STALENESS = float(os.getenv("FEED_CACHE_MAX_STALENESS", "10"))
+FEED_DEFAULT_PAGE_SIZE = 10
+feed_cache = TTLCache(maxsize=64, ttl=FEED_CACHE_MAX_STALENESS)
+# 버전 증가(DB 스레드의 작성/수정/삭제)와 버전 비교+저장(다른 DB 스레드의 조회)이 엇갈리지 않도록 잠금
+_feed_version = 0
+_feed_lock = threading.Lock()
+
+def feed_cache_key(offset: int, limit: int, page_cursor: str | None):
+    """캐시 대상 페이지면 키, 아니면 None (커서 모드는 첫 페이지만 offset 0 과 같음)"""
+    if page_cursor or offset % limit or offset // limit >= FEED_CACHE_PAGES:
+        return None
+    return (offset, limit)
+
+def feed_version() -> int:
+    return _feed_version
+
+def get_feed_page(key):
+    page = feed_cache.get(key)
+    if page is None or page["version"] != _feed_version:
+        return None
+    return page
+
+def set_feed_page(key, version: int, page: dict):
+    # 조회하는 동안 게시글이 바뀌었으면(버전 변경) 낡은 페이지를 저장하지 않음
+    with _feed_lock:
+        if version == _feed_version:
+            feed_cache.set(key, {**page, "version": version})
+
+def _update_feed_post(post_id: int, fn):
+    def apply(page):
+        if not any(post["postId"] == post_id for post in page["posts"]):
+            return page
+        posts = [fn(post) if post["postId"] == post_id else post for post in page["posts"]]
+        return {**page, "posts": posts}
+    for key in feed_cache.keys():
+        feed_cache.update(key, apply)
+
+def invalidate_post(post_id: int):
+    """게시글 수정/삭제 시 호출"""
+    global _feed_version
+    with _feed_lock:
+        _feed_version += 1
+    post_detail_cache.pop(post_id)
+
+def invalidate_feed():
+    """게시글 작성 시 호출 (새 글이 첫 페이지에 끼어들므로 피드 전체 무효화)"""
+    global _feed_version
+    with _feed_lock:
+        _feed_version += 1
+
+def set_like_count(post_id: int, like_count: int):
+    """좋아요/좋아요 취소 후 최신 like_count 반영"""
+    post_detail_cache.update(post_id, lambda detail: {**detail, "likeCount": like_count})
+    _update_feed_post(post_id, lambda post: {**post, "likeCount": like_count})
+
+def add_comment_count(post_id: int, delta: int):
+    """댓글 작성/삭제 후 comment_count 증감 반영"""
+    post_detail_cache.update(post_id, lambda detail: {**detail, "commentCount": detail["commentCount"] + delta})
+    _update_feed_post(post_id, lambda post: {**post, "commentCount": post["commentCount"] + delta})
+
+def set_post_detail(post_id: int, detail: dict, flush_generation: int):
+    """
+    DB 에서 조합한 상세를 캐시 (flush_generation: 조회 전에 읽은 view_counter.flush_generation())
+    조회하는 동안 조회수 반영이 있었으면 읽은 view_count 에 그 증가분이 들어갔는지 알 수 없으므로
+    (리스너 보정이 빠지거나 두 번 더해짐) 캐시하지 않음
+    """
+    with _detail_lock:
+        if flush_generation % 2 == 0 and flush_generation == view_counter.flush_generation():
+            post_detail_cache.set(post_id, detail)
+
+def _apply_flushed_views(deltas: dict):
+    with _detail_lock:
+        for post_id, amount in deltas.items():
+            post_detail_cache.update(post_id, lambda detail: {**detail, "viewCount": detail["viewCount"] + amount})
+
+view_counter.add_listener(_apply_flushed_views)
@@ -0,0 +1,34 @@
+# responses.py
+import os
+import json
+from typing import Any
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson 이 없으면 표준 json 으로 동작 (느리지만 결과는 같음)
+    orjson = None
+
+# 1 이면 fast_response 도 응답 모델로 검증 (개발/테스트용, 운영에서는 끔)
+RESPONSE_VALIDATION = os.getenv("RESPONSE_VALIDATION", "0") == "1"
+
+
+class ORJSONResponse(JSONResponse):
+    """orjson 으로 직렬화하는 JSON 응답 (앱 기본 응답 클래스)"""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def fast_response(content: dict, model=None, status_code: int = 200) -> ORJSONResponse:
+    """
+    신뢰할 수 있는 컨트롤러 출력(이미 JSON 기본 타입만 담긴 dict)을 바로 직렬화해서 반환
+    라우트가 Response 객체를 반환하면 FastAPI 는 response_model 검증과 jsonable_encoder 를 건너뜀
+    (response_model 은 OpenAPI 문서용으로 그대로 선언해둠)
+    RESPONSE_VALIDATION=1 이면 model 로 검증해서 컨트롤러 출력과 모델이 어긋나는지 확인할 수 있음
+    """
+    if RESPONSE_VALIDATION and model is not None:
+        model.model_validate(content)
+    return ORJSONResponse(content, status_code=status_code)
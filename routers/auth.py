@@ -2,7 +2,11 @@ from fastapi import APIRouter, Response, Request, Depends, status, Query
 from controllers.auth import auth_signup, auth_login, auth_logout, check_email_availability, check_nickname_availability
 from controllers.user import get_my_info
 from dependencies import get_current_user
-from models.user import UserCreate, UserLogin
+from models.user import UserCreate, UserLogin, UserResponse
+from models.response import ApiResponse
+from responses import fast_response
+
+UserEnvelope = ApiResponse[UserResponse]
 
 router = APIRouter(prefix="/v1/auth")
 
@@ -27,6 +31,6 @@ async def logout(response: Response, request: Request):
     session_id = request.cookies.get("session_id")
     return await auth_logout(response, session_id)
 
-@router.get("/me", status_code=status.HTTP_200_OK)
+@router.get("/me", status_code=status.HTTP_200_OK, response_model=UserEnvelope)
 async def get_me(user: dict = Depends(get_current_user)):
-    return await get_my_info(user)
+    return fast_response(await get_my_info(user), UserEnvelope)
@@ -1,14 +1,25 @@
 from fastapi import APIRouter, Depends, status
-from controllers.comment import create_comment, get_comments, update_comment, delete_comment
+from controllers.comment import create_comment, get_comments, stream_comments, update_comment, delete_comment
 from dependencies import get_current_user
-from models.comment import CommentCreate, CommentUpdate
+from models.comment import CommentCreate, CommentUpdate, CommentListResponse
+from responses import fast_response
 
 router = APIRouter(prefix="/v1/posts")
 
 # 댓글 조회 (누구나 가능)
-@router.get("/{post_id}/comments")
-async def read_comments(post_id: int):
-    return await get_comments(post_id)
+# 파라미터가 없으면 기존처럼 전체 댓글 배열
+# limit/cursor 를 주면 페이지 단위로 조회하고 다음 페이지 커서는 nextCursor 로 받음
+# stream=true 면 전체 댓글을 NDJSON 으로 스트리밍
+@router.get("/{post_id}/comments", response_model=CommentListResponse)
+async def read_comments(
+    post_id: int,
+    limit: int | None = None,
+    cursor: str | None = None,
+    stream: bool = False
+):
+    if stream:
+        return await stream_comments(post_id)
+    return fast_response(await get_comments(post_id, limit, cursor), CommentListResponse)
 
 # 댓글 작성 (로그인 필수)
 @router.post("/{post_id}/comments", status_code=201)
@@ -1,17 +1,41 @@
-from fastapi import APIRouter, Depends, status
-from controllers.post import get_posts_list, create_post as create_post_controller, get_post_detail, update_post, delete_post, like_post, unlike_post
+from fastapi import APIRouter, Depends, Query, status
+from controllers.post import get_posts_list, create_post as create_post_controller, get_post_detail, update_post, delete_post, like_post, unlike_post, search_posts
 from dependencies import get_current_user
-from models.post import PostCreate, PostUpdate
+from models.post import PostCreate, PostUpdate, PostListPage, PostResponse, PostSearchPage, LikeResponse
+from models.response import ApiResponse
+from responses import fast_response
+
+PostListEnvelope = ApiResponse[PostListPage]
+PostDetailEnvelope = ApiResponse[PostResponse]
+PostSearchEnvelope = ApiResponse[PostSearchPage]
 
 router = APIRouter(prefix="/v1/posts")
 
-@router.get("")
-async def get_posts(offset: int = 0, limit: int = 10):
-    return await get_posts_list(offset, limit)
+# cursor를 넘기면 keyset 페이지네이션, 없으면 기존 offset 페이지네이션
+# includeTotal=false 면 totalCount 계산 생략 (무한 스크롤용)
+# 조회 API 는 컨트롤러 결과를 검증 없이 바로 직렬화 (fast_response)
+@router.get("", response_model=PostListEnvelope)
+async def get_posts(
+    offset: int = 0,
+    limit: int = 10,
+    cursor: str | None = None,
+    includeTotal: bool = True
+):
+    return fast_response(await get_posts_list(offset, limit, cursor, includeTotal), PostListEnvelope)
+
+# 제목/본문 검색 (관련도 순, cursor 로 다음 페이지)
+# /{post_id} 보다 먼저 선언해야 "search" 가 post_id 로 잡히지 않음
+@router.get("/search", response_model=PostSearchEnvelope)
+async def search(
+    q: str = Query(..., max_length=100),
+    limit: int = 10,
+    cursor: str | None = None
+):
+    return fast_response(await search_posts(q, limit, cursor), PostSearchEnvelope)
 
-@router.get("/{post_id}", status_code=status.HTTP_200_OK)
+@router.get("/{post_id}", status_code=status.HTTP_200_OK, response_model=PostDetailEnvelope)
 async def get_post(post_id: int):
-    return await get_post_detail(post_id)
+    return fast_response(await get_post_detail(post_id), PostDetailEnvelope)
 
 # 게시물 작성은 로그인한 사람만 가능
 @router.post("", status_code=201)
@@ -33,11 +57,11 @@ async def update_post_endpoint(
 async def delete_post_endpoint(post_id: int, user: dict = Depends(get_current_user)):
     return await delete_post(post_id, user)
 
-@router.post("/{post_id}/likes", status_code=status.HTTP_201_CREATED)
+@router.post("/{post_id}/likes", status_code=status.HTTP_201_CREATED, response_model=ApiResponse[LikeResponse])
 async def like_post_endpoint(post_id: int, user: dict = Depends(get_current_user)):
     return await like_post(post_id, user)
 
-@router.delete("/{post_id}/likes", status_code=status.HTTP_200_OK)
+@router.delete("/{post_id}/likes", status_code=status.HTTP_200_OK, response_model=ApiResponse[LikeResponse])
 async def unlike_post_endpoint(post_id: int, user: dict = Depends(get_current_user)):
     return await unlike_post(post_id, user)
 
@@ -1,13 +1,17 @@
 from fastapi import APIRouter, status, Depends
 from controllers.user import get_user_by_id, update_user, change_password, delete_user
 from dependencies import get_current_user
-from models.user import UserUpdate, PasswordChange
+from models.user import UserUpdate, PasswordChange, UserResponse
+from models.response import ApiResponse
+from responses import fast_response
+
+UserEnvelope = ApiResponse[UserResponse]
 
 router = APIRouter(prefix="/v1/users")
 
-@router.get("/{user_id}", status_code=status.HTTP_200_OK)
+@router.get("/{user_id}", status_code=status.HTTP_200_OK, response_model=UserEnvelope)
 async def get_user(user_id: int):
-    return await get_user_by_id(user_id)
+    return fast_response(await get_user_by_id(user_id), UserEnvelope)
 
 @router.patch("/{user_id}", status_code=status.HTTP_200_OK)
 async def update_user_endpoint(
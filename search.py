@@ -0,0 +1,58 @@
+# search.py
+import html
+import re
+
+# 게시글 검색어 처리 / 결과 하이라이트
+SEARCH_MIN_TERM_LENGTH = 2   # ngram_token_size 보다 짧은 검색어는 인덱스로 찾을 수 없음
+SEARCH_MAX_TERMS = 5         # 검색어 단어 수 제한 (단어마다 ngram 조건이 늘어남)
+SNIPPET_RADIUS = 40          # 스니펫에서 일치한 위치 앞뒤로 보여줄 글자 수
+
+# BOOLEAN MODE 연산자로 해석되는 문자는 검색어에서 제거
+_OPERATORS = re.compile(r'[+\-<>()~*"@]')
+
+
+def parse_terms(query: str) -> list:
+    """공백으로 나눈 검색어 목록 (연산자 제거, 너무 짧은 단어 제외, 중복 제거)"""
+    terms = []
+    for word in _OPERATORS.sub(" ", query).split():
+        if len(word) >= SEARCH_MIN_TERM_LENGTH and word.casefold() not in (t.casefold() for t in terms):
+            terms.append(word)
+    return terms[:SEARCH_MAX_TERMS]
+
+
+def boolean_query(terms: list) -> str:
+    """
+    모든 단어를 포함 (+), 단어 하나는 구문("...")으로 -> ngram 이 연속으로 나와야 일치
+    예) 'mysql 튜닝' -> '+"mysql" +"튜닝"'
+    """
+    return " ".join(f'+"{term}"' for term in terms)
+
+
+def _pattern(terms: list):
+    return re.compile("|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+
+
+def highlight(text: str, terms: list) -> str:
+    """HTML 이스케이프 후 일치 부분을 <mark> 로 감쌈 (클라이언트가 innerHTML 로 넣어도 안전)"""
+    if not text:
+        return ""
+    pattern = _pattern(terms)
+    parts = []
+    last = 0
+    for match in pattern.finditer(text):
+        parts.append(html.escape(text[last:match.start()]))
+        parts.append(f"<mark>{html.escape(match.group())}</mark>")
+        last = match.end()
+    parts.append(html.escape(text[last:]))
+    return "".join(parts)
+
+
+def snippet(text: str, terms: list) -> str:
+    """본문에서 처음 일치한 위치 주변만 잘라서 하이라이트 (일치가 없으면 앞부분)"""
+    if not text:
+        return ""
+    match = _pattern(terms).search(text)
+    start = max(0, match.start() - SNIPPET_RADIUS) if match else 0
+    end = min(len(text), (match.end() if match else 0) + SNIPPET_RADIUS)
+    excerpt = " ".join(text[start:end].split())  # 줄바꿈 정리
+    return ("…" if start > 0 else "") + highlight(excerpt, terms) + ("…" if end < len(text) else "")
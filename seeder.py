@@ -0,0 +1,386 @@
+# seeder.py
+"""
+대용량 테스트 데이터 생성기 (bulk_insert.sql 의 한 행씩 INSERT 하는 프로시저 대체)
+
+- 행을 생성하면서 바로 큰 multi-row INSERT(기본) 또는 LOAD DATA LOCAL INFILE 로 흘려보냄 (전체를 메모리에 올리지 않음)
+- ID 를 직접 정해서 넣으므로 되읽기 없이 외래키가 항상 유효함 (각 테이블 현재 MAX(id) 다음부터)
+- 치우친 분포: 소수 헤비 유저가 글/댓글 대부분을 쓰고, 소수 인기 글에 댓글/좋아요가 몰림 (Zipf)
+- 좋아요/댓글 수는 게시글별로 먼저 배분한 뒤 생성하므로 posts.like_count/comment_count 가 처음부터 맞음
+
+사용법은 manage.py seed 참고
+"""
+import os
+import re
+import time
+import base64
+import random
+import hashlib
+import secrets
+import tempfile
+from array import array
+import mysql.connector
+from database import DB_CONFIG, get_db_connection
+import passwords
+from storage import UPLOAD_DIR, blob_path
+from controllers.file import BASE_URL
+
+SEED_EMAIL_DOMAIN = "seed.local"    # user{id}@seed.local (실제/수동 테스트 계정과 섞이지 않도록 전용 도메인)
+SEED_PASSWORD = "Password123!"      # bulk_insert.sql/dummy_data.sql 과 같은 비밀번호
+INSERT_BATCH_BYTES = 1024 * 1024    # multi-row INSERT 한 문장 크기 (max_allowed_packet 보다 충분히 작게)
+LOAD_DATA_BATCH_ROWS = 200000       # LOAD DATA 파일 하나에 넣을 행 수
+ZIPF_EXPONENT = 1.1                 # 클수록 상위 소수에 더 몰림
+
+# 시드 게시글 이미지가 모두 가리키는 8x8 회색 JPEG (실제 blob 으로 저장하고 ref_count 도 맞춰둠)
+SEED_IMAGE = base64.b64decode(
+    "/9j/4AAQSkZJRgABAQAAAQABAAD/2wBDABALDA4MChAODQ4SERATGCgaGBYWGDEjJR0oOjM9PDkzODdASFxOQERXRTc4UG1RV19iZ2hnPk1xeXBkeFxlZ2P/"
+    "wAALCAAIAAgBAREA/8QAFAABAAAAAAAAAAAAAAAAAAAABv/EABQQAQAAAAAAAAAAAAAAAAAAAAD/2gAIAQEAAD8ASP/Z"
+)
+
+
+# ==========================================
+# 분포
+# ==========================================
+def zipf_cum_weights(n: int, exponent: float = ZIPF_EXPONENT) -> list:
+    """순위 r(0부터)의 가중치 1/(r+1)^s 누적합 (random.choices 의 cum_weights 용)"""
+    total = 0.0
+    cum = []
+    for rank in range(n):
+        total += 1.0 / (rank + 1) ** exponent
+        cum.append(total)
+    return cum
+
+
+def popularity_ranks(n: int, rng: random.Random) -> array:
+    """항목별 인기 순위 (0 이 가장 인기), ID 순서와 무관하게 무작위로 섞음"""
+    ranks = array("I", range(n))
+    rng.shuffle(ranks)
+    return ranks
+
+
+def allocate(total: int, ranks: array, rng: random.Random, cap: int | None = None) -> array:
+    """
+    total 개를 항목들에 인기 순위의 Zipf 비율로 나눔 (같은 ranks 를 쓰면 댓글/좋아요가 같은 글에 몰림)
+    cap 이 있으면 항목당 최대 cap 개 (좋아요는 사용자 수를 넘을 수 없음), 잘린 만큼은 다른 항목에 무작위로 나눠줌
+    """
+    n = len(ranks)
+    counts = array("I", bytes(4 * n))
+    if n == 0 or total == 0:
+        return counts
+    if cap is not None:
+        total = min(total, cap * n)
+    norm = sum(1.0 / (rank + 1) ** ZIPF_EXPONENT for rank in range(n))
+    assigned = 0
+    for index, rank in enumerate(ranks):
+        expected = total * (1.0 / (rank + 1) ** ZIPF_EXPONENT) / norm
+        count = int(expected) + (rng.random() < expected - int(expected))
+        counts[index] = count = min(count, cap) if cap is not None else count
+        assigned += count
+    while assigned < total:
+        index = rng.randrange(n)
+        if cap is None or counts[index] < cap:
+            counts[index] += 1
+            assigned += 1
+    return counts
+
+
+# ==========================================
+# 출력 (multi-row INSERT / LOAD DATA)
+# ==========================================
+# 컬럼 종류: i = 숫자, s = 문자열, t = 유닉스 시각(초) -> 서버에서 FROM_UNIXTIME 으로 변환
+# 생성하는 문자열에는 따옴표/역슬래시/탭/줄바꿈이 없으므로 값마다 이스케이프하지 않고 템플릿으로 바로 포맷함
+# (행마다 값 하나씩 검사/이스케이프하는 비용이 생성 시간의 대부분이었음)
+_SAFE_TEXT = re.compile(r"^[^'\\\t\n]*$")
+
+
+def _row_template(kinds: str) -> str:
+    parts = {"i": "{}", "s": "'{}'", "t": "FROM_UNIXTIME({})"}
+    return "(" + ",".join(parts[kind] for kind in kinds) + ")"
+
+
+class InsertWriter:
+    """행을 모아서 INSERT INTO t (...) VALUES (...), (...), ... 한 문장(약 INSERT_BATCH_BYTES)씩 실행"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.cursor = conn.cursor()
+
+    def write(self, table: str, columns: tuple, kinds: str, rows) -> int:
+        prefix = f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+        template = _row_template(kinds).format
+        values = []
+        size = 0
+        written = 0
+        for row in rows:
+            literal = template(*row)
+            values.append(literal)
+            size += len(literal) + 1
+            if size >= INSERT_BATCH_BYTES:
+                written += self._flush(prefix, values)
+                values, size = [], 0
+        if values:
+            written += self._flush(prefix, values)
+        return written
+
+    def _flush(self, prefix: str, values: list) -> int:
+        self.cursor.execute(prefix + ",".join(values))
+        self.conn.commit()
+        return len(values)
+
+    def close(self):
+        self.cursor.close()
+
+
+class LoadDataWriter:
+    """행을 임시 TSV 파일에 LOAD_DATA_BATCH_ROWS 개씩 써서 LOAD DATA LOCAL INFILE 로 적재 (서버 local_infile=ON 필요)"""
+
+    def __init__(self, conn, directory: str):
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.directory = directory
+
+    def write(self, table: str, columns: tuple, kinds: str, rows) -> int:
+        # 시각 컬럼은 사용자 변수로 받아서 SET 절에서 변환
+        targets = [f"@{column}" if kind == "t" else column for column, kind in zip(columns, kinds)]
+        conversions = [f"{column} = FROM_UNIXTIME(@{column})" for column, kind in zip(columns, kinds) if kind == "t"]
+        query = (
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} CHARACTER SET utf8mb4 "
+            f"FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' ({', '.join(targets)})"
+            + (f" SET {', '.join(conversions)}" if conversions else "")
+        )
+        template = "\t".join(["{}"] * len(columns)).format
+        written = 0
+        batch = []
+        for row in rows:
+            batch.append(template(*row))
+            if len(batch) >= LOAD_DATA_BATCH_ROWS:
+                written += self._flush(table, query, batch)
+                batch = []
+        if batch:
+            written += self._flush(table, query, batch)
+        return written
+
+    def _flush(self, table: str, query: str, lines: list) -> int:
+        path = os.path.join(self.directory, f"{table}.tsv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+            f.write("\n")
+        try:
+            self.cursor.execute(query, (path,))
+            self.conn.commit()
+        finally:
+            os.remove(path)
+        return len(lines)
+
+    def close(self):
+        self.cursor.close()
+
+
+def _connect(method: str, directory: str):
+    """
+    적재 전용 커넥션 (풀 커넥션과 세션 설정을 섞지 않도록 따로 연결)
+    외래키는 생성 단계에서 보장하므로 세션 단위로 끄고 배치마다 커밋 (유니크 검사는 테이블마다 seed 에서 설정)
+    """
+    config = {**DB_CONFIG, "autocommit": False}
+    if method == "load-data":
+        config.update(allow_local_infile=True, allow_local_infile_in_path=directory)
+    conn = mysql.connector.connect(**config)
+    cursor = conn.cursor()
+    cursor.execute("SET SESSION foreign_key_checks = 0")
+    cursor.close()
+    return conn
+
+
+# ==========================================
+# 행 생성
+# ==========================================
+SEED_TABLES = ("post_likes", "comments", "files", "sessions", "posts", "users")
+
+
+def truncate_tables():
+    """
+    시드 대상 테이블 전부 비우기 (bulk_insert.sql 의 초기화와 같음)
+    files 가 비면 모든 blob 이 참조 0 이 되므로 그렇게 표시해 두고, 파일은 유예 기간 후 gc-blobs 가 정리
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SET SESSION foreign_key_checks = 0")
+        try:
+            for table in SEED_TABLES:
+                cursor.execute(f"TRUNCATE TABLE {table}")
+            cursor.execute("UPDATE blobs SET ref_count = 0, released_at = COALESCE(released_at, NOW())")
+        finally:
+            cursor.execute("SET SESSION foreign_key_checks = 1")
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def _next_ids() -> dict:
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        ids = {}
+        for table in ("users", "posts", "comments", "files"):
+            cursor.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}")
+            ids[table] = cursor.fetchone()[0]
+        return ids
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def _base36(number: int) -> str:
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    text = ""
+    while True:
+        number, rest = divmod(number, 36)
+        text = digits[rest] + text
+        if not number:
+            return text
+
+
+def _store_seed_image() -> tuple:
+    """SEED_IMAGE 를 blob 위치에 저장 (이미 있으면 그대로), 반환값: (sha256, 파일 경로, URL)"""
+    sha256 = hashlib.sha256(SEED_IMAGE).hexdigest()
+    path = blob_path(sha256, ".jpg")
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(SEED_IMAGE)
+    return sha256, path, f"{BASE_URL}/{UPLOAD_DIR}/{sha256[:2]}/{sha256}.jpg"
+
+
+def _pick_many(rng: random.Random, population: range, cum_weights: list, count: int):
+    """choices 를 큰 묶음으로 호출해서 행마다 부르는 비용을 줄임"""
+    while count > 0:
+        chunk = min(count, 10000)
+        yield from rng.choices(population, cum_weights=cum_weights, k=chunk)
+        count -= chunk
+
+
+def seed(users: int, posts: int, comments: int, likes: int, files: float = 0.2, sessions: int = 0,
+         days: int = 365, method: str = "insert", email_domain: str = SEED_EMAIL_DOMAIN, rng_seed: int = 42,
+         progress=print) -> dict:
+    """
+    users 명, posts 개, 댓글 약 comments 개, 좋아요 약 likes 개 생성
+    files: 이미지가 붙은 게시글 비율, sessions: 유효 세션 수 (세션 조회 부하 테스트용)
+    반환값: 테이블별 생성 행 수와 소요 시간
+    """
+    if not _SAFE_TEXT.match(email_domain):
+        raise ValueError(f"사용할 수 없는 email_domain: {email_domain!r}")
+    rng = random.Random(rng_seed)
+    now = int(time.time())
+    ids = _next_ids()
+    user_ids = range(ids["users"], ids["users"] + users)
+    post_ids = range(ids["posts"], ids["posts"] + posts)
+
+    # 작성자 분포 (앞쪽 사용자일수록 헤비 유저), 게시글별 댓글/좋아요 수 배분 (같은 인기 순위 사용)
+    author_weights = zipf_cum_weights(users)
+    ranks = popularity_ranks(posts, rng)
+    comment_counts = allocate(comments, ranks, rng)
+    like_counts = allocate(likes, ranks, rng, cap=users)
+
+    # 게시글 시각: ID 가 클수록 최신 (피드 정렬과 같은 순서), 기간 안에 고르게
+    # 인덱스로 바로 계산하므로 게시글 수가 많아도 시각 목록을 메모리에 두지 않음
+    span = days * 86400
+    started_at = now - span
+    post_authors = array("I")  # 게시글 첨부 파일의 업로더 = 작성자
+
+    def post_time(index: int) -> int:
+        return started_at + index * span // max(1, posts)
+
+    image_sha256, image_path, image_url = _store_seed_image()
+    password_hash = passwords._hash(SEED_PASSWORD, passwords.PASSWORD_SCRYPT_N, passwords.PASSWORD_SCRYPT_R, passwords.PASSWORD_SCRYPT_P)
+
+    def user_rows():
+        for user_id in user_ids:
+            # 닉네임 10자 제한: user + 36진수 ID (INT 최대값까지 10자 이내)
+            yield (user_id, f"user{user_id}@{email_domain}", password_hash, f"user{_base36(user_id)}")
+
+    def post_rows():
+        authors = _pick_many(rng, user_ids, author_weights, posts)
+        for index, (post_id, author) in enumerate(zip(post_ids, authors)):
+            post_authors.append(author)
+            views = like_counts[index] * rng.randint(5, 20) + rng.randrange(50)
+            yield (post_id, author, f"시드 게시글 {post_id}", f"{post_id}번째 시드 게시글 내용입니다. 용량 테스트용 더미 데이터입니다.",
+                   views, like_counts[index], comment_counts[index], post_time(index))
+
+    def comment_rows():
+        comment_id = ids["comments"]
+        for index, post_id in enumerate(post_ids):
+            count = comment_counts[index]
+            if not count:
+                continue
+            base = post_time(index)
+            remaining = max(1, now - base)
+            for author in rng.choices(user_ids, cum_weights=author_weights, k=count):
+                created = base + int(rng.random() * remaining)  # 글 작성 이후 지금까지 사이
+                yield (comment_id, post_id, author, f"시드 댓글 {comment_id}", created, created)
+                comment_id += 1
+
+    def like_rows():
+        # 게시글마다 서로 다른 사용자를 뽑으므로 (post_id, user_id) 중복이 없음 (전역 집합 불필요)
+        for index, post_id in enumerate(post_ids):
+            count = like_counts[index]
+            if count:
+                for offset in rng.sample(range(users), count):
+                    yield (post_id, user_ids[offset])
+
+    def file_rows():
+        file_id = ids["files"]
+        for index, post_id in enumerate(post_ids):
+            if rng.random() < files:
+                # 전부 같은 시드 이미지 blob 을 가리킴 (참조 수는 적재 후 blobs 에 한 번에 반영)
+                yield (file_id, "post", post_authors[index], post_id, image_url, f"seed{file_id}.jpg",
+                       len(SEED_IMAGE), image_sha256, post_time(index))
+                file_id += 1
+
+    def session_rows():
+        expires = now + 86400
+        for picked in _pick_many(rng, user_ids, author_weights, sessions):
+            yield (picked, secrets.token_hex(16), expires)
+
+    plan = [
+        ("users", ("id", "email", "password", "nickname"), "isss", user_rows),
+        ("posts", ("id", "user_id", "title", "content", "view_count", "like_count", "comment_count", "created_at"), "iissiiit", post_rows),
+        ("comments", ("id", "post_id", "user_id", "content", "created_at", "updated_at"), "iiistt", comment_rows),
+        ("post_likes", ("post_id", "user_id"), "ii", like_rows),
+        ("files", ("id", "file_type", "user_id", "post_id", "file_url", "file_name", "file_size", "sha256", "created_at"), "isiissist", file_rows),
+        ("sessions", ("user_id", "session_id", "expires_at"), "ist", session_rows),
+    ]
+
+    result = {"method": method, "tables": {}}
+    total_started = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="seed-") as directory:
+        conn = _connect(method, directory)
+        writer = LoadDataWriter(conn, directory) if method == "load-data" else InsertWriter(conn)
+        try:
+            for table, columns, kinds, rows in plan:
+                started = time.perf_counter()
+                # 유니크 검사는 users 만 켜 둠 (이메일이 기존 사용자와 겹치면 조용히 중복되지 않고 실패하도록)
+                writer.cursor.execute(f"SET SESSION unique_checks = {1 if table == 'users' else 0}")
+                written = writer.write(table, columns, kinds, rows())
+                if table == "files" and written:
+                    writer.cursor.execute(
+                        """
+                        INSERT INTO blobs (sha256, file_path, file_size, ref_count) VALUES (%s, %s, %s, %s)
+                        ON DUPLICATE KEY UPDATE ref_count = ref_count + VALUES(ref_count), released_at = NULL
+                        """,
+                        (image_sha256, image_path, len(SEED_IMAGE), written),
+                    )
+                    conn.commit()
+                elapsed = time.perf_counter() - started
+                result["tables"][table] = {"rows": written, "elapsed_s": round(elapsed, 2),
+                                           "rows_per_s": round(written / elapsed) if elapsed and written else None}
+                progress(f"{table}: {written}행 ({elapsed:.1f}s)")
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            writer.close()
+            conn.close()
+
+    result["elapsed_s"] = round(time.perf_counter() - total_started, 2)
+    result["rows"] = sum(item["rows"] for item in result["tables"].values())
+    return result
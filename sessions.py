@@ -0,0 +1,55 @@
+# sessions.py
+import os
+from background import PeriodicTask
+from database import get_db_connection
+
+# 만료 세션 정리 설정
+SESSION_SWEEP_INTERVAL = float(os.getenv("SESSION_SWEEP_INTERVAL", "60"))       # 정리 주기(초)
+SESSION_SWEEP_BATCH_SIZE = int(os.getenv("SESSION_SWEEP_BATCH_SIZE", "1000"))   # DELETE 한 번에 지울 행 수
+SESSION_SWEEP_MAX_BATCHES = int(os.getenv("SESSION_SWEEP_MAX_BATCHES", "100"))  # 한 주기에 실행할 최대 DELETE 수
+MAX_SESSIONS_PER_USER = int(os.getenv("MAX_SESSIONS_PER_USER", "10"))           # 사용자별 유지할 활성 세션 수
+
+def sweep_expired_sessions() -> int:
+    """
+    만료된 세션을 SESSION_SWEEP_BATCH_SIZE 행씩 나눠서 삭제
+    autocommit 으로 DELETE 한 번이 곧 짧은 트랜잭션 하나라서 로그인(INSERT)/세션 확인을 오래 막지 않음
+    한 주기에 다 못 지우면 나머지는 다음 주기에 이어서 지움
+    반환값: 삭제된 세션 수
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    deleted = 0
+    try:
+        query = "DELETE FROM sessions WHERE expires_at <= NOW() ORDER BY expires_at LIMIT %s"
+        for _ in range(SESSION_SWEEP_MAX_BATCHES):
+            cursor.execute(query, (SESSION_SWEEP_BATCH_SIZE,))
+            deleted += cursor.rowcount
+            if cursor.rowcount < SESSION_SWEEP_BATCH_SIZE:
+                break
+        return deleted
+    finally:
+        cursor.close()
+        conn.close()
+
+def trim_user_sessions(cursor, user_id: int) -> list:
+    """
+    사용자의 활성 세션이 MAX_SESSIONS_PER_USER 를 넘으면 만료가 가장 가까운(오래된) 것부터 삭제
+    dictionary 커서 + 호출한 쪽 트랜잭션 안에서 실행, 반환값: 삭제된 session_id 목록 (커밋 후 캐시에서 제거해야 함)
+    """
+    cursor.execute(
+        """
+        SELECT session_id FROM sessions
+        WHERE user_id = %s AND expires_at > NOW()
+        ORDER BY expires_at DESC
+        LIMIT 18446744073709551615 OFFSET %s
+        """,
+        (user_id, MAX_SESSIONS_PER_USER),
+    )
+    session_ids = [row["session_id"] for row in cursor.fetchall()]
+    if session_ids:
+        placeholders = ", ".join(["%s"] * len(session_ids))
+        cursor.execute(f"DELETE FROM sessions WHERE session_id IN ({placeholders})", session_ids)
+    return session_ids
+
+
+session_sweeper = PeriodicTask("session-sweeper", SESSION_SWEEP_INTERVAL, sweep_expired_sessions)
@@ -0,0 +1,279 @@
+# storage.py
+import os
+import re
+import asyncio
+import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import UploadFile
+from fastapi.responses import JSONResponse, FileResponse
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.staticfiles import NotModifiedResponse
+from utils import APIException
+
+UPLOAD_DIR = "uploads"
+MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE", str(10 * 1024 * 1024)))  # 업로드 최대 크기 (기본 10MB)
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(256 * 1024)))   # 한 번에 읽고 쓰는 크기
+FILE_IO_WORKERS = int(os.getenv("FILE_IO_WORKERS", "8"))                   # 디스크 쓰기 전용 스레드 수
+UPLOADS_MAX_AGE = int(os.getenv("UPLOADS_MAX_AGE", str(365 * 24 * 3600)))  # 업로드 파일 브라우저/프록시 캐시 기간
+
+# 업로드 디렉토리 확인 및 생성
+if not os.path.exists(UPLOAD_DIR):
+    os.makedirs(UPLOAD_DIR)
+
+# 디스크 쓰기/해시 계산은 이벤트 루프 밖에서 (DB 스레드풀과 분리해서 서로 막지 않도록)
+_io_executor = ThreadPoolExecutor(max_workers=FILE_IO_WORKERS, thread_name_prefix="file-io")
+
+# 확장자별 실제 파일 형식 (매직 바이트로 확인)
+IMAGE_TYPES = {
+    ".jpg": "jpeg",
+    ".jpeg": "jpeg",
+    ".png": "png",
+    ".gif": "gif",
+    ".webp": "webp",
+}
+
+# 형식별 blob 확장자 (같은 바이트는 항상 같은 파일명이 되도록 형식 기준으로 통일)
+BLOB_EXTENSIONS = {
+    "jpeg": ".jpg",
+    "png": ".png",
+    "gif": ".gif",
+    "webp": ".webp",
+}
+
+_BLOB_NAME = re.compile(r"^([0-9a-f]{64})\.[a-z]+$")
+_CONTENT_ADDRESSED_NAME = re.compile(r"^([0-9a-f]{64}(?:-[a-z]+)?)\.[a-z]+$")  # blob + 썸네일
+
+def sniff_image_type(head: bytes) -> str | None:
+    """파일 앞부분(매직 바이트)으로 이미지 형식 판별"""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+def _write_chunk(buffer, digest, chunk: bytes):
+    digest.update(chunk)  # hashlib 은 큰 버퍼에서 GIL 을 놓으므로 스레드에서 같이 처리
+    buffer.write(chunk)
+
+def _finish_file(buffer):
+    buffer.flush()
+    os.fsync(buffer.fileno())
+    buffer.close()
+
+def _discard_file(buffer, path: str):
+    try:
+        buffer.close()
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+async def save_upload_stream(file: UploadFile, file_ext: str) -> dict:
+    """
+    업로드 파일을 청크 단위로 읽어서 임시 파일에 저장
+    - MAX_UPLOAD_SIZE 를 넘는 순간 중단 (413)
+    - 첫 청크의 매직 바이트가 확장자와 다른 형식이면 중단 (400)
+    - 읽으면서 SHA-256 계산
+    최종 위치(blob_path)로 옮기는 건 blob 참조를 잡은 뒤 place_blob 으로 함
+    반환값: {"tmp_path", "size", "sha256", "ext"}
+    """
+    loop = asyncio.get_running_loop()
+    fd, tmp_path = tempfile.mkstemp(dir=UPLOAD_DIR, prefix=".upload-", suffix=".part")
+    buffer = os.fdopen(fd, "wb")
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+
+            if size == 0 and sniff_image_type(chunk[:16]) != IMAGE_TYPES.get(file_ext):
+                raise APIException(code="INVALID_FILE_TYPE", message="이미지 파일만 업로드 가능합니다.", status_code=400)
+
+            size += len(chunk)
+            if size > MAX_UPLOAD_SIZE:
+                raise APIException(code="FILE_TOO_LARGE", message="업로드 가능한 최대 파일 크기를 초과했습니다.", status_code=413)
+
+            await loop.run_in_executor(_io_executor, _write_chunk, buffer, digest, chunk)
+
+        if size == 0:
+            raise APIException(code="EMPTY_FILE", message="빈 파일은 업로드할 수 없습니다.", status_code=400)
+
+        await loop.run_in_executor(_io_executor, _finish_file, buffer)
+    except APIException:
+        await loop.run_in_executor(_io_executor, _discard_file, buffer, tmp_path)
+        raise
+    except Exception as e:
+        await loop.run_in_executor(_io_executor, _discard_file, buffer, tmp_path)
+        print(f"File Save Error: {e}")
+        raise APIException(code="FILE_SAVE_ERROR", message="파일 저장 중 오류가 발생했습니다.", status_code=500)
+
+    return {"tmp_path": tmp_path, "size": size, "sha256": digest.hexdigest(), "ext": BLOB_EXTENSIONS[IMAGE_TYPES[file_ext]]}
+
+# ==========================================
+# 내용 주소(SHA-256) blob 저장
+# ==========================================
+def blob_path(sha256: str, ext: str) -> str:
+    """uploads/ab/ab12...ef.jpg (한 디렉토리에 파일이 몰리지 않도록 앞 2자리로 나눔)"""
+    return os.path.join(UPLOAD_DIR, sha256[:2], f"{sha256}{ext}")
+
+def blob_digest_from_url(file_url: str | None) -> str | None:
+    """blob URL 이면 sha256, 예전 uuid 파일명이면 None"""
+    if not file_url:
+        return None
+    match = _BLOB_NAME.match(file_url.rsplit("/", 1)[-1])
+    return match.group(1) if match else None
+
+def place_blob(tmp_path: str, path: str):
+    """임시 파일을 blob 위치로 옮김 (같은 내용이 이미 있으면 임시 파일만 버림)"""
+    if os.path.exists(path):
+        os.remove(tmp_path)
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(tmp_path, path)
+
+def discard_temp(tmp_path: str):
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+def acquire_blob(cursor, sha256: str, path: str, size: int):
+    """
+    blob 참조 +1 (없으면 생성), 호출한 쪽 트랜잭션 안에서 실행
+    blob 행 잠금을 커밋까지 잡고 있으므로 그 사이에 gc-blobs 가 같은 파일을 지울 수 없음
+    """
+    cursor.execute(
+        """
+        INSERT INTO blobs (sha256, file_path, file_size, ref_count) VALUES (%s, %s, %s, 1)
+        ON DUPLICATE KEY UPDATE ref_count = ref_count + 1, released_at = NULL
+        """,
+        (sha256, path, size),
+    )
+
+def release_files(cursor, where: str, params: tuple) -> int:
+    """
+    조건에 맞는 files 행을 soft delete 하고 가리키던 blob 의 ref_count 를 줄임
+    dictionary 커서 + 호출한 쪽 트랜잭션 안에서 실행, 반환값: 삭제된 행 수
+    """
+    cursor.execute(f"SELECT id, sha256 FROM files WHERE {where} AND deleted_at IS NULL FOR UPDATE", params)
+    rows = cursor.fetchall()
+    if not rows:
+        return 0
+
+    placeholders = ", ".join(["%s"] * len(rows))
+    cursor.execute(f"UPDATE files SET deleted_at = NOW() WHERE id IN ({placeholders})", [row["id"] for row in rows])
+
+    released = {}
+    for row in rows:
+        if row["sha256"]:
+            released[row["sha256"]] = released.get(row["sha256"], 0) + 1
+    # 항상 같은 순서로 잠가서 데드락 방지
+    # (MySQL 은 SET 을 왼쪽부터 적용하므로 released_at 조건의 ref_count 는 감소 후 값)
+    for sha256, count in sorted(released.items()):
+        cursor.execute(
+            "UPDATE blobs SET ref_count = ref_count - %s, released_at = IF(ref_count <= 0, NOW(), NULL) WHERE sha256 = %s",
+            (count, sha256),
+        )
+    return len(rows)
+
+def set_profile_image(cursor, user_id: int, file_url: str | None):
+    """
+    users.profile_image_url 갱신
+    같은 내용의 아바타 썸네일이 이미 있으면 profile_thumb_url 도 같이, 없으면 NULL (생성되면 채워짐)
+    """
+    cursor.execute(
+        """
+        UPDATE users SET profile_image_url = %s,
+            profile_thumb_url = (
+                SELECT thumb_avatar_url FROM files
+                WHERE sha256 = %s AND thumb_avatar_url IS NOT NULL LIMIT 1
+            )
+        WHERE id = %s
+        """,
+        (file_url, blob_digest_from_url(file_url), user_id),
+    )
+
+def shutdown_io_executor():
+    _io_executor.shutdown(wait=True)
+
+
+class UploadSizeLimitMiddleware:
+    """
+    업로드 요청 본문이 MAX_UPLOAD_SIZE(+ 폼 여유분)를 넘으면 다 받기 전에 413 으로 끊는 ASGI 미들웨어
+    FastAPI 는 핸들러 실행 전에 multipart 본문 전체를 받아두므로, 본문을 받는 단계에서 막아야 함
+    """
+
+    def __init__(self, app, path_prefix: str = "/v1/files", overhead: int = 64 * 1024):
+        self.app = app
+        self.path_prefix = path_prefix
+        self.limit = MAX_UPLOAD_SIZE + overhead
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        # Content-Length 가 이미 한도를 넘으면 본문을 읽지 않고 바로 응답
+        # (라우터 밖이라 예외 핸들러를 거치지 않으므로 같은 형식의 응답을 직접 보냄)
+        for name, value in scope["headers"]:
+            if name == b"content-length" and value.isdigit() and int(value) > self.limit:
+                response = JSONResponse(
+                    status_code=413,
+                    content={"code": "FILE_TOO_LARGE", "message": "업로드 가능한 최대 파일 크기를 초과했습니다.", "data": None},
+                )
+                await response(scope, receive, send)
+                return
+
+        received = 0
+
+        # Content-Length 없이 (chunked) 들어오는 경우 받은 만큼 세다가 넘으면 중단
+        # 본문 파싱 도중(라우터 안)에 발생하므로 APIException 핸들러가 응답을 만듦
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.limit:
+                    raise APIException(code="FILE_TOO_LARGE", message="업로드 가능한 최대 파일 크기를 초과했습니다.", status_code=413)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+class UploadsFileResponse(FileResponse):
+    chunk_size = 256 * 1024  # pathsend 를 지원하지 않는 서버에서 스레드 왕복 횟수를 줄이기 위해 기본(64KB)보다 크게
+
+
+class UploadsStaticFiles(StaticFiles):
+    """
+    /uploads 전용 정적 파일 서빙
+    업로드 파일은 내용 주소(sha256) 또는 uuid 이름이라 같은 URL 의 내용이 바뀌지 않으므로
+    - Cache-Control: immutable 로 브라우저/프록시가 재검증 요청 자체를 보내지 않게 하고
+    - ETag 는 sha256 (예전 uuid 파일은 크기+수정시각 기반) 으로 강한 검증자를 보냄
+    - If-None-Match 는 304, Range/If-Range 는 206 (FileResponse 가 처리)
+    - 서버가 http.response.pathsend 확장을 지원하면 파일 경로만 넘겨서 서버가 sendfile 로 보냄
+    - 업로드 중인 임시 파일(.upload-*.part, 썸네일 *.part)은 404
+    """
+
+    def lookup_path(self, path: str):
+        name = os.path.basename(path)
+        if name.startswith(".") or name.endswith(".part"):
+            return "", None
+        return super().lookup_path(path)
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        headers = {"cache-control": f"public, max-age={UPLOADS_MAX_AGE}, immutable"}
+        match = _CONTENT_ADDRESSED_NAME.match(os.path.basename(full_path))
+        if match:
+            headers["etag"] = f'"{match.group(1)}"'
+
+        response = UploadsFileResponse(full_path, status_code=status_code, headers=headers, stat_result=stat_result)
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,104 @@
+# thumbnails.py
+import os
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from storage import UPLOAD_DIR
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow 는 선택 의존성 (없으면 썸네일 없이 원본만 사용)
+    Image = None
+
+THUMBNAIL_WORKERS = int(os.getenv("THUMBNAIL_WORKERS", "2"))          # 리사이즈 전용 프로세스 수
+THUMBNAIL_QUEUE_SIZE = int(os.getenv("THUMBNAIL_QUEUE_SIZE", "256"))  # 대기 가능한 작업 수 (넘치면 건너뜀)
+THUMBNAIL_FORMAT = os.getenv("THUMBNAIL_FORMAT", "WEBP").upper()      # WEBP 또는 JPEG
+THUMBNAIL_QUALITY = int(os.getenv("THUMBNAIL_QUALITY", "80"))
+THUMBNAIL_DIR = os.path.join(UPLOAD_DIR, "thumbs")
+
+# 파생 이미지 종류: (가로, 세로, 정사각형으로 자를지)
+THUMBNAIL_SIZES = {
+    "avatar": (96, 96, True),     # 작성자 프로필
+    "feed": (640, 640, False),    # 피드/상세 본문 이미지 (비율 유지)
+}
+
+_pool = None
+_tasks = set()
+
+def thumbnail_path(sha256: str, name: str, ext: str | None = None) -> str:
+    if ext is None:
+        ext = ".webp" if THUMBNAIL_FORMAT == "WEBP" else ".jpg"
+    return os.path.join(THUMBNAIL_DIR, sha256[:2], f"{sha256}-{name}{ext}")
+
+def thumbnail_paths(sha256: str) -> list:
+    """blob 하나에서 만들어졌을 수 있는 파생 이미지 경로 전부 (THUMBNAIL_FORMAT 을 바꾸기 전에 만든 것 포함, gc-blobs 용)"""
+    return [thumbnail_path(sha256, name, ext) for name in THUMBNAIL_SIZES for ext in (".webp", ".jpg")]
+
+def render_thumbnails(src_path: str, sha256: str) -> dict:
+    """
+    원본 blob 으로 THUMBNAIL_SIZES 의 파생 이미지를 만들고 {종류: 경로} 반환 (워커 프로세스에서 실행)
+    원본이 내용 주소라 파생 이미지도 sha256 기준 이름이므로, 이미 있으면 다시 만들지 않음
+    """
+    paths = {name: thumbnail_path(sha256, name) for name in THUMBNAIL_SIZES}
+    if all(os.path.exists(path) for path in paths.values()):
+        return paths
+
+    with Image.open(src_path) as source:
+        source.seek(0)  # 움직이는 GIF/WebP 는 첫 프레임만
+        image = ImageOps.exif_transpose(source)
+        image = image.convert("RGBA" if THUMBNAIL_FORMAT == "WEBP" else "RGB")
+
+        for name, (width, height, crop) in THUMBNAIL_SIZES.items():
+            if crop:
+                resized = ImageOps.fit(image, (width, height), Image.LANCZOS)
+            else:
+                resized = image.copy()
+                resized.thumbnail((width, height), Image.LANCZOS)
+
+            # 반쯤 쓴 파일이 서빙되지 않도록 임시 이름으로 쓰고 rename
+            path = paths[name]
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.part"
+            resized.save(tmp_path, format=THUMBNAIL_FORMAT, quality=THUMBNAIL_QUALITY)
+            os.replace(tmp_path, path)
+    return paths
+
+def start_thumbnail_pool():
+    """서버 시작 시 호출 (Pillow 가 없으면 썸네일 단계를 끔)"""
+    global _pool
+    if Image is None:
+        print("Thumbnail: Pillow 가 설치되어 있지 않아 썸네일 생성을 건너뜁니다.")
+        return
+    if _pool is None:
+        # DB/파일 스레드가 떠 있는 프로세스를 fork 하지 않도록 spawn 사용
+        _pool = ProcessPoolExecutor(max_workers=THUMBNAIL_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+def schedule_thumbnails(sha256: str, src_path: str, on_ready):
+    """
+    업로드 응답을 기다리게 하지 않고 백그라운드에서 썸네일 생성
+    다 만들어지면 await on_ready(sha256, {종류: 경로}) 호출
+    풀이 꺼져 있거나 대기 작업이 가득 차면 건너뜀 (응답에서는 원본 URL 을 그대로 사용)
+    """
+    if _pool is None or len(_tasks) >= THUMBNAIL_QUEUE_SIZE:
+        return None
+    task = asyncio.create_task(_generate(sha256, src_path, on_ready))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return task
+
+async def _generate(sha256: str, src_path: str, on_ready):
+    try:
+        loop = asyncio.get_running_loop()
+        paths = await loop.run_in_executor(_pool, render_thumbnails, src_path, sha256)
+        await on_ready(sha256, paths)
+    except Exception as e:
+        print(f"Thumbnail Error: {e}")
+
+def shutdown_thumbnail_pool():
+    """대기 중인 작업은 버리고 실행 중인 리사이즈만 마무리 (서버 종료 시)"""
+    global _pool
+    for task in list(_tasks):
+        task.cancel()
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
@@ -0,0 +1,189 @@
+# tokens.py
+import os
+import hmac
+import time
+import base64
+import hashlib
+import secrets
+import threading
+from background import PeriodicTask
+from database import get_db_connection
+
+# 서명 세션 토큰 모드 (켜면 session_id 쿠키에 DB 세션 대신 서명된 토큰을 넣음)
+SESSION_TOKEN_MODE = os.getenv("SESSION_TOKEN_MODE", "0") == "1"
+SESSION_TOKEN_TTL = int(os.getenv("SESSION_TOKEN_TTL", str(24 * 3600)))  # 토큰 유효 기간(초)
+TOKEN_REVOCATION_SYNC_INTERVAL = float(os.getenv("TOKEN_REVOCATION_SYNC_INTERVAL", "5"))  # 다른 워커 로그아웃 반영/정리 주기(초)
+
+# 서명 키 목록 "kid:secret,kid:secret" (첫 번째 키로 서명, 나머지는 검증만 -> 키 교체 시 이전 키를 뒤에 남겨둠)
+SESSION_TOKEN_KEYS = os.getenv("SESSION_TOKEN_KEYS", "")
+
+TOKEN_VERSION = "v1"
+
+
+def _load_keys(spec: str) -> dict:
+    keys = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        kid, _, secret = item.partition(":")
+        if not kid or not secret or "." in kid:
+            raise ValueError(f"잘못된 SESSION_TOKEN_KEYS 항목: {item!r}")
+        keys[kid] = secret.encode("utf-8")
+    return keys
+
+
+_keys = _load_keys(SESSION_TOKEN_KEYS)
+if SESSION_TOKEN_MODE and not _keys:
+    # 키가 없으면 프로세스마다 임시 키 사용 (재시작/다른 워커에서는 토큰이 무효)
+    print("Session Token: SESSION_TOKEN_KEYS 가 없어 임시 키를 사용합니다.")
+    _keys = {"ephemeral": secrets.token_bytes(32)}
+_active_kid = next(iter(_keys), None)
+
+
+def _b64(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _sign(key: bytes, message: str) -> str:
+    return _b64(hmac.new(key, message.encode("ascii"), hashlib.sha256).digest()[:16])
+
+
+def is_token(session_id: str | None) -> bool:
+    return bool(session_id) and session_id.startswith(TOKEN_VERSION + ".")
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def issue_token(user_id: int) -> str:
+    """v1.{kid}.{user_id}.{발급시각(ms)}.{만료시각(초)}.{nonce}.{서명}"""
+    issued_at = _now_ms()
+    expires_at = issued_at // 1000 + SESSION_TOKEN_TTL
+    message = f"{TOKEN_VERSION}.{_active_kid}.{user_id}.{issued_at}.{expires_at}.{secrets.token_hex(6)}"
+    return f"{message}.{_sign(_keys[_active_kid], message)}"
+
+
+def verify_token(token: str) -> tuple | None:
+    """
+    서명/만료/폐기(로그아웃) 여부 확인 후 (user_id, 발급시각 ms) 반환 (I/O 없음), 유효하지 않으면 None
+    비밀번호 변경/탈퇴로 인한 사용자 단위 무효화는 호출한 쪽이 users.tokens_valid_after 와 비교 (token_issued_before)
+    """
+    # 토큰은 전부 ASCII (쿠키 값이 조작된 경우 encode/compare_digest 에서 예외가 나지 않도록 먼저 거름)
+    if not token.isascii():
+        return None
+    message, _, signature = token.rpartition(".")
+    parts = message.split(".")
+    if len(parts) != 6:
+        return None
+    _, kid, user_id, issued_at, expires_at, nonce = parts
+    key = _keys.get(kid)
+    if key is None or not hmac.compare_digest(_sign(key, message), signature):
+        return None
+    try:
+        user_id, issued_at, expires_at = int(user_id), int(issued_at), int(expires_at)
+    except ValueError:
+        return None
+    if expires_at <= time.time() or revocations.is_revoked(nonce):
+        return None
+    return user_id, issued_at
+
+
+def token_issued_before(issued_at: int, user: dict) -> bool:
+    """users.tokens_valid_after(ms) 이전(같은 ms 포함)에 발급된 토큰이면 True"""
+    return issued_at <= user["tokens_valid_after"]
+
+
+def revoke_user_tokens(cursor, user_id: int):
+    """
+    사용자의 기존 서명 토큰 전부 무효화 (비밀번호 변경/탈퇴), 호출한 쪽 트랜잭션 안에서 실행
+    DB 에 남기므로 재시작 후에도 유지되고, 다른 워커는 사용자 캐시(SESSION_CACHE_TTL)가 만료되면 반영
+    """
+    cursor.execute("UPDATE users SET tokens_valid_after = %s WHERE id = %s", (_now_ms(), user_id))
+
+
+class RevocationSet:
+    """
+    로그아웃으로 만료 전에 무효화된 토큰 목록 (nonce -> 만료 시각)
+    - 확인은 워커 메모리에서만 (I/O 없음), 폐기 기록은 revoked_tokens 테이블에 남김
+    - TOKEN_REVOCATION_SYNC_INTERVAL 마다 다른 워커가 남긴 기록을 가져오고 만료된 항목을 정리
+      (다른 워커의 로그아웃은 최대 이 간격만큼 늦게 반영, 재시작 시에는 테이블에서 전부 다시 읽음)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tokens = {}
+        self._loaded = False
+        self._task = PeriodicTask("token-revocation-sync", TOKEN_REVOCATION_SYNC_INTERVAL, self.sync)
+
+    def start(self):
+        self._task.start()
+        self._task.wake()  # 기동 직후 바로 전체 로드
+
+    def stop(self):
+        self._task.stop()
+
+    def revoke_token(self, token: str):
+        parts = token.rpartition(".")[0].split(".")
+        if len(parts) != 6:
+            return
+        try:
+            expires_at = int(parts[4])
+        except ValueError:
+            return
+        nonce = parts[5]
+        with self._lock:
+            self._tokens[nonce] = expires_at
+        # 이 워커에는 바로 반영, 다른 워커/재시작 후를 위해 DB 에도 기록 (실패해도 로그아웃 응답은 그대로)
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    "INSERT IGNORE INTO revoked_tokens (nonce, expires_at) VALUES (%s, FROM_UNIXTIME(%s))",
+                    (nonce, expires_at),
+                )
+            finally:
+                cursor.close()
+                conn.close()
+        except Exception as e:
+            print(f"Token Revocation Error: {e}")
+
+    def is_revoked(self, nonce: str) -> bool:
+        # 읽기는 잠금 없이 (dict 조회는 원자적)
+        return nonce in self._tokens
+
+    def sync(self):
+        """다른 워커의 폐기 기록 반영 + 만료된 항목 정리 (처음에는 아직 유효한 기록 전부)"""
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            if self._loaded:
+                # 커밋이 늦게 보이는 행도 놓치지 않도록 최근 구간을 겹쳐서 다시 읽음 (nonce 기준이라 중복은 무해)
+                window = int(TOKEN_REVOCATION_SYNC_INTERVAL) + 60
+                cursor.execute(
+                    """
+                    SELECT nonce, UNIX_TIMESTAMP(expires_at) FROM revoked_tokens
+                    WHERE created_at >= NOW() - INTERVAL %s SECOND AND expires_at > NOW()
+                    """,
+                    (window,),
+                )
+            else:
+                cursor.execute("SELECT nonce, UNIX_TIMESTAMP(expires_at) FROM revoked_tokens WHERE expires_at > NOW()")
+            rows = cursor.fetchall()
+            cursor.execute("DELETE FROM revoked_tokens WHERE expires_at <= NOW() LIMIT 1000")
+        finally:
+            cursor.close()
+            conn.close()
+
+        now = time.time()
+        with self._lock:
+            for nonce, expires_at in rows:
+                self._tokens[nonce] = int(expires_at)
+            self._tokens = {nonce: exp for nonce, exp in self._tokens.items() if exp > now}
+            self._loaded = True
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"tokens": len(self._tokens)}
+
+
+revocations = RevocationSet()
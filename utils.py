@@ -1,6 +1,8 @@
 # utils.py
 
 import re
+import json
+import base64
 from fastapi import HTTPException
 
 # 1. 이메일 형식 검사
@@ -35,4 +37,20 @@ class APIException(HTTPException):
         self.code = code
         self.message = message
         self.data = None
-        super().__init__(status_code=status_code, detail={"code": code, "message": message, "data": None})
\ No newline at end of file
+        super().__init__(status_code=status_code, detail={"code": code, "message": message, "data": None})
+
+# 5. 페이지네이션 커서 (keyset)
+# 클라이언트에는 내용을 알 수 없는 문자열로 전달 (base64url 인코딩된 JSON)
+def encode_cursor(values: dict) -> str:
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, dict):
+            raise ValueError
+        return values
+    except ValueError:
+        raise APIException(code="INVALID_CURSOR", message="유효하지 않은 페이지 커서입니다.", status_code=400)
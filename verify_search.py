@@ -0,0 +1,45 @@
+from search import parse_terms, boolean_query, highlight, snippet, SNIPPET_RADIUS, SEARCH_MAX_TERMS
+
+def test_parse_terms():
+    # 1. BOOLEAN MODE 연산자는 검색어에서 빠지고, 짧은 단어/중복(대소문자 무시)은 제외
+    terms = parse_terms('+mysql -"튜닝"* (인덱스) ~a MySQL @3 <b>')
+    print(f"1. parse_terms -> {terms}")
+    assert terms == ["mysql", "튜닝", "인덱스"]
+    assert boolean_query(terms) == '+"mysql" +"튜닝" +"인덱스"'
+
+    # 연산자만 있거나 전부 짧으면 빈 목록 (컨트롤러에서 400)
+    assert parse_terms('+-"()*~') == []
+    assert parse_terms("a b c") == []
+
+    # 단어 수 제한
+    assert len(parse_terms(" ".join(f"word{i}" for i in range(20)))) == SEARCH_MAX_TERMS
+
+def test_highlight_escapes_html():
+    # 2. 일치 부분만 <mark>, 나머지 HTML 은 이스케이프
+    result = highlight('<script>alert("MySQL")</script> mysql', ["mysql"])
+    print(f"2. highlight -> {result}")
+    assert "<script>" not in result
+    assert result == '&lt;script&gt;alert(&quot;<mark>MySQL</mark>&quot;)&lt;/script&gt; <mark>mysql</mark>'
+
+    # 검색어 자체에 HTML 특수문자가 있어도 이스케이프됨
+    assert highlight("a<b>c", ["<b>"]) == "a<mark>&lt;b&gt;</mark>c"
+    assert highlight("", ["mysql"]) == ""
+
+def test_snippet_bounds():
+    # 3. 처음 일치한 위치 앞뒤 SNIPPET_RADIUS 글자만, 잘린 쪽에만 말줄임표
+    text = "가" * 200 + "튜닝" + "나" * 200
+    result = snippet(text, ["튜닝"])
+    print(f"3. snippet length -> {len(result)}")
+    assert result.startswith("…") and result.endswith("…")
+    assert result == "…" + "가" * SNIPPET_RADIUS + "<mark>튜닝</mark>" + "나" * SNIPPET_RADIUS + "…"
+
+    # 일치가 없으면 앞부분, 짧은 글은 말줄임표 없이 전체
+    assert snippet("x" * 200, ["튜닝"]) == "x" * SNIPPET_RADIUS + "…"
+    assert snippet("짧은\n튜닝 글", ["튜닝"]) == "짧은 <mark>튜닝</mark> 글"
+    assert snippet(None, ["튜닝"]) == ""
+
+if __name__ == "__main__":
+    test_parse_terms()
+    test_highlight_escapes_html()
+    test_snippet_bounds()
+    print("Search helpers OK")
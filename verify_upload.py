@@ -18,9 +18,9 @@ def test_upload_flow():
 
     print("Login Success!")
     
-    # 2. 파일 생성
+    # 2. 파일 생성 (업로드 시 매직 바이트를 확인하므로 JPEG 헤더로 시작)
     with open("test.jpg", "wb") as f:
-        f.write(b"fake image content")
+        f.write(b"\xff\xd8\xff\xe0" + b"fake image content")
         
     # 3. 파일 업로드
     print("2. Uploading file...")
@@ -0,0 +1,74 @@
+import threading
+import time
+from view_counter import ViewCountBuffer
+
+def test_concurrent_view_count():
+    # 1. DB 대신 증가분을 받아 합산하는 가짜 저장소
+    stored = {}
+    stored_lock = threading.Lock()
+
+    def fake_flush(deltas):
+        time.sleep(0.001)  # DB 왕복 흉내 (flush 도중에도 조회가 계속 들어오도록)
+        with stored_lock:
+            for post_id, amount in deltas.items():
+                stored[post_id] = stored.get(post_id, 0) + amount
+
+    # 2. 짧은 주기 + 낮은 임계치로 조회 도중 flush 가 계속 일어나게 설정
+    buffer = ViewCountBuffer(fake_flush, interval=0.005, threshold=50)
+    buffer.start()
+
+    post_id = 1
+    threads_count = 16
+    views_per_thread = 5000
+    print(f"1. Hammering post {post_id} with {threads_count} threads x {views_per_thread} views...")
+
+    def hammer():
+        for _ in range(views_per_thread):
+            buffer.incr(post_id)
+
+    threads = [threading.Thread(target=hammer) for _ in range(threads_count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # 3. 종료 시 남은 증가분까지 반영되는지 확인
+    print("2. Stopping buffer (final flush)...")
+    buffer.stop()
+
+    expected = threads_count * views_per_thread
+    actual = stored.get(post_id, 0)
+    print(f"Flush stats: {buffer.stats()}")
+    if actual == expected and buffer.unflushed(post_id) == 0:
+        print(f"View Count Exact! {actual} == {expected}")
+    else:
+        print(f"View Count Mismatch: stored={actual}, expected={expected}, unflushed={buffer.unflushed(post_id)}")
+    assert actual == expected
+
+def test_flush_failure_keeps_views():
+    # flush 가 실패해도 증가분이 버퍼로 돌아와서 다음 flush 때 반영되는지 확인
+    stored = {}
+    fail = {"on": True}
+
+    def flaky_flush(deltas):
+        if fail["on"]:
+            raise RuntimeError("db down")
+        for post_id, amount in deltas.items():
+            stored[post_id] = stored.get(post_id, 0) + amount
+
+    buffer = ViewCountBuffer(flaky_flush, interval=60, threshold=10**9)
+    for _ in range(10):
+        buffer.incr(7)
+    try:
+        buffer.flush()
+    except RuntimeError:
+        print("3. Flush failed as expected, views kept in buffer")
+    fail["on"] = False
+    buffer.incr(7)
+    buffer.flush()
+    print(f"Stored after retry: {stored}")
+    assert stored == {7: 11}
+
+if __name__ == "__main__":
+    test_concurrent_view_count()
+    test_flush_failure_keeps_views()
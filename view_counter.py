@@ -0,0 +1,142 @@
+# view_counter.py
+import os
+import threading
+from background import PeriodicTask
+from database import get_db_connection
+
+# 조회수 write-behind 설정
+VIEW_FLUSH_INTERVAL = float(os.getenv("VIEW_FLUSH_INTERVAL", "5"))       # 주기적 반영 간격(초) = 최대 지연
+VIEW_FLUSH_THRESHOLD = int(os.getenv("VIEW_FLUSH_THRESHOLD", "1000"))    # 쌓인 조회수가 이만큼이면 주기 전이라도 반영
+VIEW_FLUSH_BATCH_SIZE = int(os.getenv("VIEW_FLUSH_BATCH_SIZE", "500"))   # UPDATE 한 번에 묶을 게시글 수
+
+
+class ViewCountBuffer:
+    """
+    조회수 증가를 메모리에 모았다가 한꺼번에 DB 에 반영하는 버퍼
+    - 같은 게시글의 조회는 하나의 증가분으로 합쳐짐 (인기글 행 잠금 경합 제거)
+    - interval 초마다, 또는 누적 threshold 에 도달하면 flush_fn(증가분 dict) 호출
+    - flush 실패 시 증가분을 버퍼로 되돌려서 다음 주기에 재시도 (유실 없음)
+    """
+
+    def __init__(self, flush_fn, interval: float = VIEW_FLUSH_INTERVAL, threshold: int = VIEW_FLUSH_THRESHOLD):
+        self.interval = interval
+        self.threshold = threshold
+        self._flush_fn = flush_fn
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # flush 는 한 번에 하나만
+        self._pending = {}   # post_id -> 아직 반영 안 된 증가분
+        self._inflight = {}  # post_id -> 지금 반영 중인 증가분
+        self._pending_total = 0
+        self._listeners = []
+        self._generation = 0  # flush 시작/끝마다 +1 (홀수면 반영 중)
+        self._stats = {"flushes": 0, "flushed_views": 0, "failures": 0}
+        self._task = PeriodicTask("view-count-flush", interval, self.flush, run_on_stop=True)
+
+    def start(self):
+        self._task.start()
+
+    def stop(self):
+        """남은 증가분까지 반영하고 종료 (서버 종료 시)"""
+        self._task.stop()
+
+    def add_listener(self, fn):
+        """DB 반영이 끝난 증가분을 받을 콜백 등록 (캐시 보정용)"""
+        self._listeners.append(fn)
+
+    def incr(self, post_id: int, amount: int = 1) -> int:
+        """조회수 증가 기록, 이 게시글의 아직 DB 에 없는 증가분 합계 반환"""
+        with self._lock:
+            self._pending[post_id] = self._pending.get(post_id, 0) + amount
+            self._pending_total += amount
+            unflushed = self._pending[post_id] + self._inflight.get(post_id, 0)
+            reached = self._pending_total >= self.threshold
+        if reached:
+            self._task.wake()
+        return unflushed
+
+    def flush_generation(self) -> int:
+        """
+        DB 에서 조회수를 읽어 캐시하는 쪽이 읽기 전후로 비교하는 값
+        읽기 전 값이 홀수(반영 중)이거나 그 사이 바뀌었으면, 읽은 조회수가 반영 전/후 어느 쪽인지 알 수 없음
+        """
+        with self._lock:
+            return self._generation
+
+    def unflushed(self, post_id: int) -> int:
+        with self._lock:
+            return self._pending.get(post_id, 0) + self._inflight.get(post_id, 0)
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                batch = self._pending
+                self._pending = {}
+                self._pending_total = 0
+                self._inflight = batch
+                if batch:
+                    self._generation += 1
+            if not batch:
+                return 0
+
+            try:
+                try:
+                    self._flush_fn(batch)
+                except Exception:
+                    # 실패한 증가분은 버퍼로 되돌림
+                    with self._lock:
+                        for post_id, amount in batch.items():
+                            self._pending[post_id] = self._pending.get(post_id, 0) + amount
+                            self._pending_total += amount
+                        self._inflight = {}
+                        self._stats["failures"] += 1
+                    raise
+
+                with self._lock:
+                    self._inflight = {}
+                    self._stats["flushes"] += 1
+                    self._stats["flushed_views"] += sum(batch.values())
+
+                for listener in self._listeners:
+                    listener(batch)
+                return len(batch)
+            finally:
+                # 리스너(캐시 보정)까지 끝난 뒤에 반영 완료로 표시
+                with self._lock:
+                    self._generation += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pending_posts": len(self._pending),
+                "pending_views": self._pending_total,
+                **self._stats,
+            }
+
+
+def flush_view_counts_to_db(deltas: dict):
+    """
+    게시글별 증가분을 multi-row UPDATE 로 반영
+    UPDATE posts SET view_count = view_count + CASE id WHEN 1 THEN 3 WHEN 7 THEN 1 END WHERE id IN (1, 7)
+    """
+    items = sorted(deltas.items())  # 항상 같은 순서로 잠가서 데드락 방지
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        conn.start_transaction()
+        for i in range(0, len(items), VIEW_FLUSH_BATCH_SIZE):
+            chunk = items[i:i + VIEW_FLUSH_BATCH_SIZE]
+            cases = " ".join(["WHEN %s THEN %s"] * len(chunk))
+            placeholders = ", ".join(["%s"] * len(chunk))
+            query = f"UPDATE posts SET view_count = view_count + CASE id {cases} END WHERE id IN ({placeholders})"
+            params = [value for item in chunk for value in item] + [post_id for post_id, _ in chunk]
+            cursor.execute(query, params)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+
+view_counter = ViewCountBuffer(flush_view_counts_to_db)